@@ -1,21 +1,236 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+import importlib
+import os
+import secrets
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager, suppress
+from email.message import Message
+from email.parser import BytesHeaderParser
+from types import ModuleType
+from typing import AsyncIterator
+
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import ValidationError
 from starlette.responses import StreamingResponse
 
 from aiden import logger
-from aiden.app.brain.auditory import process_auditory
-from aiden.app.brain.cortical import process_cortical
-from aiden.app.brain.memory.hippocampus import process_wipe_memory
-from aiden.app.brain.occipital import process_occipital
-from aiden.app.clients.redis_client import redis_client
+from aiden.app.metrics import (
+    HTTP_REQUEST_LATENCY,
+    HTTP_REQUESTS,
+    REGISTRY,
+    render_prometheus,
+)
+from aiden.app.monitor import (
+    EventLoopWatchdog,
+    monitor_event_loop_lag,
+    request_id_var,
+)
+from aiden.app.profiler import ProfilerBusyError, profile
+from aiden.app.timing import collect_timings
+from aiden.app.warmup import Readiness, Warmup
 from aiden.models.brain import (
+    AuditoryBatchRequest,
+    AuditoryEvent,
+    AuditoryLanguageRequest,
     AuditoryRequest,
+    AuditoryStats,
+    AuditoryStreamStart,
+    CorticalBatchRequest,
+    CorticalEvent,
     CorticalRequest,
+    CorticalSessionStart,
     NeuralyzerRequest,
+    OccipitalBatchRequest,
     OccipitalRequest,
+    OccipitalStats,
+    PerceptionRequest,
+    SensoryDelta,
+    VocalRequest,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    watchdog = None
+    if os.environ.get("EVENT_LOOP_WATCHDOG_ENABLE", "true").lower() == "true":
+        watchdog = EventLoopWatchdog()
+        watchdog.start(asyncio.get_running_loop())
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+
+    # One pooled HTTP session is shared by every client of the backend services
+    http_client = await _import_lazily("aiden.app.clients.http_client")
+    http_client.open_http_session()
+
+    # Warm up in the background so the API can report its readiness meanwhile
+    app.state.warmup = Warmup()
+    warmup_task = None
+    if os.environ.get("BRAIN_WARMUP_ENABLE", "true").lower() == "true":
+        warmup_task = asyncio.create_task(app.state.warmup.run())
+    else:
+        app.state.warmup.ready = True
+
+    yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+    lag_monitor.cancel()
+    await http_client.close_http_session()
+    if watchdog is not None:
+        watchdog.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+MAX_UPLOAD_BYTES = int(os.environ.get("BRAIN_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+
+def _check_upload_size(request: Request) -> None:
+    # Reject oversized uploads up front when the client declares their size
+    content_length = request.headers.get("Content-Length")
+    if not content_length:
+        return
+    try:
+        size = int(content_length)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+
+async def _limit_upload(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # Chunked uploads have no declared size, so count the bytes as they arrive
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Upload too large")
+        yield chunk
+
+
+async def _read_upload(request: Request) -> bytearray:
+    # Images and multipart bodies are only usable whole, so the body is read into a single
+    # buffer, bounded by the upload limit, which is passed on without copying it again
+    _check_upload_size(request)
+    body = bytearray()
+    async for chunk in _limit_upload(request.stream()):
+        body += chunk
+    return body
+
+
+def _parse_form_data(body: bytes | bytearray, content_type: str) -> dict[str, bytes]:
+    """
+    Splits a `multipart/form-data` body into its parts by name.
+
+    The parts are sliced out of the body by their boundary, which is far quicker for large
+    files than parsing the body line by line.
+
+    Args:
+        body (bytes | bytearray): The request body.
+        content_type (str): The request's content type, with the parts' boundary.
+
+    Returns:
+        dict[str, bytes]: The content of each named part.
+
+    Raises:
+        HTTPException: If the body is not multipart form data.
+    """
+    header = Message()
+    header["Content-Type"] = content_type
+    boundary = header.get_param("boundary")
+    if header.get_content_type() != "multipart/form-data" or not boundary:
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    # Each part is sliced out of the body once, without copying the whole body
+    delimiter = f"--{boundary}".encode()
+    parts = {}
+    start = body.find(delimiter)
+    while start >= 0:
+        start += len(delimiter)
+        if body.startswith(b"--", start):
+            break
+        end = body.find(b"\r\n" + delimiter, start)
+        headers_end = body.find(b"\r\n\r\n", start, len(body) if end < 0 else end)
+        if headers_end < 0:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        name = (
+            BytesHeaderParser()
+            .parsebytes(bytes(body[start:headers_end]).lstrip())
+            .get_param("name", header="content-disposition")
+        )
+        if name:
+            parts[name] = body[headers_end + 4 : len(body) if end < 0 else end]
+        start = end if end < 0 else end + 2
+    return parts
+
+
+async def _import_lazily(name: str) -> ModuleType:
+    """
+    Imports a module on first use instead of at startup.
+
+    Brain regions pull in heavy dependencies such as LangGraph, LangChain and aiohttp, so
+    importing them lazily keeps the API's cold start fast. The first import runs in a
+    worker thread so it does not block requests already being served.
+
+    Args:
+        name (str): The fully qualified module name.
+
+    Returns:
+        ModuleType: The imported module.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return await asyncio.to_thread(importlib.import_module, name)
+
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next) -> Response:
+    """
+    Tags the request, and every task it spawns, with an ID for tracing blocking code.
+    """
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next) -> Response:
+    """
+    Records the rate and latency of requests per endpoint.
+    """
+    started = time.monotonic()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template to keep the number of series bounded
+        route = request.scope.get("route")
+        path = route.path if route else "unmatched"
+        HTTP_REQUESTS.inc(method=request.method, path=path, status=str(status))
+        HTTP_REQUEST_LATENCY.observe(
+            time.monotonic() - started, method=request.method, path=path
+        )
 
 
 @app.post("/cortical/")
@@ -30,13 +245,77 @@ async def read_cortical(request: CorticalRequest) -> StreamingResponse:
         StreamingResponse: The continuous response stream from the cognitive model.
     """
     try:
-        stream = await process_cortical(request)
-        return StreamingResponse(stream, media_type="application/json")
+        cortical = await _import_lazily("aiden.app.brain.cortical")
+        with collect_timings() as timings:
+            stream = await cortical.process_cortical(request)
+        return StreamingResponse(
+            stream,
+            media_type="application/json",
+            headers={"Server-Timing": timings.server_timing_header()},
+        )
     except Exception as e:
         logger.error(f"Error in cortical endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/cortical/batch")
+async def read_cortical_batch(request: CorticalBatchRequest) -> StreamingResponse:
+    """
+    Endpoint to process the cortical requests of many agents, e.g. every agent of a
+    simulation tick, concurrently in a single HTTP request.
+
+    Args:
+        request (CorticalBatchRequest): The cortical requests, each with a unique agent ID.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the result of each agent, in the
+        order the agents finish.
+    """
+    cortical = await _import_lazily("aiden.app.brain.cortical")
+    return StreamingResponse(
+        cortical.process_cortical_batch(request), media_type="application/x-ndjson"
+    )
+
+
+@app.websocket("/cortical/session")
+async def cortical_session(websocket: WebSocket) -> None:
+    """
+    WebSocket endpoint for an agent's persistent cortical session.
+
+    The agent first sends a `CorticalSessionStart` message, then a `SensoryDelta` message
+    whenever its senses change. Each delta triggers a tick, which streams `CorticalEvent`
+    messages for the action, speech and thoughts as each is produced, then a `done` event.
+
+    Args:
+        websocket (WebSocket): The agent's connection.
+    """
+    await websocket.accept()
+    try:
+        start = CorticalSessionStart.model_validate_json(await websocket.receive_text())
+    except ValidationError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e)[:120])
+        return
+
+    cortical = await _import_lazily("aiden.app.brain.cortical")
+
+    async def receive_delta() -> SensoryDelta:
+        return SensoryDelta.model_validate_json(await websocket.receive_text())
+
+    async def send_event(event: CorticalEvent) -> None:
+        await websocket.send_text(event.model_dump_json())
+
+    try:
+        await cortical.process_cortical_session(start, receive_delta, send_event)
+    except WebSocketDisconnect:
+        logger.info(f"Cortical session of agent {start.agent_id} disconnected")
+    except Exception as e:
+        logger.error(f"Error in cortical session endpoint: {e}")
+        with suppress(RuntimeError):
+            await websocket.close(
+                code=status.WS_1011_INTERNAL_ERROR, reason=str(e)[:120]
+            )
+
+
 @app.post("/occipital/")
 async def read_occipital(request: OccipitalRequest) -> StreamingResponse:
     """
@@ -49,13 +328,86 @@ async def read_occipital(request: OccipitalRequest) -> StreamingResponse:
         StreamingResponse: The continuous response stream from the occipital model.
     """
     try:
-        stream = process_occipital(request)
+        occipital = await _import_lazily("aiden.app.brain.occipital")
+        stream = occipital.process_occipital(request)
         return StreamingResponse(stream, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in occipital endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/occipital/upload")
+async def read_occipital_upload(
+    request: Request,
+    config: str = Query(default="./config/brain/default.json"),
+    latency_budget_ms: int | None = Query(default=None, gt=0),
+    agent_id: str | None = Query(default=None),
+    frame_gate_threshold: float | None = Query(default=None, ge=0, le=1),
+) -> StreamingResponse:
+    """
+    Endpoint to process a raw JPEG or PNG image sent as the request body, avoiding the
+    overhead of base64 encoding it inside JSON.
+
+    Args:
+        request (Request): The request with the image file as its body.
+        config (str): Path to the brain configuration file.
+        latency_budget_ms (int | None): Time allowed for the description.
+        agent_id (str | None): The agent which sent the image, to gate it against the
+            agent's last described frame.
+        frame_gate_threshold (float | None): Difference from the agent's last described
+            frame below which its description is reused.
+
+    Returns:
+        StreamingResponse: The continuous response stream from the occipital model.
+    """
+    image = await _read_upload(request)
+    if not image:
+        raise HTTPException(status_code=400, detail="No image uploaded")
+
+    occipital = await _import_lazily("aiden.app.brain.occipital")
+    return StreamingResponse(
+        occipital.process_occipital_upload(
+            image, config, latency_budget_ms, agent_id, frame_gate_threshold
+        ),
+        media_type="application/json",
+    )
+
+
+@app.post("/occipital/batch")
+async def read_occipital_batch(request: OccipitalBatchRequest) -> StreamingResponse:
+    """
+    Endpoint to describe many images, e.g. from several cameras or agents, concurrently in
+    a single HTTP request.
+
+    Args:
+        request (OccipitalBatchRequest): The images, each with a unique agent and camera.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the description of each image, in
+        the order they are described.
+    """
+    occipital = await _import_lazily("aiden.app.brain.occipital")
+    return StreamingResponse(
+        occipital.process_occipital_batch(request), media_type="application/x-ndjson"
+    )
+
+
+@app.get("/occipital/stats")
+async def read_occipital_stats() -> OccipitalStats:
+    """
+    Endpoint reporting how many frames of each agent the frame gate skipped.
+
+    Returns:
+        OccipitalStats: Whether the frame gate is enabled, and the frames and skipped
+        frames of each agent.
+    """
+    frame_gate = await _import_lazily("aiden.app.frame_gate")
+    return OccipitalStats(
+        frame_gate_enabled=frame_gate.VISION_FRAME_GATE_ENABLE,
+        agents=frame_gate.get_frame_gate().stats(),
+    )
+
+
 @app.post("/auditory/")
 async def read_auditory(request: AuditoryRequest) -> StreamingResponse:
     """
@@ -68,13 +420,212 @@ async def read_auditory(request: AuditoryRequest) -> StreamingResponse:
         StreamingResponse: The continuous response stream from the auditory model.
     """
     try:
-        stream = process_auditory(request)
+        auditory = await _import_lazily("aiden.app.brain.auditory")
+        stream = auditory.process_auditory(request)
         return StreamingResponse(stream, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in auditory endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/auditory/upload")
+async def read_auditory_upload(
+    request: Request,
+    sample_rate: int | None = Query(default=None, gt=0),
+    channels: int = Query(default=1, ge=1),
+) -> StreamingResponse:
+    """
+    Endpoint to process a raw MP3 or WAV file, or raw PCM, sent as the request body without
+    base64 encoding.
+
+    Args:
+        request (Request): The request with the audio file as its body.
+        sample_rate (int | None): Sample rate of raw 16-bit little-endian PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        StreamingResponse: The continuous response stream from the auditory model.
+    """
+    _check_upload_size(request)
+    auditory = await _import_lazily("aiden.app.brain.auditory")
+    stream = await auditory.process_auditory_upload(
+        _limit_upload(request.stream()), sample_rate, channels
+    )
+    return StreamingResponse(stream, media_type="application/json")
+
+
+@app.post("/auditory/batch")
+async def read_auditory_batch(request: AuditoryBatchRequest) -> StreamingResponse:
+    """
+    Endpoint to classify many clips, e.g. the audio of every agent in a simulation tick,
+    concurrently in a single HTTP request.
+
+    Args:
+        request (AuditoryBatchRequest): The clips, each with a unique agent and microphone.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the classification results of each
+        clip, in the order they are classified.
+    """
+    auditory = await _import_lazily("aiden.app.brain.auditory")
+    return StreamingResponse(
+        auditory.process_auditory_batch(request), media_type="application/x-ndjson"
+    )
+
+
+@app.post("/auditory/language")
+async def read_auditory_language(request: AuditoryLanguageRequest) -> StreamingResponse:
+    """
+    Endpoint to transcribe speech, streaming the transcript as it is recognised, and
+    optionally running a cortical tick with it without another round trip.
+
+    Args:
+        request (AuditoryLanguageRequest): The speech, and the cortical request to run with
+            the transcript, if any.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the partial transcripts, the full
+        transcript, then the events of the cortical tick.
+    """
+    auditory = await _import_lazily("aiden.app.brain.auditory")
+    return StreamingResponse(
+        auditory.process_auditory_language(request), media_type="application/x-ndjson"
+    )
+
+
+@app.websocket("/auditory/stream")
+async def auditory_stream(websocket: WebSocket) -> None:
+    """
+    WebSocket endpoint for an agent's continuous stream of audio.
+
+    The agent first sends an `AuditoryStreamStart` message, then the raw 16-bit
+    little-endian PCM audio in binary messages of any length. Overlapping windows of the
+    stream are classified, and an `AuditoryEvent` is sent whenever the top class changes.
+
+    Args:
+        websocket (WebSocket): The agent's connection.
+    """
+    await websocket.accept()
+    try:
+        start = AuditoryStreamStart.model_validate_json(await websocket.receive_text())
+    except ValidationError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e)[:120])
+        return
+
+    auditory = await _import_lazily("aiden.app.brain.auditory")
+
+    async def receive_chunk() -> bytes:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        if message.get("bytes") is None:
+            raise ValueError("Expected raw 16-bit PCM audio in a binary message")
+        return message["bytes"]
+
+    async def send_event(event: AuditoryEvent) -> None:
+        await websocket.send_text(event.model_dump_json())
+
+    try:
+        await auditory.process_auditory_stream(start, receive_chunk, send_event)
+    except WebSocketDisconnect:
+        logger.info(f"Auditory stream of agent {start.agent_id} disconnected")
+    except Exception as e:
+        logger.error(f"Error in auditory stream endpoint: {e}")
+        with suppress(RuntimeError):
+            await websocket.close(
+                code=status.WS_1011_INTERNAL_ERROR, reason=str(e)[:120]
+            )
+
+
+@app.get("/auditory/stats")
+async def read_auditory_stats() -> AuditoryStats:
+    """
+    Endpoint reporting how many clips the activity gate skipped as silence.
+
+    Returns:
+        AuditoryStats: Whether the activity gate is enabled, and the clips checked and
+        skipped.
+    """
+    activity_gate = await _import_lazily("aiden.app.activity_gate")
+    return AuditoryStats(
+        activity_gate_enabled=activity_gate.AUDITORY_ACTIVITY_GATE_ENABLE,
+        activity_gate=activity_gate.get_activity_gate().stats(),
+    )
+
+
+@app.post("/perceive")
+async def read_perception(request: PerceptionRequest) -> StreamingResponse:
+    """
+    Endpoint to perceive an agent's frame and audio concurrently and continue straight into
+    a cortical tick with them, in a single round trip.
+
+    Args:
+        request (PerceptionRequest): The frame, audio and other sensory inputs of the agent.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the frame's description and the
+        audio's classes as each is perceived, then the events of the cortical tick.
+    """
+    perception = await _import_lazily("aiden.app.brain.perception")
+    return StreamingResponse(
+        perception.process_perception(request), media_type="application/x-ndjson"
+    )
+
+
+@app.post("/perceive/upload")
+async def read_perception_upload(request: Request) -> StreamingResponse:
+    """
+    Endpoint to perceive an agent's raw frame and audio, sent as parts of a
+    `multipart/form-data` body, avoiding the overhead of base64 encoding them inside JSON.
+
+    The `request` part holds the `PerceptionRequest` as JSON, without its image and
+    audio, and the optional `image` and `audio` parts hold the image and audio files.
+
+    Args:
+        request (Request): The request with the multipart body.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the frame's description and the
+        audio's classes as each is perceived, then the events of the cortical tick.
+    """
+    body = await _read_upload(request)
+    parts = _parse_form_data(body, request.headers.get("Content-Type", ""))
+    if "request" not in parts:
+        raise HTTPException(status_code=400, detail="No request part uploaded")
+    try:
+        perception_request = PerceptionRequest.model_validate_json(parts["request"])
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    perception = await _import_lazily("aiden.app.brain.perception")
+    return StreamingResponse(
+        perception.process_perception(
+            perception_request, parts.get("image") or None, parts.get("audio") or None
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/vocal/")
+async def read_vocal(request: VocalRequest) -> StreamingResponse:
+    """
+    Endpoint to synthesise speech sentence by sentence, streaming each sentence's audio as
+    soon as it is ready, so playback can start before the rest is generated.
+
+    Args:
+        request (VocalRequest): The text to speak, or the cortical request whose speech to
+            speak as it is generated.
+
+    Returns:
+        StreamingResponse: Newline delimited JSON with the audio of each sentence in order,
+        and the events of the cortical tick, if any.
+    """
+    vocal = await _import_lazily("aiden.app.brain.vocal")
+    return StreamingResponse(
+        vocal.process_vocal(request), media_type="application/x-ndjson"
+    )
+
+
 @app.post("/neuralyzer/")
 async def wipe_short_term_memory(request: NeuralyzerRequest) -> JSONResponse:
     """
@@ -86,7 +637,74 @@ async def wipe_short_term_memory(request: NeuralyzerRequest) -> JSONResponse:
     Returns:
         JSONResponse: The result of the memory wipe operation.
     """
-    response_json = await process_wipe_memory(
-        request=request, redis_client=redis_client
+    hippocampus = await _import_lazily("aiden.app.brain.memory.hippocampus")
+    clients = await _import_lazily("aiden.app.clients.redis_client")
+    response_json = await hippocampus.process_wipe_memory(
+        request=request, redis_client=clients.redis_client
     )
     return JSONResponse(content=response_json, media_type="application/json")
+
+
+@app.get("/metrics")
+async def read_metrics() -> PlainTextResponse:
+    """
+    Endpoint exposing operational metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Request rates and latencies, brain region latencies, backend token
+        throughput, Redis latency, cache hit rates, in-flight graphs and event loop lag.
+    """
+    return PlainTextResponse(
+        render_prometheus(REGISTRY), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/ready")
+async def read_readiness(request: Request) -> JSONResponse:
+    """
+    Endpoint reporting whether the brain API has finished warming up and can take traffic.
+
+    Args:
+        request (Request): The incoming request, used to reach the application's warmup.
+
+    Returns:
+        JSONResponse: The readiness and the outcome of each warmup step, with a 503 status
+        code until warmup has finished.
+    """
+    warmup: Warmup | None = getattr(request.app.state, "warmup", None)
+    readiness = warmup.readiness() if warmup else Readiness(ready=False)
+    return JSONResponse(
+        content=readiness.model_dump(), status_code=200 if readiness.ready else 503
+    )
+
+
+@app.post("/admin/profile")
+async def read_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    authorization: str | None = Header(default=None),
+) -> PlainTextResponse:
+    """
+    Endpoint to sample where Python time goes across all requests for a number of seconds.
+    Disabled unless `BRAIN_ADMIN_TOKEN` is set, and requires it as a bearer token.
+
+    Args:
+        seconds (float): How long to profile for.
+        authorization (str | None): The `Authorization` header holding the admin token.
+
+    Returns:
+        PlainTextResponse: Collapsed stacks, ready to be rendered as a flame graph.
+    """
+    admin_token = os.environ.get("BRAIN_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not authorization or not secrets.compare_digest(
+        authorization, f"Bearer {admin_token}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+    try:
+        collapsed_stacks = await asyncio.to_thread(profile, seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PlainTextResponse(collapsed_stacks)
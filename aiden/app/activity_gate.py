@@ -0,0 +1,91 @@
+import os
+from functools import cache
+
+from aiden.models.brain import ActivityGateStats
+
+AUDITORY_ACTIVITY_GATE_ENABLE = (
+    os.environ.get("AUDITORY_ACTIVITY_GATE_ENABLE", "false").lower() == "true"
+)
+AUDITORY_ACTIVITY_ENERGY_THRESHOLD = float(
+    os.environ.get("AUDITORY_ACTIVITY_ENERGY_THRESHOLD", "0.01")
+)
+AUDITORY_ACTIVITY_MIN_RATIO = float(
+    os.environ.get("AUDITORY_ACTIVITY_MIN_RATIO", "0.1")
+)
+AUDITORY_ACTIVITY_ZCR_THRESHOLD = float(
+    os.environ.get("AUDITORY_ACTIVITY_ZCR_THRESHOLD", "0.3")
+)
+
+
+class ActivityGate:
+    """
+    Skips classifying clips of near-silence, judged by the energy and zero-crossing rate of
+    their frames.
+
+    A frame is active when its RMS energy reaches `energy_threshold`, or a quarter of it
+    with a zero-crossing rate of at least `zcr_threshold`, which catches quiet broadband
+    sounds such as rustling or hissing. A clip is silent when fewer than `min_ratio` of its
+    frames are active.
+    """
+
+    def __init__(
+        self,
+        energy_threshold: float = AUDITORY_ACTIVITY_ENERGY_THRESHOLD,
+        zcr_threshold: float = AUDITORY_ACTIVITY_ZCR_THRESHOLD,
+        min_ratio: float = AUDITORY_ACTIVITY_MIN_RATIO,
+    ):
+        """
+        Args:
+            energy_threshold (float): RMS energy of active frames, relative to full scale.
+            zcr_threshold (float): Zero-crossing rate of quiet frames which are active.
+            min_ratio (float): Fraction of a clip's frames which must be active.
+        """
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.min_ratio = min_ratio
+        self._stats = ActivityGateStats()
+
+    def _is_active(self, energy: float, zero_crossing_rate: float) -> bool:
+        return energy >= self.energy_threshold or (
+            energy >= self.energy_threshold / 4
+            and zero_crossing_rate >= self.zcr_threshold
+        )
+
+    def check(self, activity: list[tuple[float, float]]) -> bool:
+        """
+        Checks whether a clip is active enough to be classified.
+
+        Args:
+            activity (list[tuple[float, float]]): The RMS energy and zero-crossing rate of
+                each frame of the clip, as measured by `frame_activity`.
+
+        Returns:
+            bool: Whether to classify the clip, or False to skip it as silence.
+        """
+        self._stats.clips += 1
+        active = sum(self._is_active(*frame) for frame in activity)
+        if activity and active >= self.min_ratio * len(activity):
+            return True
+
+        self._stats.skipped += 1
+        return False
+
+    def stats(self) -> ActivityGateStats:
+        """
+        Reports how many clips were skipped as silence.
+
+        Returns:
+            ActivityGateStats: The clips checked and skipped.
+        """
+        return self._stats.model_copy()
+
+
+@cache
+def get_activity_gate() -> ActivityGate:
+    """
+    Builds the process wide activity gate from the environment.
+
+    Returns:
+        ActivityGate: The activity gate.
+    """
+    return ActivityGate()
@@ -0,0 +1,32 @@
+import asyncio
+
+
+class Admission:
+    """
+    Bounds how many requests use a backend at once, further requests wait for a free slot.
+
+    An asyncio semaphore is bound to the event loop it is first used in, so the semaphore is
+    created lazily and replaced when used from another running loop, e.g. by each test or
+    each `asyncio.run` of a script, as the shared HTTP session is.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    async def acquire(self) -> None:
+        await self._get_semaphore().acquire()
+
+    def release(self) -> None:
+        self._get_semaphore().release()
+
+    def locked(self) -> bool:
+        return self._get_semaphore().locked()
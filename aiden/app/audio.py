@@ -0,0 +1,205 @@
+import io
+import os
+import wave
+from array import array
+
+from PIL import Image, ImageChops, ImageMath
+
+# Sample rate of the audio YAMNet classifies, which it would otherwise resample to itself
+AUDITORY_SAMPLE_RATE = int(os.environ.get("AUDITORY_SAMPLE_RATE", "16000"))
+
+# Pillow raw modes decoding little-endian integer samples of each width to floats
+_SAMPLE_MODES = {1: "F;8", 2: "F;16S", 4: "F;32S"}
+
+# Flips the sign bit of a byte, converting offset binary samples to two's complement
+_FLIP_SIGN = bytes(value ^ 0x80 for value in range(256))
+
+# Maps the high byte of a 16-bit sample to 255 if the sample is negative, otherwise 0
+_SIGN = bytes(255 if value & 0x80 else 0 for value in range(256))
+
+# Length of the frames whose activity is measured, short enough for speech to be stationary
+ACTIVITY_FRAME_SECONDS = 0.025
+
+
+def _resample(
+    frames: bytes, sample_width: int, channels: int, sample_rate: int
+) -> bytes:
+    # Samples form a float image with a column per channel and a row per frame, so that one
+    # Lanczos resize in C both mixes the channels down and low-pass filters and resamples
+    mode = _SAMPLE_MODES.get(sample_width)
+    if mode is None:
+        raise ValueError(f"Unsupported sample width of {sample_width * 8} bits")
+    count = len(frames) // (sample_width * channels)
+    if count == 0:
+        raise ValueError("The audio has no samples")
+    samples = Image.frombytes(
+        "F", (channels, count), frames[: count * sample_width * channels], "raw", mode
+    )
+    resampled = samples.resize(
+        (1, max(1, round(count * AUDITORY_SAMPLE_RATE / sample_rate))),
+        Image.Resampling.LANCZOS,
+    )
+
+    # Scale to 16-bit, offset to unsigned so converting clips out of range samples, then
+    # flip the sign bit of each high byte back to signed little-endian samples
+    scale, offset = {1: (256, -128 * 256), 2: (1, 0), 4: (1 / 65536, 0)}[sample_width]
+    unsigned = resampled.point(lambda sample: sample * scale + offset + 32768)
+    pcm = bytearray(unsigned.convert("I").convert("I;16").tobytes())
+    pcm[1::2] = pcm[1::2].translate(_FLIP_SIGN)
+    return bytes(pcm)
+
+
+def _encode_wav(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(AUDITORY_SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def normalize_audio(
+    audio: bytes, sample_rate: int | None = None, channels: int = 1
+) -> bytes:
+    """
+    Converts audio to a WAV file of `AUDITORY_SAMPLE_RATE` mono 16-bit PCM, the input of the
+    ambient sound classifier, which is several times smaller than typical 44.1 or 48 kHz
+    stereo clips.
+
+    Decoding, mixing down and resampling are done by Pillow in C, releasing the GIL, so call
+    this in a thread to keep the event loop free.
+
+    Args:
+        audio (bytes): A PCM WAV file, or raw 16-bit little-endian PCM if `sample_rate` is
+            given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        bytes: The WAV file, or the original if it is in the target format already.
+
+    Raises:
+        ValueError: If the audio cannot be decoded, e.g. compressed WAV files.
+    """
+    if sample_rate is not None:
+        return _encode_wav(_resample(audio, 2, channels, sample_rate))
+
+    try:
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            sample_width = wav.getsampwidth()
+            channels = wav.getnchannels()
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (EOFError, wave.Error) as exc:
+        raise ValueError(f"Cannot decode the audio: {exc}") from exc
+
+    if (sample_width, channels, sample_rate) == (2, 1, AUDITORY_SAMPLE_RATE):
+        return audio
+    return _encode_wav(_resample(frames, sample_width, channels, sample_rate))
+
+
+def frame_activity(audio: bytes) -> list[tuple[float, float]]:
+    """
+    Measures the activity of each 25 ms frame of a 16-bit mono WAV file, as normalised by
+    `normalize_audio`, by its RMS energy and zero-crossing rate.
+
+    Frames form a float image with a row per frame, so squaring, detecting sign changes
+    and averaging each row are done by Pillow in C rather than per sample in Python.
+
+    Args:
+        audio (bytes): A 16-bit mono PCM WAV file.
+
+    Returns:
+        list[tuple[float, float]]: The RMS energy of each frame relative to full scale, and
+        the fraction of its samples which cross zero, both from 0 to 1.
+
+    Raises:
+        ValueError: If the audio is not a 16-bit mono PCM WAV file.
+    """
+    try:
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            if (wav.getsampwidth(), wav.getnchannels()) != (2, 1):
+                raise ValueError("Activity is only measured for 16-bit mono audio")
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (EOFError, wave.Error) as exc:
+        raise ValueError(f"Cannot decode the audio: {exc}") from exc
+
+    frame_length = max(1, round(sample_rate * ACTIVITY_FRAME_SECONDS))
+    count = len(frames) // (2 * frame_length)
+    if count == 0:
+        return []
+    size = (frame_length, count)
+    frames = frames[: 2 * frame_length * count]
+
+    samples = Image.frombytes("F", size, frames, "raw", "F;16S")
+    squares = ImageMath.lambda_eval(lambda args: args["a"] * args["a"], a=samples)
+    mean_squares = array(
+        "f", squares.resize((1, count), Image.Resampling.BOX).tobytes()
+    )
+
+    # Compare the sign of each sample with the next, the last one with itself
+    signs = frames[1::2].translate(_SIGN)
+    crossings = ImageChops.difference(
+        Image.frombytes("L", size, signs),
+        Image.frombytes("L", size, signs[1:] + signs[-1:]),
+    )
+    crossing_rates = array(
+        "f", crossings.convert("F").resize((1, count), Image.Resampling.BOX).tobytes()
+    )
+
+    return [
+        (mean_square**0.5 / 32768, crossing_rate / 255)
+        for mean_square, crossing_rate in zip(mean_squares, crossing_rates)
+    ]
+
+
+def split_speech(audio: bytes, max_seconds: float) -> list[bytes]:
+    """
+    Splits a 16-bit mono WAV file, as normalised by `normalize_audio`, into clips of at most
+    `max_seconds`, each cut at its quietest frame in its second half, likely between words,
+    so the clips can be transcribed separately.
+
+    Args:
+        audio (bytes): A 16-bit mono PCM WAV file.
+        max_seconds (float): Longest clip to split the audio into.
+
+    Returns:
+        list[bytes]: The WAV files of the clips, or the original if it is short enough.
+
+    Raises:
+        ValueError: If the audio is not a 16-bit mono PCM WAV file.
+    """
+    activity = frame_activity(audio)
+    frames_per_clip = max(2, int(max_seconds / ACTIVITY_FRAME_SECONDS))
+    if len(activity) <= frames_per_clip:
+        return [audio]
+
+    cuts = [0]
+    while len(activity) - cuts[-1] > frames_per_clip:
+        start = cuts[-1]
+        cuts.append(
+            min(
+                range(start + frames_per_clip // 2, start + frames_per_clip),
+                key=lambda frame: activity[frame][0],
+            )
+        )
+
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        sample_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    frame_bytes = 2 * max(1, round(sample_rate * ACTIVITY_FRAME_SECONDS))
+
+    clips = []
+    for start, end in zip(cuts, cuts[1:] + [None]):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(
+                frames[start * frame_bytes : None if end is None else end * frame_bytes]
+            )
+        clips.append(buffer.getvalue())
+    return clips
@@ -1,13 +1,261 @@
+import asyncio
 import base64
 import json
 import os
+from contextlib import aclosing
 import aiohttp
 from fastapi import HTTPException
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable
 
 from aiden import logger
-from aiden.app.brain.cognition import AUDITORY_AMBIENT_URL_BASE
-from aiden.models.brain import AuditoryRequest, AuditoryResponse, AuditoryResult
+from aiden.app.activity_gate import AUDITORY_ACTIVITY_GATE_ENABLE, get_activity_gate
+from aiden.app.admission import Admission
+from aiden.app.audio import frame_activity, normalize_audio, split_speech
+from aiden.app.brain.cognition import (
+    AUDITORY_AMBIENT_URL_BASE,
+    AUDITORY_LANGUAGE_URL_BASE,
+)
+from aiden.app.clients.http_client import (
+    get_http_session,
+    with_retries,
+)
+from aiden.app.timing import timed
+from aiden.models.brain import (
+    AuditoryBatchClip,
+    AuditoryBatchRequest,
+    AuditoryBatchResult,
+    AuditoryEvent,
+    AuditoryEventType,
+    AuditoryInput,
+    AuditoryLanguageEvent,
+    AuditoryLanguageEventType,
+    AuditoryLanguageRequest,
+    AuditoryRequest,
+    AuditoryResponse,
+    AuditoryResult,
+    AuditoryStreamStart,
+    AuditoryType,
+)
+
+
+AUDIO_FORMAT_HEADER_BYTES = 12
+# Longest clip of speech transcribed at once, longer speech is split between words
+AUDITORY_LANGUAGE_CHUNK_SECONDS = float(
+    os.environ.get("AUDITORY_LANGUAGE_CHUNK_SECONDS", "10.0")
+)
+# Clips transcribed at once, further clips wait for a free slot
+AUDITORY_LANGUAGE_MAX_CONCURRENCY = int(
+    os.environ.get("AUDITORY_LANGUAGE_MAX_CONCURRENCY", "2")
+)
+# Clips classified at once, further clips wait for a free slot
+AUDITORY_MAX_CONCURRENCY = int(os.environ.get("AUDITORY_MAX_CONCURRENCY", "8"))
+AUDITORY_NORMALIZE_ENABLE = (
+    os.environ.get("AUDITORY_NORMALIZE_ENABLE", "true").lower() == "true"
+)
+AUDITORY_STREAM_HOP_SECONDS = float(
+    os.environ.get("AUDITORY_STREAM_HOP_SECONDS", "0.5")
+)
+AUDITORY_STREAM_WINDOW_SECONDS = float(
+    os.environ.get("AUDITORY_STREAM_WINDOW_SECONDS", "1.0")
+)
+
+SILENCE = AuditoryResult(class_name="Silence", score=1.0)
+
+_auditory_admission = Admission(AUDITORY_MAX_CONCURRENCY)
+_language_admission = Admission(AUDITORY_LANGUAGE_MAX_CONCURRENCY)
+
+
+def _detect_audio_format(header: bytes) -> tuple[str, str]:
+    """
+    Determines the file format (MP3 or WAV) of audio by analyzing its first few bytes.
+
+    Args:
+        header (bytes): At least the first `AUDIO_FORMAT_HEADER_BYTES` bytes of the audio.
+
+    Returns:
+        tuple[str, str]: The filename and content type to upload the audio as.
+
+    Raises:
+        HTTPException: If the audio is neither MP3 nor WAV.
+    """
+    if header.startswith(b"\xff\xf3") or header.startswith(b"\xff\xfb"):
+        # MP3 Magic bytes
+        return "audio.mp3", "audio/mp3"
+    elif header.startswith(b"RIFF") and header[8:12] == b"WAVE":
+        # WAV Magic bytes
+        return "audio.wav", "audio/wav"
+    raise HTTPException(status_code=400, detail="Unsupported audio format")
+
+
+async def _normalize_audio(
+    audio: bytes, sample_rate: int | None = None, channels: int = 1
+) -> bytes:
+    """
+    Converts audio to 16 kHz mono PCM WAV in a worker thread, off the event loop.
+
+    Args:
+        audio (bytes): A WAV file, or raw 16-bit PCM if `sample_rate` is given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        bytes: The normalised WAV file, or the original WAV file if it cannot be decoded
+        here, in which case the auditory service is left to handle it.
+
+    Raises:
+        HTTPException: If raw PCM audio cannot be converted.
+    """
+    try:
+        with timed("auditory_normalize"):
+            return await asyncio.to_thread(
+                normalize_audio, audio, sample_rate, channels
+            )
+    except ValueError as exc:
+        if sample_rate is not None:
+            raise HTTPException(status_code=400, detail=str(exc))
+        logger.warning(f"Sending the audio without normalizing it: {exc}")
+        return audio
+
+
+async def _prepare_audio(
+    audio: bytes, sample_rate: int | None = None, channels: int = 1
+) -> tuple[bytes, str, str]:
+    """
+    Detects the format of audio and normalises WAV and raw PCM audio for the classifier.
+
+    Args:
+        audio (bytes): An MP3 or WAV file, or raw 16-bit PCM if `sample_rate` is given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        tuple[bytes, str, str]: The audio, and the filename and content type to upload it as.
+
+    Raises:
+        HTTPException: If the audio is neither MP3, WAV nor raw PCM.
+    """
+    if sample_rate is not None:
+        return (
+            await _normalize_audio(audio, sample_rate, channels),
+            "audio.wav",
+            "audio/wav",
+        )
+
+    filename, content_type = _detect_audio_format(audio)
+    if content_type == "audio/wav" and AUDITORY_NORMALIZE_ENABLE:
+        audio = await _normalize_audio(audio)
+    return audio, filename, content_type
+
+
+async def _is_silent(audio: bytes, content_type: str) -> bool:
+    """
+    Checks with the activity gate whether a clip is near-silence, measuring its activity in
+    a worker thread, off the event loop.
+
+    Args:
+        audio (bytes): The audio file.
+        content_type (str): The content type of the audio.
+
+    Returns:
+        bool: Whether the clip is silent, or False if the gate is disabled or the audio is
+        not 16-bit mono WAV, which the gate cannot measure.
+    """
+    if not AUDITORY_ACTIVITY_GATE_ENABLE or content_type != "audio/wav":
+        return False
+    try:
+        with timed("auditory_activity"):
+            activity = await asyncio.to_thread(frame_activity, audio)
+    except ValueError as exc:
+        logger.debug(f"Classifying the audio without gating it: {exc}")
+        return False
+    return not get_activity_gate().check(activity)
+
+
+async def _silence() -> AsyncGenerator[str, None]:
+    """
+    Reports silence in place of classifying a silent clip.
+
+    Yields:
+        str: A classification result of silence as a JSON string.
+    """
+    yield AuditoryResponse(results=[SILENCE]).model_dump_json()
+
+
+async def _classify(audio: bytes, filename: str, content_type: str) -> AuditoryResponse:
+    """
+    Classifies ambient sounds in audio with the auditory ambient service.
+
+    Only whole files are classified, so an admission slot is never held while a slow client
+    is still sending its audio.
+
+    Args:
+        audio (bytes): The audio file.
+        filename (str): The filename to upload the audio as.
+        content_type (str): The content type of the audio.
+
+    Returns:
+        AuditoryResponse: The classification results.
+
+    Raises:
+        HTTPException: If the service fails to classify the audio.
+    """
+    top_n = os.environ.get("AUDITORY_AMBIENT_TOP_N", "1")
+
+    # Set up the classification request
+    classify_url = f"{AUDITORY_AMBIENT_URL_BASE}/classify"
+    params = {"top_n": top_n}
+
+    async def classify() -> AuditoryResponse:
+        # Form data is consumed when sent, so prepare it again for each attempt
+        form_data = aiohttp.FormData()
+        form_data.add_field("file", audio, filename=filename, content_type=content_type)
+
+        async with get_http_session().post(
+            classify_url, data=form_data, params=params
+        ) as response:
+            if response.status != 200:
+                raise HTTPException(
+                    status_code=response.status, detail=await response.text()
+                )
+
+            response_json = await response.json()
+            return AuditoryResponse(
+                results=[
+                    AuditoryResult(class_name=item["class"], score=item["score"])
+                    for item in response_json
+                ]
+            )
+
+    # Classify once a slot is free, to bound the load on the auditory ambient service
+    with timed("auditory_admission"):
+        await _auditory_admission.acquire()
+    try:
+        return await with_retries(classify)
+    finally:
+        _auditory_admission.release()
+
+
+async def _classify_audio(
+    audio: bytes, filename: str, content_type: str
+) -> AsyncGenerator[str, None]:
+    """
+    Classifies ambient sounds in audio, reporting any error in place of the results.
+
+    Args:
+        audio (bytes): The audio file.
+        filename (str): The filename to upload the audio as.
+        content_type (str): The content type of the audio.
+
+    Yields:
+        str: The classification results as a JSON string, or an error.
+    """
+    try:
+        auditory_response = await _classify(audio, filename, content_type)
+        yield auditory_response.model_dump_json()
+    except Exception as exc:
+        error_message = json.dumps({"error": str(exc)})
+        logger.error(f"Failed recognizing auditory input with error: {exc}")
+        yield error_message
 
 
 async def process_auditory(request: AuditoryRequest) -> AsyncGenerator[str, None]:
@@ -21,52 +269,407 @@ async def process_auditory(request: AuditoryRequest) -> AsyncGenerator[str, None
         str: Each chunk of the classification results as a string. These chunks are parts of
              the full classification result generated by the model, provided sequentially as they are generated.
     """
-    top_n = os.environ.get("AUDITORY_AMBIENT_TOP_N", "1")
     audio_data = base64.b64decode(request.audio)
+    audio_data, filename, content_type = await _prepare_audio(
+        audio_data, request.sample_rate, request.channels
+    )
 
-    # Determine file format (MP3 or WAV) by analyzing the first few bytes
-    if audio_data.startswith(b"\xff\xf3") or audio_data.startswith(b"\xff\xfb"):
-        # MP3 Magic bytes
-        filename = "audio.mp3"
-        content_type = "audio/mp3"
-    elif audio_data.startswith(b"RIFF") and audio_data[8:12] == b"WAVE":
-        # WAV Magic bytes
-        filename = "audio.wav"
-        content_type = "audio/wav"
+    if await _is_silent(audio_data, content_type):
+        stream = _silence()
     else:
-        raise HTTPException(status_code=400, detail="Unsupported audio format")
+        stream = _classify_audio(audio_data, filename, content_type)
+    async for chunk in stream:
+        yield chunk
+
+
+async def process_auditory_upload(
+    chunks: AsyncIterator[bytes], sample_rate: int | None = None, channels: int = 1
+) -> AsyncGenerator[str, None]:
+    """
+    Simulates the primary auditory cortex for raw audio uploaded as a stream of bytes.
+
+    The whole upload is read before the results are streamed, so an upload rejected while
+    it arrives, e.g. for its size, fails the request rather than its results.
 
-    # Prepare the multipart form data
-    form_data = aiohttp.FormData()
-    form_data.add_field(
-        "file", audio_data, filename=filename, content_type=content_type
+    Args:
+        chunks (AsyncIterator[bytes]): The chunks of the uploaded MP3 or WAV file, or raw
+            16-bit PCM if `sample_rate` is given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        AsyncGenerator[str, None]: A generator yielding the classification results.
+
+    Raises:
+        HTTPException: If the audio is neither MP3, WAV nor raw PCM, which is checked before
+            the rest of it is read.
+    """
+    # Read into a single buffer, without copying it again once read, as normalising and
+    # classifying need the whole clip, whose size is bounded by the upload limit
+    audio_data = bytearray()
+    if sample_rate is None:
+        # Only read as far as needed to detect the format before reading the rest
+        async for chunk in chunks:
+            audio_data += chunk
+            if len(audio_data) >= AUDIO_FORMAT_HEADER_BYTES:
+                break
+        _detect_audio_format(audio_data)
+    async for chunk in chunks:
+        audio_data += chunk
+
+    audio_data, filename, content_type = await _prepare_audio(
+        audio_data, sample_rate, channels
     )
+    if await _is_silent(audio_data, content_type):
+        return _silence()
+    return _classify_audio(audio_data, filename, content_type)
 
-    # Set up the classification request
-    classify_url = f"{AUDITORY_AMBIENT_URL_BASE}/classify"
-    params = {"top_n": top_n}
 
-    async with aiohttp.ClientSession() as session:
+async def classify_clip(
+    audio: bytes, sample_rate: int | None = None, channels: int = 1
+) -> AuditoryResponse:
+    """
+    Normalises and classifies a whole clip, reporting silence without the classifier if
+    the activity gate finds the clip silent. Also used by other regions, e.g. to perceive
+    an agent's audio along with its frame.
+
+    Args:
+        audio (bytes): An MP3 or WAV file, or raw 16-bit PCM if `sample_rate` is given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        AuditoryResponse: The classification results.
+
+    Raises:
+        HTTPException: If the audio is in an unsupported format or the service fails to
+            classify it.
+    """
+    audio, filename, content_type = await _prepare_audio(audio, sample_rate, channels)
+    if await _is_silent(audio, content_type):
+        return AuditoryResponse(results=[SILENCE])
+    return await _classify(audio, filename, content_type)
+
+
+async def process_auditory_batch(
+    request: AuditoryBatchRequest,
+) -> AsyncGenerator[str, None]:
+    """
+    Classifies many clips concurrently, e.g. the audio of every agent in a simulation tick.
+
+    Every clip is normalised in the worker thread pool at once, while clips are classified
+    under the same concurrency limit as single clips, so the auditory ambient service is
+    kept busy without being overloaded.
+
+    Args:
+        request (AuditoryBatchRequest): The clips, each tagged with its agent and microphone.
+
+    Yields:
+        str: A JSON line with the agent, microphone and classification results, or error,
+        of each clip as it is classified.
+    """
+
+    async def classify(clip: AuditoryBatchClip) -> AuditoryBatchResult:
+        result = AuditoryBatchResult(agent_id=clip.agent_id, microphone=clip.microphone)
         try:
-            async with session.post(
-                classify_url, data=form_data, params=params
-            ) as response:
-                if response.status != 200:
-                    raise HTTPException(
-                        status_code=response.status, detail=await response.text()
+            audio = base64.b64decode(clip.audio, validate=True)
+            response = await classify_clip(audio, clip.sample_rate, clip.channels)
+            result.results = response.results
+        except Exception as e:
+            logger.error(
+                f"Error in auditory batch for agent {clip.agent_id} microphone "
+                f"{clip.microphone}: {e}"
+            )
+            result.error = str(e)
+        return result
+
+    tasks = [asyncio.create_task(classify(clip)) for clip in request.clips]
+    try:
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            yield result.model_dump_json() + "\n"
+    finally:
+        # Stop classifying the remaining clips if the client disconnected
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def process_auditory_stream(
+    start: AuditoryStreamStart,
+    receive_chunk: Callable[[], Awaitable[bytes]],
+    send_event: Callable[[AuditoryEvent], Awaitable[None]],
+) -> None:
+    """
+    Simulates the primary auditory cortex for an agent's continuous stream of raw PCM
+    audio, classifying overlapping windows of it as it arrives.
+
+    The latest window of the stream is kept in a ring buffer, and a window is classified
+    each time a hop of audio arrives. Windows are classified one at a time, so if several
+    hops arrive while one is classified, only the latest window is classified next. A
+    result event is sent only when the top class changes.
+
+    Args:
+        start (AuditoryStreamStart): The agent and audio format of the stream.
+        receive_chunk (Callable[[], Awaitable[bytes]]): Waits for the next chunk of audio
+            from the agent, raising a `ValueError` for an invalid one.
+        send_event (Callable[[AuditoryEvent], Awaitable[None]]): Sends an event to the agent.
+
+    Raises:
+        Exception: Why the agent went away, or why a result failed to reach the agent, after
+            which the stream ends.
+    """
+    frame_bytes = 2 * start.channels
+    window_bytes = frame_bytes * max(
+        1,
+        round(
+            (start.window_seconds or AUDITORY_STREAM_WINDOW_SECONDS) * start.sample_rate
+        ),
+    )
+    hop_bytes = frame_bytes * max(
+        1,
+        round((start.hop_seconds or AUDITORY_STREAM_HOP_SECONDS) * start.sample_rate),
+    )
+
+    # Holds the latest window, plus any trailing partial frame, and ends at `received`
+    buffer = bytearray()
+    received = 0
+    next_window_end = window_bytes
+    latest: tuple[bytes, float] | None = None
+    pending = asyncio.Event()
+
+    async def classify_windows() -> None:
+        top_class = None
+        while True:
+            await pending.wait()
+            pending.clear()
+            window, time = latest
+            try:
+                response = await classify_clip(
+                    window, start.sample_rate, start.channels
+                )
+            except Exception as exc:
+                logger.error(
+                    f"Failed classifying the stream of {start.agent_id}: {exc}"
+                )
+                await send_event(
+                    AuditoryEvent(
+                        type=AuditoryEventType.ERROR, time=time, content=str(exc)
                     )
+                )
+                continue
+            result = max(
+                response.results, key=lambda result: result.score, default=None
+            )
+            if result is not None and result.class_name != top_class:
+                top_class = result.class_name
+                await send_event(
+                    AuditoryEvent(
+                        type=AuditoryEventType.RESULT, time=time, result=result
+                    )
+                )
+
+    async def receive_chunks() -> None:
+        nonlocal buffer, received, next_window_end, latest
+        while True:
+            try:
+                chunk = await receive_chunk()
+            except ValueError as e:
+                await send_event(
+                    AuditoryEvent(type=AuditoryEventType.ERROR, content=str(e))
+                )
+                continue
+            buffer += chunk
+            received += len(chunk)
+
+            partial = received % frame_bytes
+            if received - partial >= next_window_end:
+                end = len(buffer) - partial
+                latest = (
+                    bytes(buffer[end - window_bytes : end]),
+                    (received - partial) / frame_bytes / start.sample_rate,
+                )
+                next_window_end = received - partial + hop_bytes
+                pending.set()
+            del buffer[: max(0, len(buffer) - window_bytes - partial)]
+
+    receiving = asyncio.create_task(receive_chunks())
+    classifications = asyncio.create_task(classify_windows())
+    try:
+        await asyncio.wait(
+            {receiving, classifications}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if receiving.done():
+            # Raises the reason the agent went away
+            await receiving
+
+        # Classifications only stop if they fail to send an event, after which the audio
+        # would be buffered with no results ever reaching the agent, so the stream ends
+        e = classifications.exception()
+        logger.error(f"Auditory stream of agent {start.agent_id} failed: {e}")
+        raise e
+    finally:
+        for task in (receiving, classifications):
+            task.cancel()
+        await asyncio.gather(receiving, classifications, return_exceptions=True)
+
 
-                response_json = await response.json()
-                auditory_response = AuditoryResponse(
-                    results=[
-                        AuditoryResult(class_name=item["class"], score=item["score"])
-                        for item in response_json
-                    ]
+async def _transcribe(
+    audio: bytes, filename: str, content_type: str, language: str | None = None
+) -> str:
+    """
+    Transcribes speech with the auditory language service.
+
+    Args:
+        audio (bytes): The audio file.
+        filename (str): The filename to upload the audio as.
+        content_type (str): The content type of the audio.
+        language (str | None): The language spoken, detected by the service if None.
+
+    Returns:
+        str: The transcript.
+
+    Raises:
+        HTTPException: If the service fails to transcribe the audio.
+    """
+    transcribe_url = f"{AUDITORY_LANGUAGE_URL_BASE}/asr"
+    params = {"task": "transcribe", "output": "json", "encode": "true"}
+    if language is not None:
+        params["language"] = language
+
+    async def transcribe() -> str:
+        # Form data is consumed when sent, so prepare it again for each attempt
+        form_data = aiohttp.FormData()
+        form_data.add_field(
+            "audio_file", audio, filename=filename, content_type=content_type
+        )
+
+        async with get_http_session().post(
+            transcribe_url, data=form_data, params=params
+        ) as response:
+            if response.status != 200:
+                raise HTTPException(
+                    status_code=response.status, detail=await response.text()
                 )
+            # The service sends JSON as plain text
+            response_json = await response.json(content_type=None)
+            return response_json["text"].strip()
 
-                yield auditory_response.model_dump_json()
+    # Transcribe once a slot is free, to bound the load on the auditory language service
+    with timed("auditory_language_admission"):
+        await _language_admission.acquire()
+    try:
+        with timed("auditory_language"):
+            return await with_retries(transcribe)
+    finally:
+        _language_admission.release()
 
-        except Exception as exc:
-            error_message = json.dumps({"error": str(exc)})
-            logger.error(f"Failed recognizing auditory input with error: {exc}")
-            yield error_message
+
+async def _split_speech(
+    audio: bytes, sample_rate: int | None = None, channels: int = 1
+) -> list[tuple[bytes, str, str]]:
+    """
+    Normalises speech and splits it into clips short enough to transcribe quickly.
+
+    Args:
+        audio (bytes): An MP3 or WAV file, or raw 16-bit PCM if `sample_rate` is given.
+        sample_rate (int | None): Sample rate of raw PCM audio.
+        channels (int): Interleaved channels of raw PCM audio.
+
+    Returns:
+        list[tuple[bytes, str, str]]: Each clip, and the filename and content type to upload
+        it as. Only normalised WAV files are split.
+
+    Raises:
+        HTTPException: If the audio is neither MP3, WAV nor raw PCM.
+    """
+    audio, filename, content_type = await _prepare_audio(audio, sample_rate, channels)
+    if content_type != "audio/wav":
+        return [(audio, filename, content_type)]
+    try:
+        clips = await asyncio.to_thread(
+            split_speech, audio, AUDITORY_LANGUAGE_CHUNK_SECONDS
+        )
+    except ValueError:
+        clips = [audio]
+    return [(clip, filename, content_type) for clip in clips]
+
+
+async def process_auditory_language(
+    request: AuditoryLanguageRequest,
+) -> AsyncGenerator[str, None]:
+    """
+    Simulates the auditory language region by transcribing speech, optionally passing the
+    transcript on to the cortical region in the same request.
+
+    Long speech is split between words into clips which are transcribed concurrently, and
+    the transcript so far is sent as each clip is transcribed in order.
+
+    Args:
+        request (AuditoryLanguageRequest): The speech, and the cortical request to run with
+            the transcript as a language input, if any.
+
+    Yields:
+        str: A JSON line for each partial transcript, the full transcript, then each event
+        of the cortical tick, or an error.
+    """
+    tasks = []
+    try:
+        clips = await _split_speech(
+            base64.b64decode(request.audio), request.sample_rate, request.channels
+        )
+        tasks = [
+            asyncio.create_task(_transcribe(*clip, request.language)) for clip in clips
+        ]
+        texts = []
+        for index, task in enumerate(tasks):
+            texts.append(await task)
+            transcript = " ".join(text for text in texts if text)
+            if index < len(tasks) - 1:
+                yield (
+                    AuditoryLanguageEvent(
+                        type=AuditoryLanguageEventType.PARTIAL, content=transcript
+                    ).model_dump_json()
+                    + "\n"
+                )
+        yield (
+            AuditoryLanguageEvent(
+                type=AuditoryLanguageEventType.TRANSCRIPT, content=transcript
+            ).model_dump_json()
+            + "\n"
+        )
+
+        if request.cortical is None or not transcript:
+            return
+
+        # Only imported when needed, as the cortical region loads the graph libraries
+        from aiden.app.brain.cortical import process_cortical_events
+
+        sensory = request.cortical.sensory.model_copy(
+            update={
+                "auditory": request.cortical.sensory.auditory
+                + [AuditoryInput(type=AuditoryType.LANGUAGE, content=transcript)]
+            }
+        )
+        cortical_request = request.cortical.model_copy(update={"sensory": sensory})
+        async with aclosing(process_cortical_events(cortical_request)) as events:
+            async for event in events:
+                yield (
+                    AuditoryLanguageEvent(
+                        type=AuditoryLanguageEventType.CORTICAL, cortical=event
+                    ).model_dump_json()
+                    + "\n"
+                )
+    except Exception as e:
+        logger.error(f"Failed recognizing speech with error: {e}")
+        yield (
+            AuditoryLanguageEvent(
+                type=AuditoryLanguageEventType.ERROR, content=str(e)
+            ).model_dump_json()
+            + "\n"
+        )
+    finally:
+        # Stop transcribing the remaining clips if the client disconnected
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
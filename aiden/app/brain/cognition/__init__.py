@@ -1,6 +1,14 @@
 import os
 
 AUDITORY_AMBIENT_URL_BASE = f'{os.environ.get("AUDITORY_AMBIENT_API_PROTOCOL", "http")}://{os.environ.get("AUDITORY_AMBIENT_API_HOST", "localhost")}:{os.environ.get("AUDITORY_AMBIENT_API_PORT", "8000")}'
+AUDITORY_LANGUAGE_URL_BASE = f'{os.environ.get("AUDITORY_LANGUAGE_API_PROTOCOL", "http")}://{os.environ.get("AUDITORY_LANGUAGE_API_HOST", "localhost")}:{os.environ.get("AUDITORY_LANGUAGE_API_PORT", "9000")}'
 COGNITIVE_API_URL_BASE = f'{os.environ.get("COGNITIVE_API_PROTOCOL", "http")}://{os.environ.get("COGNITIVE_API_HOST", "localhost")}:{os.environ.get("COGNITIVE_API_PORT", "11434")}'
 COGNITIVE_API_URL_CHAT = f"{COGNITIVE_API_URL_BASE}/api/chat"
+# Additional cognitive backends which hedged requests can be sent to, comma separated
+COGNITIVE_API_HEDGE_URL_BASES = [
+    url.strip()
+    for url in os.environ.get("COGNITIVE_API_HEDGE_URLS", "").split(",")
+    if url.strip()
+]
 VISION_API_URL_BASE = f'{os.environ.get("VISION_API_PROTOCOL", "http")}://{os.environ.get("VISION_API_HOST", "localhost")}:{os.environ.get("VISION_API_PORT", "11434")}'
+VOCAL_API_URL_BASE = f'{os.environ.get("VOCAL_API_PROTOCOL", "http")}://{os.environ.get("VOCAL_API_HOST", "localhost")}:{os.environ.get("VOCAL_API_PORT", "5002")}'
@@ -1,15 +1,25 @@
 import os
+from contextlib import aclosing
+from typing import Callable
 
 from langchain_ollama import ChatOllama
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from aiden import logger
-from aiden.app.brain.cognition import COGNITIVE_API_URL_BASE
+from aiden.app.brain.cognition import (
+    COGNITIVE_API_HEDGE_URL_BASES,
+    COGNITIVE_API_URL_BASE,
+)
+from aiden.app.brain.cognition.resilience import Deadline, invoke_with_hedging
 from aiden.models.brain import BrainConfig
 
 
 async def process_broca(
-    sensory_input: str, brain_config: BrainConfig, language_input: str
+    sensory_input: str,
+    brain_config: BrainConfig,
+    language_input: str,
+    deadline: Deadline | None = None,
+    on_token: Callable[[str], None] | None = None,
 ) -> str | None:
     """
     Simulates broca's area by processing the integrated sensory input and auditory
@@ -19,9 +29,14 @@ async def process_broca(
         sensory_input (str): Processed sensory input that includes all sensory data.
         brain_config (BrainConfig): Configuration for the brain, used to guide the response.
         language_input (str): The spoken language input that the AI needs to respond to.
+        deadline (Deadline | None): The request's deadline, capping latency and response length.
+        on_token (Callable[[str], None] | None): Called with each token of the response as
+            it is generated, e.g. to start speaking before the response is complete. The
+            request is then not hedged, so the tokens passed on are always those of the
+            returned response.
 
     Returns:
-        str: The AI's spoken response, or None if empty response.
+        str: The AI's spoken response, or None if empty response or no backend responded.
     """
     instruction = "\n".join(brain_config.regions.broca.instruction)
 
@@ -33,20 +48,46 @@ async def process_broca(
         HumanMessage(content=combined_input),
     ]
 
-    llm = ChatOllama(
-        base_url=COGNITIVE_API_URL_BASE,
-        model=os.environ.get("COGNITIVE_MODEL", "mistral"),
-        timeout=30.0,
-        frequency_penalty=1.2,
-        presence_penalty=0.6,
-        temperature=0.4,
-        top_p=0.85,
-        max_tokens=150,
-    )
+    async def invoke(base_url: str) -> AIMessage:
+        llm = ChatOllama(
+            base_url=base_url,
+            model=os.environ.get("COGNITIVE_MODEL", "mistral"),
+            timeout=30.0,
+            frequency_penalty=1.2,
+            presence_penalty=0.6,
+            temperature=0.4,
+            top_p=0.85,
+            max_tokens=150,
+            num_predict=deadline.num_predict() if deadline else None,
+        )
+        if on_token is None:
+            return await llm.ainvoke(messages)
+
+        message = None
+        async with aclosing(llm.astream(messages)) as stream:
+            async for chunk in stream:
+                message = chunk if message is None else message + chunk
+                if chunk.content:
+                    on_token(chunk.content)
+        return message
 
     logger.info(f"Broca's area chat message: {messages}")
 
-    response: AIMessage = llm.invoke(messages)
+    # Streamed tokens are spoken as they arrive, and a hedge finishing first would return
+    # a response other than the one spoken, so streamed requests only go to the primary
+    backends = [COGNITIVE_API_URL_BASE]
+    if on_token is None:
+        backends += COGNITIVE_API_HEDGE_URL_BASES
+
+    try:
+        response = await invoke_with_hedging(
+            "broca", invoke, backends=backends, deadline=deadline
+        )
+    except Exception as exc:
+        # Stay silent rather than holding up the rest of the cortical tick
+        logger.error(f"Failed broca's area response with error: {exc}")
+        return None
+
     content = response.content.strip()
     logger.info(f"Broca's decision: {content}")
     return content if content != "" else None
@@ -1,28 +1,90 @@
-from enum import StrEnum
+import json
 import os
+from functools import lru_cache
 
-from langchain_core.tools import tool
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_ollama import ChatOllama
-from pydantic import ValidationError
 
 from aiden import logger
-from aiden.app.brain.cognition import COGNITIVE_API_URL_BASE
+from aiden.app.brain.cognition import (
+    COGNITIVE_API_HEDGE_URL_BASES,
+    COGNITIVE_API_URL_BASE,
+)
+from aiden.app.brain.cognition.resilience import (
+    BackendUnavailableError,
+    Deadline,
+    invoke_with_hedging,
+)
 from aiden.models.brain import ACTION_NONE, Action, BrainConfig
 
+# Distinct action sets whose decision schemas are kept, e.g. one per kind of agent
+COGNITIVE_PREFRONTAL_SCHEMA_CACHE_SIZE = int(
+    os.environ.get("COGNITIVE_PREFRONTAL_SCHEMA_CACHE_SIZE", "128")
+)
+
+
+@lru_cache(maxsize=COGNITIVE_PREFRONTAL_SCHEMA_CACHE_SIZE)
+def _decision_schema(action_names: tuple[str, ...]) -> dict:
+    """
+    Builds the JSON schema constraining the model's output to a single decision among the
+    actions available, built once per set of actions.
+
+    Args:
+        action_names (tuple[str, ...]): Names of the actions available.
+
+    Returns:
+        dict: The JSON schema of the decision.
+    """
+    return {
+        "type": "object",
+        "properties": {"action": {"type": "string", "enum": list(action_names)}},
+        "required": ["action"],
+    }
+
+
+def _parse_decision(content: str, action_names: tuple[str, ...]) -> str:
+    """
+    Reads the action decided from the model's output, which matches the decision schema
+    unless the backend does not support structured outputs.
+
+    Args:
+        content (str): The model's output.
+        action_names (tuple[str, ...]): Names of the actions available.
+
+    Returns:
+        str: The action decided, or `ACTION_NONE` if none of the actions available.
+    """
+    try:
+        decision = json.loads(content)
+        action = decision.get("action") if isinstance(decision, dict) else None
+    except json.JSONDecodeError:
+        action = None
+    if action in action_names:
+        return action
+
+    # Otherwise take the longest action named in the output, rather than asking again
+    logger.warning(f"The current model produced an unexpected decision: {content}")
+    mentioned = [name for name in action_names if name.lower() in content.lower()]
+    return max(mentioned, key=len, default=ACTION_NONE)
+
 
 async def process_prefrontal(
     sensory_input: str,
     brain_config: BrainConfig,
     actions: list[Action] = [],
+    deadline: Deadline | None = None,
 ) -> str | None:
     """
     Simulates the prefrontal cortex decision-making based on sensory input.
 
+    The decision is constrained by a JSON schema with an enum over the action names, so
+    the model can only produce one of the actions available.
+
     Args:
         sensory_input (str): Processed sensory input.
         brain_config (BrainConfig): Configuration of the brain.
         actions (list[Action]): List of actions available to decide upon. Defaults to no actions.
+        deadline (Deadline | None): The request's deadline, capping how long to wait for a decision.
 
     Returns:
         str | None: The decision on the next action, or None if no action decided.
@@ -36,10 +98,9 @@ async def process_prefrontal(
     # Ensure an action to do nothing is available
     if ACTION_NONE not in action_names:
         action_names.append(ACTION_NONE)
+    action_names = tuple(action_names)
 
-    # Format actions into a string to add in decision prompt
-    # TODO: Adding this to the decision prompt wasn't required in older langchain versions
-    #   for the current tool to work. Can we simplify the implementation again?
+    # The schema constrains the output, while the prompt tells the model what each means
     formatted_actions = ", ".join(f"'{action}'" for action in action_names)
 
     instruction = "\n".join(brain_config.regions.prefrontal.instruction)
@@ -51,51 +112,36 @@ async def process_prefrontal(
         HumanMessage(content=decision_prompt),
     ]
 
-    Actions = StrEnum("Actions", action_names)
-
-    @tool
-    def map_decision_to_action(action: Actions) -> str:
-        """
-        Based on the sensory and action inputs, decide which action to take.
-        """
-        if action in action_names:
-            return action
-        return ACTION_NONE
-
-    llm = ChatOllama(
-        base_url=COGNITIVE_API_URL_BASE,
-        model=os.environ.get("COGNITIVE_MODEL", "mistral"),
-        format="json",
-        timeout=30.0,
-        frequency_penalty=1.0,
-        presence_penalty=0.6,
-        temperature=0.6,
-        top_p=0.95,
-        max_tokens=80,
-    ).bind_tools([map_decision_to_action])
+    decision_schema = _decision_schema(action_names)
+
+    async def invoke(base_url: str) -> AIMessage:
+        llm = ChatOllama(
+            base_url=base_url,
+            model=os.environ.get("COGNITIVE_MODEL", "mistral"),
+            format=decision_schema,
+            timeout=30.0,
+            frequency_penalty=1.0,
+            presence_penalty=0.6,
+            temperature=0.6,
+            top_p=0.95,
+            max_tokens=80,
+        )
+        return await llm.ainvoke(messages)
 
     logger.info(f"Prefrontal chat message: {messages}")
-    logger.debug(
-        f"Prefrontal tool schema: {map_decision_to_action.args_schema.model_json_schema()}"
-    )
+    logger.debug(f"Prefrontal decision schema: {decision_schema}")
 
     try:
-        response: AIMessage = llm.invoke(decision_prompt)
-        logger.debug(f"Prefrontal response: {response}")
-        args = (
-            response.tool_calls[0]["args"]
-            if response.tool_calls and "args" in response.tool_calls[0]
-            else {"actions": ACTION_NONE}
-        )
-        logger.info(f"Prefrontal tool arguments: {args}")
-        action = map_decision_to_action.invoke(args)
-    except ValidationError as exc:
-        logger.error(f"The current model produced an unexpected action. Error: {exc}")
-        return None
-    except ValueError as exc:
-        logger.error(
-            f"The current model does not support tool/function calling. Error: {exc}"
+        response: AIMessage = await invoke_with_hedging(
+            "prefrontal",
+            invoke,
+            backends=[COGNITIVE_API_URL_BASE, *COGNITIVE_API_HEDGE_URL_BASES],
+            deadline=deadline,
         )
+        logger.debug(f"Prefrontal response: {response}")
+        action = _parse_decision(response.content, action_names)
+    except BackendUnavailableError as exc:
+        logger.error(f"No cognitive backend decided an action in time: {exc}")
         return None
     except Exception as exc:
         logger.error(
@@ -103,12 +149,8 @@ async def process_prefrontal(
         )
         return None
 
-    try:
-        if action == ACTION_NONE:
-            action = None
+    if action == ACTION_NONE:
+        action = None
 
-        logger.info(f"Mapped action: {action}")
-        return action
-    except Exception as exc:
-        logger.error(f"Failed prefrontal decision-making with error: {exc}")
-        return None
+    logger.info(f"Mapped action: {action}")
+    return action
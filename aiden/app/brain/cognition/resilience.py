@@ -0,0 +1,377 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from aiden import logger
+from aiden.app.metrics import BACKEND_TOKENS, BACKEND_TOKENS_PER_SECOND
+from aiden.app.timing import record_timing
+
+T = TypeVar("T")
+
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("COGNITIVE_CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")
+)
+CIRCUIT_BREAKER_RESET_TIMEOUT = float(
+    os.environ.get("COGNITIVE_CIRCUIT_BREAKER_RESET_TIMEOUT", "30.0")
+)
+DEADLINE_MIN_NUM_PREDICT = int(
+    os.environ.get("COGNITIVE_DEADLINE_MIN_NUM_PREDICT", "16")
+)
+DEADLINE_TOKENS_PER_SECOND = float(
+    os.environ.get("COGNITIVE_DEADLINE_TOKENS_PER_SECOND", "20.0")
+)
+HEDGE_DEFAULT_DELAY = float(os.environ.get("COGNITIVE_HEDGE_DEFAULT_DELAY", "5.0"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("COGNITIVE_HEDGE_MIN_SAMPLES", "20"))
+LATENCY_BUDGET_DEFAULT = float(os.environ.get("COGNITIVE_LATENCY_BUDGET", "30.0"))
+LATENCY_WINDOW_SIZE = 200
+
+
+class BackendUnavailableError(Exception):
+    """Raised when no backend produced a response within the region's latency budget."""
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of a backend and stops sending requests to it while open.
+
+    After `reset_timeout` seconds an open breaker lets a single trial request through
+    (half-open). A success closes the breaker again, a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """
+        Checks whether a request may be sent to the backend.
+
+        Returns:
+            bool: True if the breaker is closed, or half-open and no trial request is in flight.
+        """
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight:
+            return False
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """
+        Ends a half-open trial request which was cancelled, e.g. after losing a hedge race,
+        without counting it as a success or failure, so another trial may be sent.
+        """
+        self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Keeps a rolling window of successful call latencies to estimate a region's p95.
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        self.samples: deque[float] = deque(maxlen=window_size)
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        Estimates a latency percentile from the rolling window.
+
+        Args:
+            percentile (float): The percentile to estimate, between 0 and 100.
+
+        Returns:
+            float | None: The latency in seconds, or None if too few samples were recorded.
+        """
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+
+class Deadline:
+    """
+    A point in time by which a request must be answered, propagated through the brain regions.
+    """
+
+    def __init__(self, budget: float):
+        self.expires_at = time.monotonic() + budget
+
+    @classmethod
+    def from_milliseconds(cls, budget_ms: int | None) -> "Deadline | None":
+        """
+        Creates a deadline from an optional latency budget.
+
+        Args:
+            budget_ms (int | None): The latency budget in milliseconds.
+
+        Returns:
+            Deadline | None: The deadline, or None if no budget was given.
+        """
+        return None if budget_ms is None else cls(budget_ms / 1000)
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def allows(self, region: str) -> bool:
+        """
+        Checks whether a region is expected to finish before the deadline.
+
+        Args:
+            region (str): Name of the brain region about to run.
+
+        Returns:
+            bool: False if the deadline passed or the remaining time is below the region's p95.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            return False
+        p95 = get_latency_tracker(region).percentile(95)
+        return p95 is None or remaining >= p95
+
+    def num_predict(self) -> int:
+        """
+        Caps the number of tokens to generate so generation can finish before the deadline.
+
+        Returns:
+            int: The maximum number of tokens to predict.
+        """
+        return max(
+            DEADLINE_MIN_NUM_PREDICT,
+            int(self.remaining() * DEADLINE_TOKENS_PER_SECOND),
+        )
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_latency_trackers: dict[str, LatencyTracker] = {}
+
+
+def get_circuit_breaker(backend: str) -> CircuitBreaker:
+    """Returns the circuit breaker for a backend URL, creating it on first use."""
+    if backend not in _circuit_breakers:
+        _circuit_breakers[backend] = CircuitBreaker()
+    return _circuit_breakers[backend]
+
+
+def get_latency_tracker(region: str) -> LatencyTracker:
+    """Returns the latency tracker for a brain region, creating it on first use."""
+    if region not in _latency_trackers:
+        _latency_trackers[region] = LatencyTracker()
+    return _latency_trackers[region]
+
+
+def get_latency_budget(region: str, deadline: Deadline | None = None) -> float:
+    """
+    Gets the total time in seconds a region may spend waiting on its backends.
+
+    Args:
+        region (str): Name of the brain region, e.g. `thalamus`.
+        deadline (Deadline | None): The request's deadline, if any.
+
+    Returns:
+        float: The budget from `COGNITIVE_LATENCY_BUDGET_<REGION>`, or `COGNITIVE_LATENCY_BUDGET`,
+               capped to the time remaining before the deadline.
+    """
+    budget = float(
+        os.environ.get(
+            f"COGNITIVE_LATENCY_BUDGET_{region.upper()}", LATENCY_BUDGET_DEFAULT
+        )
+    )
+    return budget if deadline is None else min(budget, deadline.remaining())
+
+
+def get_hedge_delay(region: str) -> float:
+    """
+    Gets how long to wait on a backend before sending a hedged duplicate request.
+
+    Args:
+        region (str): Name of the brain region.
+
+    Returns:
+        float: The region's observed p95 latency, or the default delay while warming up.
+    """
+    p95 = get_latency_tracker(region).percentile(95)
+    return p95 if p95 is not None else HEDGE_DEFAULT_DELAY
+
+
+def _record_backend_usage(result: object) -> None:
+    # Ollama reports the model, token counts and generation time on chat responses
+    metadata = getattr(result, "response_metadata", None)
+    if not isinstance(metadata, dict) or "model" not in metadata:
+        return
+
+    model = metadata["model"]
+    eval_count = metadata.get("eval_count")
+    eval_duration = metadata.get("eval_duration")
+    if metadata.get("prompt_eval_count") is not None:
+        BACKEND_TOKENS.inc(metadata["prompt_eval_count"], model=model, kind="prompt")
+    if eval_count is not None:
+        BACKEND_TOKENS.inc(eval_count, model=model, kind="eval")
+        if eval_duration:
+            BACKEND_TOKENS_PER_SECOND.observe(
+                eval_count / (eval_duration / 1e9), model=model
+            )
+
+
+async def _attempt(
+    region: str,
+    backend: str,
+    invoke: Callable[[str], Awaitable[T]],
+    trial: bool = False,
+) -> T:
+    started = time.monotonic()
+    try:
+        result = await invoke(backend)
+    except asyncio.CancelledError:
+        # A cancelled trial says nothing of the backend's health
+        if trial:
+            get_circuit_breaker(backend).release_trial()
+        raise
+    except Exception as exc:
+        logger.warning(f"Backend {backend} failed for {region}: {exc}")
+        get_circuit_breaker(backend).record_failure()
+        raise
+    latency = time.monotonic() - started
+    get_circuit_breaker(backend).record_success()
+    get_latency_tracker(region).record(latency)
+
+    _record_backend_usage(result)
+    usage = getattr(result, "usage_metadata", None) or {}
+    record_timing(
+        f"{region}_llm",
+        latency,
+        prompt_tokens=usage.get("input_tokens"),
+        eval_tokens=usage.get("output_tokens"),
+    )
+    return result
+
+
+async def invoke_with_hedging(
+    region: str,
+    invoke: Callable[[str], Awaitable[T]],
+    backends: list[str],
+    budget: float | None = None,
+    deadline: Deadline | None = None,
+) -> T:
+    """
+    Calls a backend within the region's latency budget, hedging to further backends.
+
+    The first healthy backend is called. If it has not answered once the region's p95
+    latency has passed, or it fails, the call is duplicated to the next healthy backend.
+    The first successful response wins and all other in-flight calls are cancelled.
+
+    Args:
+        region (str): Name of the brain region making the call.
+        invoke (Callable[[str], Awaitable[T]]): Performs the call against a backend base URL.
+        backends (list[str]): Backend base URLs in order of preference.
+        budget (float | None): Total seconds to wait. Defaults to the region's latency budget.
+        deadline (Deadline | None): The request's deadline, capping the default budget.
+
+    Returns:
+        T: The result of the first successful call.
+
+    Raises:
+        BackendUnavailableError: If no backend succeeded within the budget.
+    """
+    budget = get_latency_budget(region, deadline) if budget is None else budget
+    candidates = iter(backends)
+    pending: dict[asyncio.Task, str] = {}
+
+    def launch_next() -> bool:
+        # Breakers are only consulted on launch so half-open trials are not wasted
+        for backend in candidates:
+            breaker = get_circuit_breaker(backend)
+            if breaker.allow():
+                # Only half-open trials are let through an open breaker
+                trial = breaker.is_open
+                task = asyncio.create_task(_attempt(region, backend, invoke, trial))
+                if trial:
+                    # Also ends trials cancelled before they started running
+                    task.add_done_callback(
+                        lambda task, breaker=breaker: task.cancelled()
+                        and breaker.release_trial()
+                    )
+                pending[task] = backend
+                return True
+        return False
+
+    if not launch_next():
+        raise BackendUnavailableError(f"All backends for {region} are circuit broken")
+
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + budget
+    hedge_delay = get_hedge_delay(region)
+    can_hedge = True
+    last_error: Exception | None = None
+
+    try:
+        while pending:
+            remaining = expires_at - loop.time()
+            if remaining <= 0:
+                logger.warning(
+                    f"Backends {list(pending.values())} exceeded {region} budget"
+                )
+                # Running out of a caller's deadline is not the backend's fault
+                if budget >= get_latency_budget(region):
+                    for backend in pending.values():
+                        get_circuit_breaker(backend).record_failure()
+                break
+
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=min(hedge_delay, remaining) if can_hedge else remaining,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if not done:
+                can_hedge = launch_next()
+                if can_hedge:
+                    logger.info(f"Hedging {region} request to {list(pending.values())}")
+                continue
+
+            for task in done:
+                pending.pop(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+
+            # Fail over straight away rather than waiting on the hedge delay
+            can_hedge = launch_next()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise BackendUnavailableError(
+        f"No backend responded for {region} within {budget}s"
+    ) from last_error
@@ -4,37 +4,53 @@ from langchain_ollama import ChatOllama
 from langchain_core.messages import AIMessage, BaseMessage
 
 from aiden import logger
-from aiden.app.brain.cognition import COGNITIVE_API_URL_BASE
+from aiden.app.brain.cognition import (
+    COGNITIVE_API_HEDGE_URL_BASES,
+    COGNITIVE_API_URL_BASE,
+)
+from aiden.app.brain.cognition.resilience import Deadline, invoke_with_hedging
 
 
-async def process_subconscious(messages: list[BaseMessage]) -> str | None:
+async def process_subconscious(
+    messages: list[BaseMessage], deadline: Deadline | None = None
+) -> str | None:
     """
     Process the thoughts from the subconscious areas of the AI model and return them as a string.
 
     Args:
         chat_message (list[BaseMessage]): The message to be processed.
+        deadline (Deadline | None): The request's deadline, capping latency and response length.
 
     Returns:
         str: The processed thoughts as a string. If processing fails, returns None.
     """
-    llm = ChatOllama(
-        base_url=COGNITIVE_API_URL_BASE,
-        model=os.environ.get("COGNITIVE_MODEL", "mistral"),
-        timeout=30.0,
-        frequency_penalty=1.2,
-        penalize_newline=False,
-        presence_penalty=1.7,
-        repeat_last_n=48,
-        repeat_penalty=1.3,
-        temperature=0.9,
-        top_k=16,
-        top_p=0.9,
-    )
+
+    async def invoke(base_url: str) -> AIMessage:
+        llm = ChatOllama(
+            base_url=base_url,
+            model=os.environ.get("COGNITIVE_MODEL", "mistral"),
+            timeout=30.0,
+            frequency_penalty=1.2,
+            penalize_newline=False,
+            presence_penalty=1.7,
+            repeat_last_n=48,
+            repeat_penalty=1.3,
+            temperature=0.9,
+            top_k=16,
+            top_p=0.9,
+            num_predict=deadline.num_predict() if deadline else None,
+        )
+        return await llm.ainvoke(messages)
 
     logger.info(f"Subconcious chat message: {messages}")
 
-    response: AIMessage = llm.invoke(messages)
     try:
+        response = await invoke_with_hedging(
+            "subconscious",
+            invoke,
+            backends=[COGNITIVE_API_URL_BASE, *COGNITIVE_API_HEDGE_URL_BASES],
+            deadline=deadline,
+        )
         content = response.content.strip()
         logger.info(f"Thoughts: {content}")
         return content
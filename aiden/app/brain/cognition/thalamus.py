@@ -4,17 +4,24 @@ from langchain_ollama import ChatOllama
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from aiden import logger
-from aiden.app.brain.cognition import COGNITIVE_API_URL_BASE
+from aiden.app.brain.cognition import (
+    COGNITIVE_API_HEDGE_URL_BASES,
+    COGNITIVE_API_URL_BASE,
+)
+from aiden.app.brain.cognition.resilience import Deadline, invoke_with_hedging
 from aiden.models.brain import BrainConfig
 
 
-async def process_thalamus(sensory_input: str, brain_config: BrainConfig) -> str:
+async def process_thalamus(
+    sensory_input: str, brain_config: BrainConfig, deadline: Deadline | None = None
+) -> str:
     """
     Simulates the thalamic process of restructuring sensory input.
 
     Args:
         sensory_input (str): The initial sensory data.
         brain_config (BrainConfig): Configuration of the brain.
+        deadline (Deadline | None): The request's deadline, capping latency and response length.
 
     Returns:
         str: The rewritten sensory prompt or the original if the request fails.
@@ -23,24 +30,32 @@ async def process_thalamus(sensory_input: str, brain_config: BrainConfig) -> str
 
     messages = [SystemMessage(content=instruction), HumanMessage(content=sensory_input)]
 
-    llm = ChatOllama(
-        base_url=COGNITIVE_API_URL_BASE,
-        model=os.environ.get("COGNITIVE_MODEL", "mistral"),
-        timeout=30.0,
-        frequency_penalty=1.2,
-        penalize_newline=False,
-        presence_penalty=1.0,
-        repeat_last_n=32,
-        repeat_penalty=1.0,
-        temperature=0.7,
-        top_k=40,
-        top_p=0.9,
-    )
+    async def invoke(base_url: str) -> AIMessage:
+        llm = ChatOllama(
+            base_url=base_url,
+            model=os.environ.get("COGNITIVE_MODEL", "mistral"),
+            timeout=30.0,
+            frequency_penalty=1.2,
+            penalize_newline=False,
+            presence_penalty=1.0,
+            repeat_last_n=32,
+            repeat_penalty=1.0,
+            temperature=0.7,
+            top_k=40,
+            top_p=0.9,
+            num_predict=deadline.num_predict() if deadline else None,
+        )
+        return await llm.ainvoke(messages)
 
     logger.info(f"Thalamus chat message: {messages}")
 
-    response: AIMessage = llm.invoke(messages)
     try:
+        response = await invoke_with_hedging(
+            "thalamus",
+            invoke,
+            backends=[COGNITIVE_API_URL_BASE, *COGNITIVE_API_HEDGE_URL_BASES],
+            deadline=deadline,
+        )
         logger.info(f"Restructured sensory input: {response.content}")
         return response.content
     except Exception as exc:
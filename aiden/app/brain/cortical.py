@@ -1,16 +1,26 @@
+import asyncio
 import operator
-from typing import Annotated, AsyncGenerator, Literal
+import os
+from contextlib import aclosing, suppress
+from functools import cache
+from typing import Annotated, AsyncGenerator, Awaitable, Callable, Literal
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END, MessagesState
+from langgraph.graph.state import CompiledStateGraph
 
 from aiden import logger
-from aiden.app.brain.memory.hippocampus import MemoryManager
+from aiden.app.admission import Admission
+from aiden.app.brain.memory.hippocampus import BatchMemoryManager, MemoryManager
 from aiden.app.brain.cognition.broca import process_broca
 from aiden.app.brain.cognition.prefrontal import process_prefrontal
+from aiden.app.brain.cognition.resilience import Deadline
 from aiden.app.brain.cognition.subconscious import process_subconscious
 from aiden.app.brain.cognition.thalamus import process_thalamus
 from aiden.app.clients.redis_client import redis_client
+from aiden.app.metrics import CORTICAL_GRAPHS_IN_FLIGHT
+from aiden.app.timing import collect_timings, timed, timed_node
 from aiden.app.utils import (
     build_sensory_input_prompt_template,
     load_brain_config,
@@ -20,22 +30,38 @@ from aiden.models.brain import (
     AuditoryInput,
     AuditoryType,
     BrainConfig,
+    CorticalBatchRequest,
+    CorticalBatchResult,
+    CorticalEvent,
+    CorticalEventType,
     CorticalRequest,
     CorticalResponse,
+    CorticalSessionStart,
     Sensory,
+    SensoryDelta,
     TactileInput,
     TactileType,
 )
 
+# Graphs allowed to execute at once, further requests wait for a free slot
+CORTICAL_MAX_CONCURRENCY = int(os.environ.get("CORTICAL_MAX_CONCURRENCY", "8"))
+
+_cortical_admission = Admission(CORTICAL_MAX_CONCURRENCY)
+
 
 class CorticalState(MessagesState):
     action: str | None
     agent_id: str
     aggregate: Annotated[list, operator.add]
     brain_config: BrainConfig
+    deadline: Deadline | None
     history: list[BaseMessage]
+    memory_manager: MemoryManager
     sensory: Sensory
+    skipped: Annotated[list, operator.add]
     speech: str | None
+    stream_speech: bool
+    thoughts: str | None
 
 
 def _add_cortical_output_to_memory(state: CorticalState):
@@ -46,12 +72,15 @@ def _add_cortical_output_to_memory(state: CorticalState):
         state CorticalState: The cortical state.
     """
     agent_id = state["agent_id"]
-    history = state["history"]
-    messages = state["messages"]
+    history = state.get("history")
+
+    # History is only read when the subconscious ran, skip to not overwrite memory
+    if not history:
+        return
 
     action_output = state["action"]
     speech_output = state["speech"]
-    thoughts_output = messages[-1].content
+    thoughts_output = state["thoughts"]
 
     # Append formatted combined message to messages
     combined_message_content_formatted = f"My thoughts:\n{thoughts_output}"
@@ -64,8 +93,7 @@ def _add_cortical_output_to_memory(state: CorticalState):
 
     # Store the updated history in Redis
     history.append(AIMessage(content=combined_message_content_formatted))
-    memory_manager = MemoryManager(redis_client=redis_client)
-    memory_manager.update_memory(agent_id, history)
+    state["memory_manager"].update_memory(agent_id, history)
 
 
 async def _extract_actions_from_tactile_inputs(
@@ -121,16 +149,14 @@ def _has_speech_in_auditory_inputs(auditory_inputs: list[AuditoryInput]) -> bool
     )
 
 
-async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
+@cache
+def get_cortical_graph() -> CompiledStateGraph:
     """
-    Simulates the cortical region (cerebral cortex) by processing sensory inputs to determine
-    the AI's actions and thoughts.
-
-    Args:
-        request (CorticalRequest): The request containing sensory data and configuration.
+    Builds and compiles the cortical graph. Compilation is done once and the graph reused
+    across requests, as nodes read everything specific to a request from the state.
 
     Returns:
-        Generator: A generator yielding the AI's responses as a stream.
+        CompiledStateGraph: The compiled cortical graph.
     """
     # Prepare graph
     graph_builder = StateGraph(CorticalState)
@@ -140,8 +166,15 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
         raw_sensory_input = build_sensory_input_prompt_template(state["sensory"])
         logger.info(f"Raw sensory: {raw_sensory_input}")
 
+        deadline = state["deadline"]
+        if deadline and not deadline.allows("thalamus"):
+            logger.info("Skipping thalamus to meet latency budget")
+            return {"messages": [raw_sensory_input], "skipped": ["thalamus"]}
+
         response = await process_thalamus(
-            sensory_input=raw_sensory_input, brain_config=state["brain_config"]
+            sensory_input=raw_sensory_input,
+            brain_config=state["brain_config"],
+            deadline=deadline,
         )
         return {"messages": [response]}
 
@@ -153,10 +186,16 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
         actions = await _extract_actions_from_tactile_inputs(sensory.tactile)
         logger.info(f"Action commands available: {actions}")
 
+        deadline = state["deadline"]
+        if deadline and not deadline.allows("prefrontal"):
+            logger.info("Skipping prefrontal to meet latency budget")
+            return {"aggregate": [{"action": None}], "skipped": ["prefrontal"]}
+
         response = await process_prefrontal(
             sensory_input=sensory_input,
             brain_config=state["brain_config"],
             actions=actions,
+            deadline=deadline,
         )
 
         return {"aggregate": [{"action": response}]}
@@ -166,16 +205,31 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
 
         # Get language input in sensory_input
         language_input = None
-        for auditory_input in request.sensory.auditory:
+        for auditory_input in state["sensory"].auditory:
             if auditory_input.type == AuditoryType.LANGUAGE and auditory_input.content:
                 language_input = auditory_input.content
                 logger.info(f"Language input: {language_input}")
                 break  # Assuming we only need the first relevant language input
 
+        deadline = state["deadline"]
+        if deadline and not deadline.allows("broca"):
+            logger.info("Skipping broca to meet latency budget")
+            return {"aggregate": [{"speech": None}], "skipped": ["broca"]}
+
+        # Stream the speech token by token to the graph's custom stream if requested
+        on_token = None
+        if state.get("stream_speech"):
+            writer = get_stream_writer()
+
+            def on_token(token: str) -> None:
+                writer({"speech": token})
+
         response = await process_broca(
             sensory_input=sensory_input,
             brain_config=state["brain_config"],
             language_input=language_input,
+            deadline=deadline,
+            on_token=on_token,
         )
 
         return {"aggregate": [{"speech": response}]}
@@ -189,12 +243,22 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
 
         # Aggregate action and speech outputs if set
         action_output = None
+        speech_output = None
         for aggr in state["aggregate"]:
             if "action" in aggr:
                 action_output = aggr["action"]
-                state["action"] = action_output
             if "speech" in aggr:
-                state["speech"] = aggr["speech"]
+                speech_output = aggr["speech"]
+
+        # Return the action and speech without thoughts if out of time
+        deadline = state["deadline"]
+        if deadline and not deadline.allows("subconscious"):
+            logger.info("Skipping subconscious to meet latency budget")
+            return {
+                "action": action_output,
+                "speech": speech_output,
+                "skipped": ["subconscious"],
+            }
 
         # Prepare the system prompt
         system_input = cortical_config.about + "\n"
@@ -213,7 +277,7 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
             )
 
         # Retrieve short-term memory
-        memory_manager = MemoryManager(redis_client=redis_client)
+        memory_manager = state["memory_manager"]
         history = memory_manager.read_memory(agent_id)
 
         logger.info(f"History from redis: {history}")
@@ -227,95 +291,242 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
         messages.append(HumanMessage(content=final_thoughts_input))
 
         # Thoughts output through subconcious function
-        thoughts_output = await process_subconscious(messages)
-
-        state["messages"] = [thoughts_output]
-        state["history"] = messages
+        thoughts_output = await process_subconscious(messages, deadline=deadline)
 
-        return state
+        return {
+            "action": action_output,
+            "history": messages,
+            "speech": speech_output,
+            "thoughts": thoughts_output,
+        }
 
-    async def has_actions(
+    async def route_regions(
         state: CorticalState,
-    ) -> Literal["run_prefrontal", "run_subconscious"]:
+    ) -> list[Literal["prefrontal", "broca", "subconscious"]]:
         sensory = state["sensory"]
 
+        regions = []
         if await _has_actions_in_tactile_inputs(sensory.tactile):
-            return "run_prefrontal"
-
-        return "run_subconscious"
-
-    async def has_speech(
-        state: CorticalState,
-    ) -> Literal["run_broca", "run_subconscious"]:
-        sensory = state["sensory"]
-
+            regions.append("prefrontal")
         if _has_speech_in_auditory_inputs(sensory.auditory):
-            return "run_broca"
+            regions.append("broca")
 
-        return "run_subconscious"
+        # Only go straight to the subconscious if no other region runs, which would
+        # otherwise run it a second time once they finish
+        return regions or ["subconscious"]
 
     # Add nodes
-    graph_builder.add_node("thalamus", call_thalamus)
-    graph_builder.add_node("prefrontal", call_prefrontal)
-    graph_builder.add_node("broca", call_broca)
-    graph_builder.add_node("subconscious", call_subconscious)
+    graph_builder.add_node("thalamus", timed_node("thalamus", call_thalamus))
+    graph_builder.add_node("prefrontal", timed_node("prefrontal", call_prefrontal))
+    graph_builder.add_node("broca", timed_node("broca", call_broca))
+    graph_builder.add_node(
+        "subconscious", timed_node("subconscious", call_subconscious)
+    )
 
     # Add edges
     graph_builder.add_edge(START, "thalamus")
     graph_builder.add_edge("prefrontal", "subconscious")
     graph_builder.add_edge("broca", "subconscious")
     graph_builder.add_conditional_edges(
-        "thalamus",
-        has_actions,
-        {
-            "run_prefrontal": "prefrontal",
-            "run_subconscious": "subconscious",
-        },
-    )
-    graph_builder.add_conditional_edges(
-        "thalamus",
-        has_speech,
-        {
-            "run_broca": "broca",
-            "run_subconscious": "subconscious",
-        },
+        "thalamus", route_regions, ["prefrontal", "broca", "subconscious"]
     )
     graph_builder.add_edge("subconscious", END)
 
-    # Compile graph
-    graph = graph_builder.compile()
+    return graph_builder.compile()
 
-    # Get agent ID
-    agent_id = getattr(request, "agent_id", "0")
 
-    # Set initial cortical state
-    state = CorticalState(
-        # Check if agent_id is provided in request or default to the catch-all zero ID
-        agent_id=agent_id,
-        brain_config=load_brain_config(request.config),
-        sensory=request.sensory,
-        action=None,
-        speech=None,
-    )
+def _events_from_update(update: dict[str, dict | None]) -> list[CorticalEvent]:
+    """
+    Converts the outputs of graph nodes to events as soon as each node finishes.
 
-    # Execute graph
-    response = await graph.ainvoke(state)
+    Args:
+        update (dict[str, dict | None]): The state updates by node name.
 
-    # Combine action, thoughts, and speech into one message to save in agent's memory
-    _add_cortical_output_to_memory(response)
+    Returns:
+        list[CorticalEvent]: An event for each action, speech or thoughts output.
+    """
+    events = []
+    for node, output in update.items():
+        if not output:
+            continue
+        for aggregate in output.get("aggregate", []):
+            if aggregate.get("action"):
+                events.append(
+                    CorticalEvent(
+                        type=CorticalEventType.ACTION, content=aggregate["action"]
+                    )
+                )
+            if aggregate.get("speech"):
+                events.append(
+                    CorticalEvent(
+                        type=CorticalEventType.SPEECH, content=aggregate["speech"]
+                    )
+                )
+        if node == "subconscious" and output.get("thoughts"):
+            events.append(
+                CorticalEvent(
+                    type=CorticalEventType.THOUGHTS, content=output["thoughts"]
+                )
+            )
+    return events
 
-    # Set cortical outputs
-    action_output = response["action"]
-    speech_output = response["speech"]
-    thoughts_output = response["messages"][-1].content
 
-    # Prepare response
-    response = CorticalResponse(
-        action=action_output,
-        speech=speech_output,
-        thoughts=thoughts_output,
-    )
-    logger.info(f"Cortical response: {response}")
+async def _stream_cortical(
+    request: CorticalRequest,
+    memory_manager: MemoryManager | None = None,
+    stream_speech: bool = False,
+) -> AsyncGenerator[CorticalEvent, None]:
+    """
+    Runs the cortical graph for a single request once admitted, streaming the output of
+    each brain region as it finishes.
+
+    Args:
+        request (CorticalRequest): The request containing sensory data and configuration.
+        memory_manager (MemoryManager | None): Short-term memory of the agent, defaults to
+            reading from and writing to Redis directly.
+        stream_speech (bool): Whether to stream each token of the speech as it is generated.
+
+    Yields:
+        CorticalEvent: Action, speech and thoughts events, then a `done` event with the
+        complete response, with `speech_delta` events before the speech if streamed.
+    """
+    # Start the clock on the request's latency budget before any work is done, so time
+    # spent waiting for admission counts against it
+    deadline = Deadline.from_milliseconds(request.latency_budget_ms)
+
+    # Events are collected as the graph produces them and yielded outside the admission
+    # slot, so a slow consumer never holds the slot while the graph is done
+    events: asyncio.Queue[CorticalEvent | Exception] = asyncio.Queue()
+
+    async def run_graph() -> None:
+        with collect_timings() as timings:
+            # Compile graph, which is only done once per process
+            with timed("graph_compile"):
+                graph = get_cortical_graph()
+
+            # Get agent ID
+            agent_id = getattr(request, "agent_id", "0")
+
+            with timed("config"):
+                brain_config = load_brain_config(request.config)
+
+            # Set initial cortical state
+            state = CorticalState(
+                # Check if agent_id is provided in request or default to the catch-all zero ID
+                agent_id=agent_id,
+                brain_config=brain_config,
+                deadline=deadline,
+                memory_manager=memory_manager
+                or MemoryManager(redis_client=redis_client),
+                sensory=request.sensory,
+                action=None,
+                history=[],
+                skipped=[],
+                speech=None,
+                stream_speech=stream_speech,
+                thoughts=None,
+            )
+
+            # Execute graph once a slot is free, to bound the load on the backends
+            with timed("admission"):
+                await _cortical_admission.acquire()
+            CORTICAL_GRAPHS_IN_FLIGHT.inc()
+            try:
+                response = state
+                async for mode, chunk in graph.astream(
+                    state,
+                    stream_mode=["updates", "values", "custom"]
+                    if stream_speech
+                    else ["updates", "values"],
+                ):
+                    if mode == "values":
+                        response = chunk
+                    elif mode == "custom":
+                        events.put_nowait(
+                            CorticalEvent(
+                                type=CorticalEventType.SPEECH_DELTA,
+                                content=chunk["speech"],
+                            )
+                        )
+                    else:
+                        for event in _events_from_update(chunk):
+                            events.put_nowait(event)
+
+                # Combine action, thoughts, and speech into one message to save in agent's memory
+                _add_cortical_output_to_memory(response)
+            finally:
+                CORTICAL_GRAPHS_IN_FLIGHT.dec()
+                _cortical_admission.release()
+
+        # Prepare response
+        cortical_response = CorticalResponse(
+            action=response["action"],
+            speech=response["speech"],
+            thoughts=response["thoughts"],
+            skipped=response["skipped"],
+            timings=timings.entries if request.include_timings else None,
+        )
+        logger.info(f"Cortical response: {cortical_response}")
+        events.put_nowait(
+            CorticalEvent(type=CorticalEventType.DONE, response=cortical_response)
+        )
+
+    async def run_graph_or_fail() -> None:
+        try:
+            await run_graph()
+        except Exception as e:
+            events.put_nowait(e)
+
+    graph_task = asyncio.create_task(run_graph_or_fail())
+    try:
+        while True:
+            event = await events.get()
+            if isinstance(event, Exception):
+                raise event
+            yield event
+            if event.type == CorticalEventType.DONE:
+                return
+    finally:
+        # Stop the graph if the consumer went away before it finished
+        graph_task.cancel()
+        await asyncio.gather(graph_task, return_exceptions=True)
+
+
+async def _run_cortical(
+    request: CorticalRequest, memory_manager: MemoryManager | None = None
+) -> CorticalResponse:
+    """
+    Runs the cortical graph for a single request once admitted.
+
+    Args:
+        request (CorticalRequest): The request containing sensory data and configuration.
+        memory_manager (MemoryManager | None): Short-term memory of the agent, defaults to
+            reading from and writing to Redis directly.
+
+    Returns:
+        CorticalResponse: The AI's action, speech and thoughts.
+    """
+    async for event in _stream_cortical(request, memory_manager):
+        if event.type == CorticalEventType.DONE:
+            return event.response
+
+
+async def process_cortical(
+    request: CorticalRequest, memory_manager: MemoryManager | None = None
+) -> AsyncGenerator:
+    """
+    Simulates the cortical region (cerebral cortex) by processing sensory inputs to determine
+    the AI's actions and thoughts.
+
+    Args:
+        request (CorticalRequest): The request containing sensory data and configuration.
+        memory_manager (MemoryManager | None): Short-term memory of the agent, defaults to
+            reading from and writing to Redis directly.
+
+    Returns:
+        Generator: A generator yielding the AI's responses as a stream.
+    """
+    response = await _run_cortical(request, memory_manager)
 
     # TODO: Stream all of these separately
     async def stream_response():
@@ -323,3 +534,198 @@ async def process_cortical(request: CorticalRequest) -> AsyncGenerator:
         yield response.model_dump_json()
 
     return stream_response()
+
+
+async def process_cortical_events(
+    request: CorticalRequest, stream_speech: bool = False
+) -> AsyncGenerator[CorticalEvent, None]:
+    """
+    Simulates the cortical region for a request from another region, e.g. speech just
+    transcribed by the auditory region, streaming the output of each brain region as it
+    finishes.
+
+    Args:
+        request (CorticalRequest): The request containing sensory data and configuration.
+        stream_speech (bool): Whether to stream each token of the speech as it is generated,
+            e.g. to synthesise it sentence by sentence.
+
+    Yields:
+        CorticalEvent: Action, speech and thoughts events, then a `done` event with the
+        complete response, with `speech_delta` events before the speech if streamed.
+    """
+    async with aclosing(
+        _stream_cortical(request, stream_speech=stream_speech)
+    ) as events:
+        async for event in events:
+            yield event
+
+
+async def process_cortical_batch(
+    request: CorticalBatchRequest,
+) -> AsyncGenerator[str, None]:
+    """
+    Processes the cortical requests of many agents concurrently, under the same admission
+    limit as single requests.
+
+    The short-term memories of all agents are read from Redis in one round trip before the
+    batch runs, and written back in one pipeline once every agent has finished.
+
+    Args:
+        request (CorticalBatchRequest): The cortical requests, one per agent.
+
+    Yields:
+        str: A JSON line with the agent ID and its response, or error, as each agent finishes.
+    """
+    agent_ids = [cortical_request.agent_id for cortical_request in request.requests]
+    memory_manager = BatchMemoryManager(redis_client=redis_client, agent_ids=agent_ids)
+    await asyncio.to_thread(memory_manager.load)
+
+    async def run(cortical_request: CorticalRequest) -> CorticalBatchResult:
+        try:
+            response = await _run_cortical(cortical_request, memory_manager)
+            return CorticalBatchResult(
+                agent_id=cortical_request.agent_id, response=response
+            )
+        except Exception as e:
+            logger.error(
+                f"Error in cortical batch for agent {cortical_request.agent_id}: {e}"
+            )
+            return CorticalBatchResult(agent_id=cortical_request.agent_id, error=str(e))
+
+    tasks = [
+        asyncio.create_task(run(cortical_request))
+        for cortical_request in request.requests
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            yield result.model_dump_json() + "\n"
+    finally:
+        # Stop the remaining agents if the client disconnected, and wait for them to stop
+        # so no memory is updated after the flush
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(memory_manager.flush)
+
+
+class CorticalSession:
+    """
+    Server side state of an agent's cortical session, kept for the length of its connection.
+
+    The session holds the last sensory snapshot, which deltas sent by the agent are applied
+    to, and caches the agent's short-term memory so it is only read from Redis once.
+    """
+
+    def __init__(self, start: CorticalSessionStart):
+        self.start = start
+        self.sensory = Sensory()
+        self.ticks = 0
+        self.memory_manager = BatchMemoryManager(
+            redis_client=redis_client, agent_ids=[start.agent_id]
+        )
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self.memory_manager.load)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.memory_manager.flush)
+
+    def apply(self, delta: SensoryDelta) -> None:
+        self.sensory = delta.apply(self.sensory)
+
+    async def tick(self) -> AsyncGenerator[CorticalEvent, None]:
+        """
+        Runs the cortical graph on the current sensory snapshot.
+
+        Yields:
+            CorticalEvent: The events of the tick, ending with a `done` or `error` event.
+        """
+        self.ticks += 1
+        tick = self.ticks
+        request = CorticalRequest(
+            agent_id=self.start.agent_id,
+            config=self.start.config,
+            sensory=self.sensory,
+            latency_budget_ms=self.start.latency_budget_ms,
+            include_timings=self.start.include_timings,
+        )
+
+        try:
+            async for event in _stream_cortical(request, self.memory_manager):
+                yield event.model_copy(update={"tick": tick})
+        except Exception as e:
+            logger.error(f"Error in cortical session of agent {request.agent_id}: {e}")
+            yield CorticalEvent(type=CorticalEventType.ERROR, tick=tick, content=str(e))
+
+        # Write the tick's memory through, so other clients of the agent see it
+        await asyncio.to_thread(self.memory_manager.flush)
+
+
+async def process_cortical_session(
+    start: CorticalSessionStart,
+    receive_delta: Callable[[], Awaitable[SensoryDelta]],
+    send_event: Callable[[CorticalEvent], Awaitable[None]],
+) -> None:
+    """
+    Simulates the cortical region for an agent over a persistent connection. The agent
+    sends sensory deltas and receives the events of each tick as they are produced.
+
+    Ticks run one at a time. Deltas arriving while a tick runs are all applied to the
+    snapshot, and a single tick then runs on the latest snapshot.
+
+    Args:
+        start (CorticalSessionStart): The agent and configuration of the session.
+        receive_delta (Callable[[], Awaitable[SensoryDelta]]): Waits for the next delta
+            from the agent, raising a `ValueError` for an invalid one.
+        send_event (Callable[[CorticalEvent], Awaitable[None]]): Sends an event to the agent.
+
+    Raises:
+        Exception: Why the agent went away, or why a tick failed to reach the agent, after
+            which an `error` event is sent if possible and the session ends.
+    """
+    session = CorticalSession(start)
+    await session.open()
+    pending = asyncio.Event()
+
+    async def receive_deltas() -> None:
+        while True:
+            try:
+                delta = await receive_delta()
+            except ValueError as e:
+                await send_event(
+                    CorticalEvent(type=CorticalEventType.ERROR, content=str(e))
+                )
+                continue
+            session.apply(delta)
+            pending.set()
+
+    async def run_ticks() -> None:
+        while True:
+            await pending.wait()
+            pending.clear()
+            async for event in session.tick():
+                await send_event(event)
+
+    receiving = asyncio.create_task(receive_deltas())
+    ticks = asyncio.create_task(run_ticks())
+    try:
+        await asyncio.wait({receiving, ticks}, return_when=asyncio.FIRST_COMPLETED)
+        if receiving.done():
+            # Raises the reason the agent went away
+            await receiving
+
+        # Ticks only stop if they fail, e.g. to send an event or write memory through,
+        # after which any further deltas would go unanswered, so the session ends
+        e = ticks.exception()
+        logger.error(f"Cortical session of agent {start.agent_id} failed: {e}")
+        with suppress(Exception):
+            await send_event(
+                CorticalEvent(type=CorticalEventType.ERROR, content=str(e))
+            )
+        raise e
+    finally:
+        for task in (receiving, ticks):
+            task.cancel()
+        await asyncio.gather(receiving, ticks, return_exceptions=True)
+        await session.close()
@@ -5,9 +5,12 @@ from langchain_core.messages import BaseMessage
 from redis import Redis
 
 from aiden import logger
+from aiden.app.metrics import REDIS_LATENCY
+from aiden.app.timing import timed
 from aiden.models.brain import NeuralyzerRequest, NeuralyzerResponse
 
 CHROMA_COLLECTION_MEMORY = "memory"
+MEMORY_EXPIRY_SECONDS = 86400  # 1 day
 TOGGLE_MEMORY_CONSOLIDATION = False
 
 
@@ -29,9 +32,12 @@ class MemoryManager:
             messages (List[BaseMessage]): List of Message models to save.
         """
         key = self._get_memory_key(agent_id)
-        messages_serialized = dumps(messages)
-        self.redis_client.set(key, messages_serialized)
-        self.redis_client.expire(key, 86400)  # Expires in 1 day
+        with timed("memory_write"):
+            messages_serialized = dumps(messages)
+            with REDIS_LATENCY.time(operation="set"):
+                self.redis_client.set(key, messages_serialized)
+            with REDIS_LATENCY.time(operation="expire"):
+                self.redis_client.expire(key, MEMORY_EXPIRY_SECONDS)
 
     def read_memory(self, agent_id: str) -> list[BaseMessage]:
         """
@@ -44,11 +50,13 @@ class MemoryManager:
             List[BaseMessage]: A list of Message models.
         """
         key = self._get_memory_key(agent_id)
-        history_json = self.redis_client.get(key)
-        if history_json:
-            return loads(history_json)
-        else:
-            return []
+        with timed("memory_read"):
+            with REDIS_LATENCY.time(operation="get"):
+                history_json = self.redis_client.get(key)
+            if history_json:
+                return loads(history_json)
+            else:
+                return []
 
     def wipe_memory(self, agent_id: str) -> None:
         """
@@ -60,7 +68,8 @@ class MemoryManager:
             agent_id (str): Unique identifier for the AI agent.
         """
         key = self._get_memory_key(agent_id)
-        self.redis_client.delete(key)
+        with REDIS_LATENCY.time(operation="delete"):
+            self.redis_client.delete(key)
 
     def consolidate_memory(self, agent_id):
         min_history_to_consolidate = int(
@@ -89,6 +98,79 @@ class MemoryManager:
         raise NotImplementedError("Memory consolidation not fully implemented.")
 
 
+class BatchMemoryManager(MemoryManager):
+    """
+    Memory manager for a batch of agents, which reads all of their short-term memories in
+    a single round trip to Redis and buffers their updates to write them in another.
+    Histories stay cached after a flush, so it can also serve the ticks of a session.
+    """
+
+    def __init__(self, redis_client: Redis, agent_ids: list[str]):
+        super().__init__(redis_client)
+        self.agent_ids = agent_ids
+        self._histories: dict[str, list[BaseMessage]] = {}
+        self._updates: dict[str, list[BaseMessage]] = {}
+
+    def load(self) -> None:
+        """
+        Retrieve the chat history of every agent in the batch from Redis.
+        """
+        keys = [self._get_memory_key(agent_id) for agent_id in self.agent_ids]
+        with timed("memory_read"):
+            with REDIS_LATENCY.time(operation="mget"):
+                histories_json = self.redis_client.mget(keys)
+            self._histories = {
+                agent_id: loads(history_json) if history_json else []
+                for agent_id, history_json in zip(self.agent_ids, histories_json)
+            }
+
+    def read_memory(self, agent_id: str) -> list[BaseMessage]:
+        """
+        Retrieve the agent's chat history as loaded for the batch, including any updates.
+
+        Args:
+            agent_id (str): Unique identifier for the AI agent.
+
+        Returns:
+            List[BaseMessage]: A list of Message models.
+        """
+        if agent_id in self._updates:
+            return list(self._updates[agent_id])
+        if agent_id in self._histories:
+            return list(self._histories[agent_id])
+        return super().read_memory(agent_id)
+
+    def update_memory(self, agent_id: str, messages: list[BaseMessage]):
+        """
+        Buffer the agent's chat history until the batch is flushed.
+
+        Args:
+            agent_id (str): Unique identifier for the AI agent.
+            messages (List[BaseMessage]): List of Message models to save.
+        """
+        self._updates[agent_id] = list(messages)
+
+    def flush(self) -> None:
+        """
+        Save the buffered chat histories of the batch to Redis in a single pipeline.
+        """
+        if not self._updates:
+            return
+
+        with timed("memory_write"):
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for agent_id, messages in self._updates.items():
+                pipeline.set(
+                    self._get_memory_key(agent_id),
+                    dumps(messages),
+                    ex=MEMORY_EXPIRY_SECONDS,
+                )
+            with REDIS_LATENCY.time(operation="pipeline"):
+                pipeline.execute()
+        self._histories.update(self._updates)
+        self._updates = {}
+
+
 async def process_wipe_memory(request: NeuralyzerRequest, redis_client: Redis) -> str:
     """
     Process request to delete an agent's short-term memory.
@@ -1,37 +1,152 @@
+import asyncio
+import base64
 import json
 import os
+from contextlib import aclosing
 from typing import AsyncGenerator
 
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage
+from PIL import Image
 
 from aiden import logger
+from aiden.app.admission import Admission
 from aiden.app.brain.cognition import VISION_API_URL_BASE
+from aiden.app.brain.cognition.resilience import Deadline
+from aiden.app.frame_gate import VISION_FRAME_GATE_ENABLE, get_frame_gate
+from aiden.app.image import frame_thumbnail, perceptual_hash, preprocess_image
+from aiden.app.timing import timed
 from aiden.app.utils import load_brain_config
-from aiden.models.brain import OccipitalRequest
+from aiden.app.vision_cache import get_description_cache
+from aiden.models.brain import (
+    OccipitalBatchImage,
+    OccipitalBatchRequest,
+    OccipitalBatchResult,
+    OccipitalRequest,
+)
 
+VISION_LATENCY_BUDGET = float(os.environ.get("VISION_LATENCY_BUDGET", "30.0"))
+VISION_MAX_TOKENS = int(os.environ.get("VISION_MAX_TOKENS", "256"))
+# Descriptions generated at once, further images wait for a free slot
+VISION_MAX_CONCURRENCY = int(os.environ.get("VISION_MAX_CONCURRENCY", "4"))
+VISION_PREPROCESS_ENABLE = (
+    os.environ.get("VISION_PREPROCESS_ENABLE", "true").lower() == "true"
+)
 
-async def process_occipital(request: OccipitalRequest) -> AsyncGenerator[str, None]:
+
+_vision_admission = Admission(VISION_MAX_CONCURRENCY)
+
+
+def _image_url(image: str) -> str:
+    # Ollama takes base64 images, either bare or as a data URL
+    return image if image.startswith("data:") else f"data:image/jpeg;base64,{image}"
+
+
+def _prepare(image: bytes, gated: bool) -> tuple[bytes, int | None, Image.Image | None]:
+    if VISION_PREPROCESS_ENABLE:
+        image = preprocess_image(image)
+    image_hash = perceptual_hash(image) if get_description_cache() else None
+    thumbnail = frame_thumbnail(image) if gated else None
+    return image, image_hash, thumbnail
+
+
+async def _prepare_image(
+    image: bytes, gated: bool = False
+) -> tuple[bytes, int | None, Image.Image | None]:
     """
-    Simulates the occipital lobe by processing visual inputs to generate a textual description.
+    Downsizes an image for the vision model, hashes it for the description cache and shrinks
+    it for the frame gate, in a worker thread off the event loop.
 
     Args:
-        request (OccipitalRequest): The request containing the image and configuration.
+        image (bytes): The image file.
+        gated (bool): Whether the frame gate compares the image to the agent's last frame.
+
+    Returns:
+        tuple[bytes, int | None, Image.Image | None]: The preprocessed image, its perceptual
+        hash and its thumbnail, or the original alone if it cannot be decoded here, in which
+        case the vision model is left to handle it.
+    """
+    try:
+        with timed("vision_preprocess"):
+            return await asyncio.to_thread(_prepare, image, gated)
+    except ValueError as exc:
+        logger.warning(f"Sending the image without preprocessing it: {exc}")
+        return image, None, None
+
+
+async def _describe_image(
+    image: str,
+    config: str,
+    latency_budget_ms: int | None = None,
+    image_hash: int | None = None,
+    agent_id: str | None = None,
+    thumbnail: Image.Image | None = None,
+    frame_gate_threshold: float | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Describes an image with the vision model, streaming the description without blocking
+    the event loop.
+
+    The description is capped to `VISION_MAX_TOKENS` and cut off at the deadline. Closing
+    the generator, e.g. when the client disconnects, cancels generation on the backend.
+    Descriptions of near-identical images, or of an agent's frame which barely changed, are
+    returned as a single chunk.
+
+    Args:
+        image (str): The base64 encoded image, bare or as a data URL.
+        config (str): Path to the brain configuration file.
+        latency_budget_ms (int | None): Time allowed for the description, defaults to
+            `VISION_LATENCY_BUDGET` seconds.
+        image_hash (int | None): Perceptual hash of the image, to look up and cache its
+            description.
+        agent_id (str | None): The agent which sent the image, to gate it against the
+            agent's last described frame.
+        thumbnail (Image.Image | None): Thumbnail of the image for the frame gate.
+        frame_gate_threshold (float | None): Difference from the agent's last described
+            frame below which its description is reused.
 
     Yields:
-        str: Each chunk of the rewritten sensory prompt as a string. These chunks are parts of
-             the full description generated by the model, provided sequentially as they are generated.
+        str: Each chunk of the description as it is generated.
     """
-    brain_config = load_brain_config(request.config)
+    deadline = Deadline.from_milliseconds(latency_budget_ms) or Deadline(
+        VISION_LATENCY_BUDGET
+    )
+
+    brain_config = load_brain_config(config)
     instruction = "\n".join(brain_config.regions.occipital.instruction)
+    model = os.environ.get("VISION_MODEL", "bakllava")
+
+    frame_gate = get_frame_gate() if agent_id and thumbnail is not None else None
+    if frame_gate is not None:
+        description = frame_gate.check(agent_id, thumbnail, frame_gate_threshold)
+        if description is not None:
+            yield description
+            return
 
-    messages = [HumanMessage(content=instruction, image=request.image)]
+    description_cache = get_description_cache() if image_hash is not None else None
+    if description_cache is not None:
+        description = await description_cache.get(f"{model}\n{instruction}", image_hash)
+        if description is not None:
+            if frame_gate is not None:
+                frame_gate.update(agent_id, thumbnail, description)
+            yield description
+            return
+
+    messages = [
+        HumanMessage(
+            content=[
+                {"type": "text", "text": instruction},
+                {"type": "image_url", "image_url": _image_url(image)},
+            ]
+        )
+    ]
 
     llm = ChatOllama(
         base_url=VISION_API_URL_BASE,
-        model=os.environ.get("VISION_MODEL", "bakllava"),
+        model=model,
         timeout=30.0,
         frequency_penalty=0.6,
+        num_predict=min(VISION_MAX_TOKENS, deadline.num_predict()),
         penalize_newline=False,
         presence_penalty=0.5,
         repeat_last_n=50,
@@ -43,13 +158,241 @@ async def process_occipital(request: OccipitalRequest) -> AsyncGenerator[str, No
 
     logger.info(f"Occipital chat message instruction: {instruction}")
 
+    # Describe once a slot is free, to bound the load on the vision backend
+    with timed("vision_admission"):
+        await _vision_admission.acquire()
+    if deadline.remaining() <= 0:
+        # Not worth a backend call, as not a single token could arrive in time
+        _vision_admission.release()
+        raise TimeoutError("The deadline passed while waiting for the vision backend")
+    stream = llm.astream(messages)
+    chunks = []
+    try:
+        with timed("vision"):
+            while True:
+                # Each chunk only waits as long as the deadline allows
+                try:
+                    chunk = await asyncio.wait_for(
+                        stream.__anext__(), deadline.remaining()
+                    )
+                except StopAsyncIteration:
+                    break
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+                if hasattr(chunk, "done") and chunk.done:
+                    break
+    except TimeoutError:
+        logger.info("Cut off the vision description at its deadline")
+        return
+    finally:
+        # Closes the connection to the backend, which stops generating
+        await stream.aclose()
+        _vision_admission.release()
+
+    # Only complete descriptions are reused, not those cut off
+    if chunks and frame_gate is not None:
+        frame_gate.update(agent_id, thumbnail, "".join(chunks))
+    if chunks and description_cache is not None:
+        await description_cache.set(
+            f"{model}\n{instruction}", image_hash, "".join(chunks)
+        )
+
+
+async def _process_image(
+    image: bytes,
+    config: str,
+    latency_budget_ms: int | None,
+    agent_id: str | None,
+    frame_gate_threshold: float | None,
+    image_base64: str | None = None,
+) -> AsyncGenerator[str, None]:
+    gated = VISION_FRAME_GATE_ENABLE and agent_id is not None
+    prepared, image_hash, thumbnail = await _prepare_image(image, gated)
+    # The vision API only accepts base64 images, so encode the image once here
+    if prepared is not image or image_base64 is None:
+        image_base64 = base64.b64encode(prepared).decode("ascii")
+
+    # Closes the description as soon as this generator is closed, not when collected
+    async with aclosing(
+        _describe_image(
+            image_base64,
+            config,
+            latency_budget_ms,
+            image_hash,
+            agent_id,
+            thumbnail,
+            frame_gate_threshold,
+        )
+    ) as description:
+        async for chunk in description:
+            yield chunk
+
+
+async def _report_errors(
+    description: AsyncGenerator[str, None],
+) -> AsyncGenerator[str, None]:
+    # Closes the description as soon as this generator is closed, not when collected
+    async with aclosing(description):
+        try:
+            async for chunk in description:
+                yield chunk
+        except Exception as exc:
+            error_message = json.dumps({"error": str(exc)})
+            logger.error(f"Failed recognizing vision with error: {exc}")
+            yield error_message
+
+
+async def describe_frame(
+    image: bytes,
+    config: str,
+    latency_budget_ms: int | None = None,
+    agent_id: str | None = None,
+    frame_gate_threshold: float | None = None,
+) -> str:
+    """
+    Describes an agent's frame for another region, e.g. to perceive it along with the
+    agent's audio, waiting for the whole description.
+
+    Args:
+        image (bytes): The JPEG or PNG image file.
+        config (str): Path to the brain configuration file.
+        latency_budget_ms (int | None): Time allowed for the description.
+        agent_id (str | None): The agent which sent the image, to gate it against the
+            agent's last described frame.
+        frame_gate_threshold (float | None): Difference from the agent's last described
+            frame below which its description is reused.
+
+    Returns:
+        str: The description, empty if it was cut off before any was generated.
+
+    Raises:
+        TimeoutError: If the deadline passed while waiting for the vision backend.
+    """
+    description = _process_image(
+        image, config, latency_budget_ms, agent_id, frame_gate_threshold
+    )
+    async with aclosing(description):
+        return "".join([chunk async for chunk in description])
+
+
+async def process_occipital(request: OccipitalRequest) -> AsyncGenerator[str, None]:
+    """
+    Simulates the occipital lobe by processing visual inputs to generate a textual description.
+
+    Args:
+        request (OccipitalRequest): The request containing the image and configuration.
+
+    Yields:
+        str: Each chunk of the rewritten sensory prompt as a string. These chunks are parts of
+             the full description generated by the model, provided sequentially as they are generated.
+    """
+    try:
+        image = base64.b64decode(request.image.split(",")[-1], validate=True)
+    except ValueError:
+        logger.warning("Sending the image without preprocessing it: invalid base64")
+        description = _describe_image(
+            request.image, request.config, request.latency_budget_ms
+        )
+    else:
+        description = _process_image(
+            image,
+            request.config,
+            request.latency_budget_ms,
+            request.agent_id,
+            request.frame_gate_threshold,
+            request.image,
+        )
+
+    async with aclosing(_report_errors(description)) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+
+async def process_occipital_upload(
+    image: bytes,
+    config: str,
+    latency_budget_ms: int | None = None,
+    agent_id: str | None = None,
+    frame_gate_threshold: float | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Simulates the occipital lobe for a raw image upload.
+
+    Args:
+        image (bytes): The JPEG or PNG image file.
+        config (str): Path to the brain configuration file.
+        latency_budget_ms (int | None): Time allowed for the description.
+        agent_id (str | None): The agent which sent the image, to gate it against the
+            agent's last described frame.
+        frame_gate_threshold (float | None): Difference from the agent's last described
+            frame below which its description is reused.
+
+    Yields:
+        str: Each chunk of the description as it is generated.
+    """
+    description = _process_image(
+        image, config, latency_budget_ms, agent_id, frame_gate_threshold
+    )
+    async with aclosing(_report_errors(description)) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+
+async def process_occipital_batch(
+    request: OccipitalBatchRequest,
+) -> AsyncGenerator[str, None]:
+    """
+    Describes many images concurrently, e.g. the cameras of one agent or the frames of every
+    agent in a simulation tick.
+
+    Every image is preprocessed in the worker thread pool at once, while descriptions are
+    generated under the same concurrency limit as single images, so the vision backend is
+    kept busy without being overloaded.
+
+    Args:
+        request (OccipitalBatchRequest): The images, each tagged with its agent and camera.
+
+    Yields:
+        str: A JSON line with the agent, camera and description, or error, of each image as
+        it is described.
+    """
+
+    async def describe(image: OccipitalBatchImage) -> OccipitalBatchResult:
+        result = OccipitalBatchResult(agent_id=image.agent_id, camera=image.camera)
+        try:
+            original = base64.b64decode(image.image.split(",")[-1], validate=True)
+            # Each camera is gated against its own last frame
+            frame_id = (
+                image.agent_id
+                if image.camera is None
+                else f"{image.agent_id}/{image.camera}"
+            )
+            description = _process_image(
+                original,
+                request.config,
+                request.latency_budget_ms,
+                frame_id,
+                image.frame_gate_threshold,
+                image.image,
+            )
+            async with aclosing(description):
+                result.description = "".join([chunk async for chunk in description])
+        except Exception as e:
+            logger.error(
+                f"Error in occipital batch for agent {image.agent_id} camera "
+                f"{image.camera}: {e}"
+            )
+            result.error = str(e)
+        return result
+
+    tasks = [asyncio.create_task(describe(image)) for image in request.images]
     try:
-        for chunk in llm.stream(messages):
-            if chunk.content:
-                yield chunk.content
-            if hasattr(chunk, "done") and chunk.done:
-                break
-    except Exception as exc:
-        error_message = json.dumps({"error": str(exc)})
-        logger.error(f"Failed recognizing vision with error: {exc}")
-        yield error_message
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            yield result.model_dump_json() + "\n"
+    finally:
+        # Stop describing the remaining images if the client disconnected
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
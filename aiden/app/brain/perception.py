@@ -0,0 +1,126 @@
+import asyncio
+import base64
+import time
+from contextlib import aclosing
+from typing import AsyncGenerator
+
+from aiden import logger
+from aiden.app.brain.auditory import classify_clip
+from aiden.app.brain.cortical import process_cortical_events
+from aiden.app.brain.occipital import describe_frame
+from aiden.models.brain import (
+    AuditoryInput,
+    PerceptionEvent,
+    PerceptionEventType,
+    PerceptionRequest,
+    VisionInput,
+)
+
+
+async def _see(request: PerceptionRequest, image: bytes | None) -> PerceptionEvent:
+    event = PerceptionEvent(type=PerceptionEventType.VISION)
+    try:
+        if image is None:
+            image = base64.b64decode(request.image.split(",")[-1], validate=True)
+        event.content = await describe_frame(
+            image,
+            request.cortical.config,
+            request.cortical.latency_budget_ms,
+            request.cortical.agent_id,
+            request.frame_gate_threshold,
+        )
+    except Exception as e:
+        logger.error(f"Failed perceiving the frame with error: {e}")
+        event.error = str(e)
+    return event
+
+
+async def _hear(request: PerceptionRequest, audio: bytes | None) -> PerceptionEvent:
+    event = PerceptionEvent(type=PerceptionEventType.AUDITORY)
+    try:
+        if audio is None:
+            audio = base64.b64decode(request.audio)
+        response = await classify_clip(audio, request.sample_rate, request.channels)
+        event.results = response.results
+        event.content = ", ".join(result.class_name for result in response.results)
+    except Exception as e:
+        logger.error(f"Failed perceiving the audio with error: {e}")
+        event.error = str(e)
+    return event
+
+
+async def process_perception(
+    request: PerceptionRequest, image: bytes | None = None, audio: bytes | None = None
+) -> AsyncGenerator[str, None]:
+    """
+    Perceives an agent's frame and audio concurrently, then runs a cortical tick with them
+    added to its other sensory inputs, saving the client a round trip to the occipital and
+    auditory regions each before the cortical one.
+
+    A frame or audio which cannot be perceived is reported and left out of the tick. The
+    request's latency budget covers perceiving as well as the tick.
+
+    Args:
+        request (PerceptionRequest): The frame, audio and other sensory inputs of the agent.
+        image (bytes | None): The raw image file, if uploaded instead of in the request.
+        audio (bytes | None): The raw audio file, if uploaded instead of in the request.
+
+    Yields:
+        str: A JSON line with the frame's description and the audio's classes as each is
+        perceived, then each event of the cortical tick, or an error.
+    """
+    started = time.monotonic()
+    tasks = []
+    if image is not None or request.image is not None:
+        tasks.append(asyncio.create_task(_see(request, image)))
+    if audio is not None or request.audio is not None:
+        tasks.append(asyncio.create_task(_hear(request, audio)))
+
+    try:
+        vision, auditory = [], []
+        for task in asyncio.as_completed(tasks):
+            event = await task
+            yield event.model_dump_json() + "\n"
+            if not event.content:
+                continue
+            if event.type == PerceptionEventType.VISION:
+                vision.append(VisionInput(content=event.content))
+            else:
+                auditory.append(AuditoryInput(content=event.content))
+
+        sensory = request.cortical.sensory.model_copy(
+            update={
+                "vision": request.cortical.sensory.vision + vision,
+                "auditory": request.cortical.sensory.auditory + auditory,
+            }
+        )
+        update = {"sensory": sensory}
+        if request.cortical.latency_budget_ms is not None:
+            # The tick only has what is left of the budget after perceiving
+            elapsed_ms = (time.monotonic() - started) * 1000
+            update["latency_budget_ms"] = max(
+                1, round(request.cortical.latency_budget_ms - elapsed_ms)
+            )
+        cortical_request = request.cortical.model_copy(update=update)
+
+        async with aclosing(process_cortical_events(cortical_request)) as events:
+            async for cortical_event in events:
+                yield (
+                    PerceptionEvent(
+                        type=PerceptionEventType.CORTICAL, cortical=cortical_event
+                    ).model_dump_json()
+                    + "\n"
+                )
+    except Exception as e:
+        logger.error(f"Failed perception with error: {e}")
+        yield (
+            PerceptionEvent(
+                type=PerceptionEventType.ERROR, error=str(e)
+            ).model_dump_json()
+            + "\n"
+        )
+    finally:
+        # Stop perceiving if the client disconnected
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
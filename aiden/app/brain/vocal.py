@@ -0,0 +1,253 @@
+import asyncio
+import base64
+import os
+import re
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncGenerator
+
+from fastapi import HTTPException
+
+from aiden import logger
+from aiden.app.admission import Admission
+from aiden.app.brain.cognition import VOCAL_API_URL_BASE
+from aiden.app.clients.http_client import get_http_session, with_retries
+from aiden.app.speech_cache import get_speech_cache
+from aiden.app.timing import timed
+from aiden.models.brain import (
+    CorticalEvent,
+    CorticalEventType,
+    VocalEvent,
+    VocalEventType,
+    VocalRequest,
+)
+
+# Sentences synthesised at once, further sentences wait for a free slot
+VOCAL_MAX_CONCURRENCY = int(os.environ.get("VOCAL_MAX_CONCURRENCY", "2"))
+VOCAL_MODEL = os.environ.get("VOCAL_MODEL", "tts_models/en/ljspeech/tacotron2-DDC")
+
+# Sentences end at punctuation, and any closing quotes or brackets, followed by a space,
+# or at a line break
+SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n+")
+# Words whose trailing full stop does not end a sentence
+ABBREVIATIONS = {"dr", "e.g", "etc", "i.e", "jr", "mr", "mrs", "ms", "sr", "st", "vs"}
+
+_vocal_admission = Admission(VOCAL_MAX_CONCURRENCY)
+
+
+class SentenceSplitter:
+    """
+    Splits text streamed token by token into sentences as soon as each one ends, so each
+    sentence can be synthesised while the rest of the text is generated.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """
+        Adds the next tokens of the text.
+
+        Args:
+            text (str): The tokens.
+
+        Returns:
+            list[str]: The sentences the tokens completed.
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            words = self._buffer[start : match.start()].split()
+            if (
+                words
+                and self._buffer[match.start()] == "."
+                and words[-1].lower() in ABBREVIATIONS
+            ):
+                continue
+            sentence = self._buffer[start : match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> list[str]:
+        """
+        Ends the text.
+
+        Returns:
+            list[str]: The last sentence, if the text did not end with a complete one.
+        """
+        sentence = self._buffer.strip()
+        self._buffer = ""
+        return [sentence] if sentence else []
+
+
+async def _synthesise(text: str, speaker_id: str | None = None) -> bytes:
+    """
+    Synthesises speech with the vocal service, or reuses the audio of the same text.
+
+    Args:
+        text (str): The text to speak.
+        speaker_id (str | None): The speaker, for voice models with several.
+
+    Returns:
+        bytes: The WAV file of the speech.
+
+    Raises:
+        HTTPException: If the service fails to synthesise the speech.
+    """
+    voice = VOCAL_MODEL if speaker_id is None else f"{VOCAL_MODEL}/{speaker_id}"
+    speech_cache = get_speech_cache()
+    if speech_cache is not None:
+        audio = speech_cache.get(text, voice)
+        if audio is not None:
+            return audio
+
+    params = {"text": text}
+    if speaker_id is not None:
+        params["speaker_id"] = speaker_id
+
+    async def synthesise() -> bytes:
+        async with get_http_session().get(
+            f"{VOCAL_API_URL_BASE}/api/tts", params=params
+        ) as response:
+            if response.status != 200:
+                raise HTTPException(
+                    status_code=response.status, detail=await response.text()
+                )
+            return await response.read()
+
+    # Synthesise once a slot is free, to bound the load on the vocal service
+    with timed("vocal_admission"):
+        await _vocal_admission.acquire()
+    try:
+        with timed("vocal"):
+            audio = await with_retries(synthesise)
+    finally:
+        _vocal_admission.release()
+
+    if speech_cache is not None:
+        speech_cache.set(text, voice, audio)
+    return audio
+
+
+async def _text_events(text: str) -> AsyncGenerator[CorticalEvent, None]:
+    # Speaks given text as if it were streamed by broca's area all at once
+    yield CorticalEvent(type=CorticalEventType.SPEECH_DELTA, content=text)
+
+
+async def process_vocal(request: VocalRequest) -> AsyncGenerator[str, None]:
+    """
+    Simulates the vocal tract by synthesising speech sentence by sentence, so the first
+    sentence can be played while the rest is generated and synthesised.
+
+    Given a cortical request, the speech is taken token by token from broca's area as the
+    cortical tick runs, and each sentence is synthesised as soon as it is complete.
+
+    Args:
+        request (VocalRequest): The text, or cortical request, to speak.
+
+    Yields:
+        str: A JSON line with the audio of each sentence in order, and each event of the
+        cortical tick, or an error.
+    """
+    if request.cortical is not None:
+        # Only imported when needed, as the cortical region loads the graph libraries
+        from aiden.app.brain.cortical import process_cortical_events
+
+        events = process_cortical_events(request.cortical, stream_speech=True)
+    else:
+        events = _text_events(request.text)
+
+    splitter = SentenceSplitter()
+    sentences: deque[tuple[str, asyncio.Task]] = deque()
+    index = 0
+
+    def speak(texts: list[str]) -> None:
+        for text in texts:
+            task = asyncio.create_task(_synthesise(text, request.speaker_id))
+            sentences.append((text, task))
+
+    # The events are consumed by a single task, as the cortical region sets and resets
+    # context variables across its steps, which must all run in the same context. The
+    # queue ends with None, or the error the events failed with.
+    queue: asyncio.Queue[CorticalEvent | Exception | None] = asyncio.Queue()
+
+    async def consume_events() -> None:
+        try:
+            async with aclosing(events):
+                async for event in events:
+                    queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        else:
+            queue.put_nowait(None)
+
+    consumer = asyncio.create_task(consume_events())
+    next_event = asyncio.create_task(queue.get())
+    try:
+        while next_event is not None or sentences:
+            # Wait for the next event, or the audio of the next sentence to send
+            waiting = {task for _, task in list(sentences)[:1]}
+            if next_event is not None:
+                waiting.add(next_event)
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            # Send the audio of each sentence in order, as soon as it is synthesised
+            while sentences and sentences[0][1].done():
+                text, task = sentences.popleft()
+                try:
+                    audio = base64.b64encode(task.result()).decode("ascii")
+                    event = VocalEvent(
+                        type=VocalEventType.AUDIO,
+                        index=index,
+                        content=text,
+                        audio=audio,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed synthesising speech with error: {e}")
+                    event = VocalEvent(
+                        type=VocalEventType.ERROR, index=index, content=str(e)
+                    )
+                index += 1
+                yield event.model_dump_json() + "\n"
+
+            if next_event is None or not next_event.done():
+                continue
+            cortical_event = next_event.result()
+            if cortical_event is None:
+                next_event = None
+                speak(splitter.flush())
+                continue
+            if isinstance(cortical_event, Exception):
+                raise cortical_event
+            next_event = asyncio.create_task(queue.get())
+
+            if cortical_event.type == CorticalEventType.SPEECH_DELTA:
+                speak(splitter.feed(cortical_event.content))
+                continue
+            if cortical_event.type == CorticalEventType.SPEECH:
+                # The speech is complete, while the rest of the tick may still run
+                speak(splitter.flush())
+            yield (
+                VocalEvent(
+                    type=VocalEventType.CORTICAL, cortical=cortical_event
+                ).model_dump_json()
+                + "\n"
+            )
+    except Exception as e:
+        logger.error(f"Failed vocal response with error: {e}")
+        yield (
+            VocalEvent(type=VocalEventType.ERROR, content=str(e)).model_dump_json()
+            + "\n"
+        )
+    finally:
+        # Stop generating and synthesising if the client disconnected
+        tasks = [consumer, *(task for _, task in sentences)]
+        if next_event is not None:
+            tasks.append(next_event)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
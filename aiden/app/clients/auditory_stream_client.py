@@ -0,0 +1,68 @@
+from typing import AsyncIterator
+
+import aiohttp
+
+from aiden.models.brain import AuditoryEvent, AuditoryStreamStart
+
+
+class AuditoryStreamClient:
+    """
+    Client for an agent's continuous stream of audio to the brain API.
+
+    Audio is sent as raw 16-bit little-endian PCM in chunks of any length, e.g. as it is
+    captured, and events arrive whenever the top class of the stream changes.
+
+    Example:
+        async with AuditoryStreamClient(url, AuditoryStreamStart(agent_id="0")) as stream:
+            await stream.send(pcm)
+            async for event in stream.events():
+                ...
+    """
+
+    def __init__(self, url: str, start: AuditoryStreamStart):
+        """
+        Args:
+            url (str): URL of the stream endpoint, e.g. `ws://localhost:8000/auditory/stream`.
+            start (AuditoryStreamStart): The agent and audio format of the stream.
+        """
+        self.url = url
+        self.start = start
+        self._session: aiohttp.ClientSession | None = None
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+
+    async def __aenter__(self) -> "AuditoryStreamClient":
+        self._session = aiohttp.ClientSession()
+        try:
+            self._websocket = await self._session.ws_connect(self.url)
+            await self._websocket.send_str(self.start.model_dump_json())
+        except Exception:
+            await self._session.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._websocket is not None:
+            await self._websocket.close()
+        if self._session is not None:
+            await self._session.close()
+
+    async def send(self, pcm: bytes) -> None:
+        """
+        Sends the next chunk of the agent's audio.
+
+        Args:
+            pcm (bytes): Raw 16-bit little-endian PCM in the format of the stream.
+        """
+        await self._websocket.send_bytes(pcm)
+
+    async def events(self) -> AsyncIterator[AuditoryEvent]:
+        """
+        Receives events from the brain API until the connection closes.
+
+        Yields:
+            AuditoryEvent: Each change of the top class, or error.
+        """
+        async for message in self._websocket:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            yield AuditoryEvent.model_validate_json(message.data)
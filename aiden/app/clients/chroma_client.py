@@ -1,8 +1,5 @@
 import os
 
-import chromadb
-from chromadb import Settings
-
 
 def get_chroma_client(agent_id: str = "0"):
     """
@@ -14,6 +11,10 @@ def get_chroma_client(agent_id: str = "0"):
     Returns:
         chromadb.HttpClient: A Chroma client instance for the specified agent.
     """
+    # Imported here as chromadb is slow to import and only needed by long term memory
+    import chromadb
+    from chromadb import Settings
+
     host = os.environ.get("CHROMA_HOST", "localhost")
     port = int(os.environ.get("CHROMA_PORT", "8432"))
     tenant = f"agent_{agent_id}"
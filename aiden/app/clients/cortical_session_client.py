@@ -0,0 +1,91 @@
+from typing import AsyncIterator
+
+import aiohttp
+
+from aiden.models.brain import (
+    CorticalEvent,
+    CorticalEventType,
+    CorticalSessionStart,
+    Sensory,
+    SensoryDelta,
+)
+
+
+class CorticalSessionClient:
+    """
+    Client for an agent's persistent cortical session with the brain API.
+
+    Only the modalities which changed since the previous tick are sent to the brain API.
+
+    Example:
+        async with CorticalSessionClient(url, CorticalSessionStart(agent_id="0")) as session:
+            async for event in session.tick(sensory):
+                ...
+    """
+
+    def __init__(self, url: str, start: CorticalSessionStart):
+        """
+        Args:
+            url (str): URL of the session endpoint, e.g. `ws://localhost:8000/cortical/session`.
+            start (CorticalSessionStart): The agent and configuration of the session.
+        """
+        self.url = url
+        self.start = start
+        self._session: aiohttp.ClientSession | None = None
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+        self._sensory: Sensory | None = None
+
+    async def __aenter__(self) -> "CorticalSessionClient":
+        self._session = aiohttp.ClientSession()
+        try:
+            self._websocket = await self._session.ws_connect(self.url)
+            await self._websocket.send_str(self.start.model_dump_json())
+        except Exception:
+            await self._session.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._websocket is not None:
+            await self._websocket.close()
+        if self._session is not None:
+            await self._session.close()
+
+    async def send(self, sensory: Sensory) -> None:
+        """
+        Sends the changes to the agent's senses, which triggers a tick.
+
+        Args:
+            sensory (Sensory): The agent's full current sensory snapshot.
+        """
+        delta = SensoryDelta.between(self._sensory, sensory)
+        await self._websocket.send_str(delta.model_dump_json(exclude_none=True))
+        self._sensory = sensory
+
+    async def events(self) -> AsyncIterator[CorticalEvent]:
+        """
+        Receives events from the brain API until the connection closes.
+
+        Yields:
+            CorticalEvent: Each action, speech, thoughts, done or error event.
+        """
+        async for message in self._websocket:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            yield CorticalEvent.model_validate_json(message.data)
+
+    async def tick(self, sensory: Sensory) -> AsyncIterator[CorticalEvent]:
+        """
+        Sends the agent's senses and receives the events of the resulting tick.
+
+        Args:
+            sensory (Sensory): The agent's full current sensory snapshot.
+
+        Yields:
+            CorticalEvent: The events of the tick, ending with a `done` or `error` event.
+        """
+        await self.send(sensory)
+        async for event in self.events():
+            yield event
+            if event.type in (CorticalEventType.DONE, CorticalEventType.ERROR):
+                break
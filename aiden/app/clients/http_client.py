@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+
+from aiden import logger
+
+T = TypeVar("T")
+
+HTTP_CLIENT_CONNECT_TIMEOUT = float(
+    os.environ.get("HTTP_CLIENT_CONNECT_TIMEOUT", "5.0")
+)
+HTTP_CLIENT_KEEPALIVE_TIMEOUT = float(
+    os.environ.get("HTTP_CLIENT_KEEPALIVE_TIMEOUT", "30.0")
+)
+HTTP_CLIENT_POOL_SIZE = int(os.environ.get("HTTP_CLIENT_POOL_SIZE", "100"))
+HTTP_CLIENT_POOL_SIZE_PER_HOST = int(
+    os.environ.get("HTTP_CLIENT_POOL_SIZE_PER_HOST", "20")
+)
+HTTP_CLIENT_RETRIES = int(os.environ.get("HTTP_CLIENT_RETRIES", "2"))
+HTTP_CLIENT_RETRY_BACKOFF = float(os.environ.get("HTTP_CLIENT_RETRY_BACKOFF", "0.2"))
+HTTP_CLIENT_TIMEOUT = float(os.environ.get("HTTP_CLIENT_TIMEOUT", "60.0"))
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def open_http_session() -> aiohttp.ClientSession:
+    """
+    Opens the HTTP session shared by clients of the brain's backend services, such as the
+    auditory ambient service, replacing any session left from another event loop.
+
+    Connections are pooled and kept alive between requests, so requests skip the TCP
+    setup and do not exhaust ephemeral ports under load.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    global _session, _session_loop
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CLIENT_POOL_SIZE,
+        limit_per_host=HTTP_CLIENT_POOL_SIZE_PER_HOST,
+        keepalive_timeout=HTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    )
+    _session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=HTTP_CLIENT_TIMEOUT, connect=HTTP_CLIENT_CONNECT_TIMEOUT
+        ),
+    )
+    _session_loop = asyncio.get_running_loop()
+    return _session
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Gets the shared HTTP session, opened in the brain API's lifespan, or opens it when used
+    elsewhere, e.g. from scripts.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    if (
+        _session is None
+        or _session.closed
+        or _session_loop is not asyncio.get_running_loop()
+    ):
+        return open_http_session()
+    return _session
+
+
+async def close_http_session() -> None:
+    """
+    Closes the shared HTTP session and its pooled connections.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def with_retries(
+    send: Callable[[], Awaitable[T]], retries: int = HTTP_CLIENT_RETRIES
+) -> T:
+    """
+    Sends a request, retrying with exponential backoff when the connection fails, e.g. when
+    a pooled connection was closed by the server.
+
+    Args:
+        send (Callable[[], Awaitable[T]]): Sends the request, building its body anew on each
+            attempt, and handles the response.
+        retries (int): Attempts after the first, which should be 0 for bodies that cannot be
+            sent again, such as streams.
+
+    Returns:
+        T: The result of the first successful attempt.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await send()
+        except aiohttp.ClientConnectionError as e:
+            if attempt == retries:
+                raise
+            delay = HTTP_CLIENT_RETRY_BACKOFF * 2**attempt
+            logger.warning(f"Retrying request in {delay:.2f}s after error: {e}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,112 @@
+import os
+from collections import OrderedDict
+from functools import cache
+
+from PIL import Image
+
+from aiden.app.image import frame_difference
+from aiden.models.brain import FrameGateStats
+
+VISION_FRAME_GATE_ENABLE = (
+    os.environ.get("VISION_FRAME_GATE_ENABLE", "false").lower() == "true"
+)
+VISION_FRAME_GATE_MAX_AGENTS = int(
+    os.environ.get("VISION_FRAME_GATE_MAX_AGENTS", "1024")
+)
+VISION_FRAME_GATE_THRESHOLD = float(
+    os.environ.get("VISION_FRAME_GATE_THRESHOLD", "0.02")
+)
+
+
+class FrameGate:
+    """
+    Skips describing an agent's frame when it barely differs from the last frame described.
+
+    Frames are compared with the last described frame rather than the previous one, so a
+    scene changing slowly is still described again once it has changed enough.
+    """
+
+    def __init__(
+        self,
+        threshold: float = VISION_FRAME_GATE_THRESHOLD,
+        max_agents: int = VISION_FRAME_GATE_MAX_AGENTS,
+    ):
+        """
+        Args:
+            threshold (float): Default difference below which frames are skipped, from 0 to 1.
+            max_agents (int): Agents to keep frames of, evicting the least recently seen.
+        """
+        self.threshold = threshold
+        self.max_agents = max_agents
+        # The last described frame's thumbnail and description by agent
+        self._frames: OrderedDict[str, tuple[Image.Image, str]] = OrderedDict()
+        self._stats: dict[str, FrameGateStats] = {}
+
+    def check(
+        self, agent_id: str, thumbnail: Image.Image, threshold: float | None = None
+    ) -> str | None:
+        """
+        Checks whether an agent's frame changed enough to be described.
+
+        Args:
+            agent_id (str): The agent which sent the frame.
+            thumbnail (Image.Image): Thumbnail of the frame.
+            threshold (float | None): Difference below which the frame is skipped, defaults
+                to the gate's threshold.
+
+        Returns:
+            str | None: The previous description to reuse, or None to describe the frame.
+        """
+        stats = self._stats.setdefault(agent_id, FrameGateStats(agent_id=agent_id))
+        stats.frames += 1
+        while len(self._stats) > self.max_agents:
+            self._stats.pop(next(iter(self._stats)))
+
+        previous = self._frames.get(agent_id)
+        if previous is None:
+            return None
+        self._frames.move_to_end(agent_id)
+
+        previous_thumbnail, description = previous
+        if previous_thumbnail.size != thumbnail.size or frame_difference(
+            previous_thumbnail, thumbnail
+        ) >= (self.threshold if threshold is None else threshold):
+            return None
+
+        stats.skipped += 1
+        return description
+
+    def update(self, agent_id: str, thumbnail: Image.Image, description: str) -> None:
+        """
+        Records the frame an agent's description was generated from.
+
+        Args:
+            agent_id (str): The agent which sent the frame.
+            thumbnail (Image.Image): Thumbnail of the frame.
+            description (str): The description of the frame.
+        """
+        self._frames[agent_id] = (thumbnail, description)
+        self._frames.move_to_end(agent_id)
+        while len(self._frames) > self.max_agents:
+            evicted, _ = self._frames.popitem(last=False)
+            self._stats.pop(evicted, None)
+
+    def stats(self) -> list[FrameGateStats]:
+        """
+        Lists how many frames of each agent were skipped.
+
+        Returns:
+            list[FrameGateStats]: The frames and skipped frames of each agent.
+        """
+        return [stats.model_copy() for stats in self._stats.values()]
+
+
+@cache
+def get_frame_gate() -> FrameGate:
+    """
+    Builds the process wide frame gate from the environment.
+
+    Returns:
+        FrameGate: The frame gate.
+    """
+    return FrameGate()
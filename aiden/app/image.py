@@ -0,0 +1,122 @@
+import io
+import os
+
+from PIL import Image, ImageChops, ImageStat
+
+# Longest side of images sent to the vision model, e.g. 378 for moondream or 336 for llava
+VISION_IMAGE_SIZE = int(os.environ.get("VISION_IMAGE_SIZE", "378"))
+VISION_IMAGE_QUALITY = int(os.environ.get("VISION_IMAGE_QUALITY", "85"))
+
+
+def preprocess_image(
+    image: bytes,
+    max_size: int = VISION_IMAGE_SIZE,
+    quality: int = VISION_IMAGE_QUALITY,
+) -> bytes:
+    """
+    Downsizes an image to the vision model's input size and re-encodes it as JPEG.
+
+    The vision model encodes images in time proportional to their pixels, so larger frames
+    only add latency. Pillow decodes, resizes and encodes in C, releasing the GIL, so call
+    this in a thread to keep the event loop free.
+
+    Args:
+        image (bytes): The image file, e.g. a JPEG or PNG frame.
+        max_size (int): Longest side of the resulting image in pixels.
+        quality (int): JPEG quality of the resulting image.
+
+    Returns:
+        bytes: The JPEG image, or the original image if it is a JPEG within the size already.
+
+    Raises:
+        ValueError: If the image cannot be decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(image)) as original:
+            if original.format == "JPEG" and max(original.size) <= max_size:
+                return image
+
+            # JPEG frames are decoded straight at a reduced scale, skipping most of the work
+            original.draft("RGB", (max_size, max_size))
+            resized = original.convert("RGB")
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f"Cannot decode the image: {exc}") from exc
+
+    resized.thumbnail((max_size, max_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+    buffer = io.BytesIO()
+    resized.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def perceptual_hash(image: bytes, hash_size: int = 8) -> int:
+    """
+    Computes the difference hash of an image, which changes little for near-identical images.
+
+    Each bit records whether a pixel of a small grayscale thumbnail is brighter than its right
+    neighbour, so the Hamming distance between two hashes measures how different they look.
+
+    Args:
+        image (bytes): The image file.
+        hash_size (int): Rows and columns compared, giving a hash of `hash_size ** 2` bits.
+
+    Returns:
+        int: The hash.
+
+    Raises:
+        ValueError: If the image cannot be decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(image)) as original:
+            original.draft("L", (hash_size * 4, hash_size * 4))
+            thumbnail = original.convert("L").resize(
+                (hash_size + 1, hash_size), Image.Resampling.BOX
+            )
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f"Cannot decode the image: {exc}") from exc
+
+    pixels = thumbnail.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for column in range(offset, offset + hash_size):
+            bits = (bits << 1) | (pixels[column] > pixels[column + 1])
+    return bits
+
+
+def frame_thumbnail(image: bytes, size: tuple[int, int] = (64, 48)) -> Image.Image:
+    """
+    Shrinks an image to a small grayscale thumbnail for comparing consecutive frames.
+
+    Args:
+        image (bytes): The image file.
+        size (tuple[int, int]): Width and height of the thumbnail.
+
+    Returns:
+        Image.Image: The thumbnail.
+
+    Raises:
+        ValueError: If the image cannot be decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(image)) as original:
+            original.draft("L", size)
+            return original.convert("L").resize(size, Image.Resampling.BOX)
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f"Cannot decode the image: {exc}") from exc
+
+
+def frame_difference(previous: Image.Image, current: Image.Image) -> float:
+    """
+    Scores how much a frame changed, as the mean absolute difference of their thumbnails.
+
+    The difference is computed over whole images in C by Pillow.
+
+    Args:
+        previous (Image.Image): Thumbnail of the earlier frame.
+        current (Image.Image): Thumbnail of the later frame, of the same size.
+
+    Returns:
+        float: The difference, from 0 for identical frames to 1 for inverted ones.
+    """
+    return ImageStat.Stat(ImageChops.difference(previous, current)).mean[0] / 255
@@ -0,0 +1,268 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+TOKENS_PER_SECOND_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0)
+
+
+class Metric:
+    """
+    Base for metrics which keep a separate series for each combination of label values.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """
+        Lists the current samples of the metric for exposition.
+
+        Returns:
+            list[tuple[str, dict[str, str], float]]: The sample name, its labels and its value.
+        """
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count, e.g. of requests served.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            (self.name, dict(zip(self.labelnames, key)), value)
+            for key, value in values.items()
+        ]
+
+
+class Gauge(Counter):
+    """
+    Value which can go up and down, e.g. the number of requests in flight.
+    """
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """
+    Cumulative histogram of observed values, kept separately for each combination of labels.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Records a value in the bucket it falls in.
+
+        Args:
+            value (float): The observed value, e.g. a latency in seconds.
+            **labels (str): A value for each of the histogram's label names.
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observes the duration of the enclosed block in seconds.
+
+        Args:
+            **labels (str): A value for each of the histogram's label names.
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started, **labels)
+
+    def snapshot(self) -> dict[tuple[str, ...], tuple[list[int], float, int]]:
+        """
+        Copies the current state of every labelled series.
+
+        Returns:
+            dict: Label values mapped to cumulative bucket counts, the sum and the count.
+        """
+        with self._lock:
+            series = {
+                key: (list(counts), total[0])
+                for key, (counts, total) in self._series.items()
+            }
+
+        snapshot = {}
+        for key, (counts, total) in series.items():
+            cumulative = []
+            running = 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            snapshot[key] = (cumulative[:-1], total, running)
+        return snapshot
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        samples = []
+        for key, (buckets, total, count) in self.snapshot().items():
+            labels = dict(zip(self.labelnames, key))
+            for bound, bucket_count in zip(self.buckets, buckets):
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": str(bound)}, bucket_count)
+                )
+            samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    formatted = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()
+    )
+    return f"{{{formatted}}}"
+
+
+def render_prometheus(metrics: list[Metric]) -> str:
+    """
+    Renders metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics (list[Metric]): The metrics to render.
+
+    Returns:
+        str: The metrics as Prometheus text, ending with a newline.
+    """
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+BACKEND_TOKENS = Counter(
+    "aiden_backend_tokens_total",
+    "Tokens processed by backend models.",
+    ("model", "kind"),
+)
+BACKEND_TOKENS_PER_SECOND = Histogram(
+    "aiden_backend_tokens_per_second",
+    "Generation throughput of backend models.",
+    ("model",),
+    TOKENS_PER_SECOND_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "aiden_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+CORTICAL_GRAPHS_IN_FLIGHT = Gauge(
+    "aiden_cortical_graphs_in_flight",
+    "Cortical graphs currently executing.",
+)
+EVENT_LOOP_LAG = Gauge(
+    "aiden_event_loop_lag_seconds",
+    "Delay between when the event loop was due to run a callback and when it ran it.",
+)
+HTTP_REQUEST_LATENCY = Histogram(
+    "aiden_http_request_duration_seconds",
+    "Time until the response starts, by endpoint.",
+    ("method", "path"),
+)
+HTTP_REQUESTS = Counter(
+    "aiden_http_requests_total",
+    "HTTP requests by endpoint and status code.",
+    ("method", "path", "status"),
+)
+REDIS_LATENCY = Histogram(
+    "aiden_redis_operation_seconds",
+    "Latency of Redis operations.",
+    ("operation",),
+)
+STAGE_LATENCY = Histogram(
+    "aiden_stage_latency_seconds",
+    "Latency of cortical graph nodes, memory operations and backend calls.",
+    ("stage",),
+)
+
+REGISTRY: list[Metric] = [
+    BACKEND_TOKENS,
+    BACKEND_TOKENS_PER_SECOND,
+    CACHE_REQUESTS,
+    CORTICAL_GRAPHS_IN_FLIGHT,
+    EVENT_LOOP_LAG,
+    HTTP_REQUEST_LATENCY,
+    HTTP_REQUESTS,
+    REDIS_LATENCY,
+    STAGE_LATENCY,
+]
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from contextvars import ContextVar
+
+from pydantic import BaseModel
+
+from aiden import logger
+from aiden.app.metrics import EVENT_LOOP_LAG
+
+EVENT_LOOP_BLOCK_THRESHOLD_MS = float(
+    os.environ.get("EVENT_LOOP_BLOCK_THRESHOLD_MS", "100")
+)
+EVENT_LOOP_LAG_INTERVAL = float(os.environ.get("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+EVENT_LOOP_MAX_INCIDENTS = 100
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Request IDs of running tasks, readable from the watchdog thread
+_task_request_ids: weakref.WeakKeyDictionary[asyncio.Task, str] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL) -> None:
+    """
+    Measures how late the event loop wakes a sleeping task, which is the time any request
+    waits behind blocking code, and publishes it as the event loop lag gauge.
+
+    Args:
+        interval (float): Seconds to sleep between measurements.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - expected))
+
+
+def _request_id_task_factory(loop: asyncio.AbstractEventLoop, coro, **kwargs):
+    # New tasks copy the creator's context, so they belong to the same request
+    task = asyncio.Task(coro, loop=loop, **kwargs)
+    request_id = request_id_var.get()
+    if request_id is not None:
+        _task_request_ids[task] = request_id
+    return task
+
+
+class BlockingIncident(BaseModel):
+    duration_ms: float
+    request_id: str | None = None
+    stack: str
+
+
+class EventLoopWatchdog:
+    """
+    Detects code blocking the event loop from a separate thread.
+
+    A heartbeat callback is scheduled on the loop. When the heartbeat stalls for longer
+    than the threshold, the stack of the loop thread, which is the blocking code, is
+    captured and logged with the ID of the request whose task is running.
+    """
+
+    def __init__(self, threshold: float = EVENT_LOOP_BLOCK_THRESHOLD_MS / 1000):
+        self.threshold = threshold
+        self.incidents: deque[BlockingIncident] = deque(maxlen=EVENT_LOOP_MAX_INCIDENTS)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._current_incident: BlockingIncident | None = None
+        # Guards the last beat and current incident, shared by the loop and watcher threads
+        self._lock = threading.Lock()
+        self._previous_task_factory = None
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Starts watching the loop. Must be called from the loop's thread.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop to watch.
+        """
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._previous_task_factory = loop.get_task_factory()
+        loop.set_task_factory(_request_id_task_factory)
+        self._beat()
+        self._thread = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+        if self._thread is not None:
+            self._thread.join()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.set_task_factory(self._previous_task_factory)
+
+    def _beat(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._current_incident is not None:
+                # The loop is running again, so the full duration of the block is known
+                self._current_incident.duration_ms = round(
+                    (now - self._last_beat) * 1000, 3
+                )
+                self._current_incident = None
+            self._last_beat = now
+        self._heartbeat = self._loop.call_later(self.threshold / 4, self._beat)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.threshold / 4):
+            with self._lock:
+                stalled = time.monotonic() - self._last_beat
+                if stalled <= self.threshold or self._current_incident is not None:
+                    continue
+                incident = self._report(stalled)
+            logger.warning(
+                f"Event loop blocked for over {incident.duration_ms}ms "
+                f"by request {incident.request_id}:\n{incident.stack}"
+            )
+
+    def _report(self, stalled: float) -> BlockingIncident:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        task = asyncio.current_task(self._loop)
+        request_id = _task_request_ids.get(task) if task is not None else None
+
+        incident = BlockingIncident(
+            duration_ms=round(stalled * 1000, 3), request_id=request_id, stack=stack
+        )
+        self._current_incident = incident
+        self.incidents.append(incident)
+        return incident
@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILER_MAX_SECONDS = float(os.environ.get("PROFILER_MAX_SECONDS", "60"))
+PROFILER_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILER_SAMPLE_INTERVAL_MS", "5"))
+
+_profiling = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(frame) -> str:
+    # Labels must not contain the separators of the collapsed stack format
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}".replace(";", ":").replace(" ", "_")
+
+
+def _collapse_stack(thread_name: str, frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    return ";".join(reversed(labels))
+
+
+def profile(
+    seconds: float, interval: float = PROFILER_SAMPLE_INTERVAL_MS / 1000
+) -> str:
+    """
+    Samples the stacks of every thread in the process for a number of seconds.
+
+    Sampling only reads the interpreter's current frames from a separate thread, so the
+    overhead on the profiled requests is low and nothing is instrumented while idle.
+
+    Args:
+        seconds (float): How long to sample for, capped to `PROFILER_MAX_SECONDS`.
+        interval (float): Seconds between samples.
+
+    Returns:
+        str: Stacks in the collapsed format of flame graph tools, one `frame;frame count` per line.
+
+    Raises:
+        ProfilerBusyError: If another profile is already running.
+    """
+    if not _profiling.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+
+    try:
+        own_thread_id = threading.get_ident()
+        samples: Counter[str] = Counter()
+        deadline = time.monotonic() + min(seconds, PROFILER_MAX_SECONDS)
+
+        while time.monotonic() < deadline:
+            thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                thread_name = thread_names.get(thread_id, str(thread_id))
+                samples[_collapse_stack(thread_name, frame)] += 1
+            time.sleep(interval)
+    finally:
+        _profiling.release()
+
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
@@ -0,0 +1,80 @@
+import os
+from collections import OrderedDict
+from functools import cache
+
+from aiden.app.metrics import CACHE_REQUESTS
+
+VOCAL_CACHE_ENABLE = os.environ.get("VOCAL_CACHE_ENABLE", "true").lower() == "true"
+VOCAL_CACHE_MAX_BYTES = int(os.environ.get("VOCAL_CACHE_MAX_BYTES", "33554432"))
+
+
+class SpeechCache:
+    """
+    Caches synthesised speech by its text and voice, so repeated phrases such as greetings
+    are only synthesised once.
+
+    Speech is synthesised the same way every time, so entries do not expire, and the least
+    recently used are evicted once the audio exceeds `max_bytes` in total.
+    """
+
+    def __init__(self, max_bytes: int = VOCAL_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        # Audio by voice and text
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def _key(text: str, voice: str) -> tuple[str, str]:
+        return voice, " ".join(text.split())
+
+    def get(self, text: str, voice: str) -> bytes | None:
+        """
+        Looks up the synthesised speech of a text.
+
+        Args:
+            text (str): The text spoken.
+            voice (str): The voice model, and speaker of multi-speaker models.
+
+        Returns:
+            bytes | None: The cached audio, or None on a miss.
+        """
+        key = self._key(text, voice)
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="vocal", result="miss" if audio is None else "hit")
+        return audio
+
+    def set(self, text: str, voice: str, audio: bytes) -> None:
+        """
+        Caches the synthesised speech of a text.
+
+        Args:
+            text (str): The text spoken.
+            voice (str): The voice model, and speaker of multi-speaker models.
+            audio (bytes): The synthesised audio.
+        """
+        if len(audio) > self.max_bytes:
+            return
+        key = self._key(text, voice)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = audio
+        self._size += len(audio)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+
+@cache
+def get_speech_cache() -> SpeechCache | None:
+    """
+    Builds the process wide speech cache from the environment.
+
+    Returns:
+        SpeechCache | None: The cache, or None if `VOCAL_CACHE_ENABLE` is false.
+    """
+    if not VOCAL_CACHE_ENABLE:
+        return None
+    return SpeechCache()
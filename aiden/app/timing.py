@@ -0,0 +1,136 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+from aiden.app.metrics import STAGE_LATENCY
+from aiden.models.brain import Timing
+
+T = TypeVar("T")
+
+
+class Timings:
+    """
+    Collects the timings of every stage of a single request.
+    """
+
+    def __init__(self):
+        self.entries: list[Timing] = []
+
+    def add(
+        self,
+        name: str,
+        duration: float,
+        prompt_tokens: int | None = None,
+        eval_tokens: int | None = None,
+    ) -> None:
+        self.entries.append(
+            Timing(
+                name=name,
+                duration_ms=round(duration * 1000, 3),
+                prompt_tokens=prompt_tokens,
+                eval_tokens=eval_tokens,
+            )
+        )
+
+    def server_timing_header(self) -> str:
+        """
+        Formats the collected timings as a `Server-Timing` header value.
+
+        Returns:
+            str: Comma separated metrics, e.g. `thalamus;dur=812.5, memory_read;dur=1.2`.
+        """
+        metrics = []
+        for entry in self.entries:
+            metric = f"{entry.name};dur={entry.duration_ms}"
+            if entry.prompt_tokens is not None or entry.eval_tokens is not None:
+                metric += (
+                    f';desc="prompt={entry.prompt_tokens} eval={entry.eval_tokens}"'
+                )
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+_current_timings: ContextVar[Timings | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """
+    Collects the timings recorded within the block, joining an enclosing collection if any.
+
+    Yields:
+        Timings: The active timings collection.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        yield timings
+        return
+
+    timings = Timings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def record_timing(
+    name: str,
+    duration: float,
+    prompt_tokens: int | None = None,
+    eval_tokens: int | None = None,
+) -> None:
+    """
+    Records a stage duration in the stage latency histogram and the active timings collection.
+
+    Args:
+        name (str): Name of the stage, e.g. `thalamus` or `memory_read`.
+        duration (float): Duration of the stage in seconds.
+        prompt_tokens (int | None): Prompt tokens evaluated by the backend, if known.
+        eval_tokens (int | None): Tokens generated by the backend, if known.
+    """
+    STAGE_LATENCY.observe(duration, stage=name)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, duration, prompt_tokens, eval_tokens)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block with a monotonic clock and records it as a stage.
+
+    Args:
+        name (str): Name of the stage.
+    """
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        record_timing(name, time.monotonic() - started)
+
+
+def timed_node(
+    name: str, func: Callable[..., Awaitable[T]]
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wraps an async graph node so each run is recorded as a stage.
+
+    Args:
+        name (str): Name of the stage.
+        func (Callable[..., Awaitable[T]]): The node function.
+
+    Returns:
+        Callable[..., Awaitable[T]]: The timed node function.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> T:
+        with timed(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
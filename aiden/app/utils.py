@@ -7,13 +7,25 @@ import os
 PROMPT_LANGUAGE_PREFIX = "You hear the following spoken - "
 PROMPT_ACTION_PREFIX = "You can perform the following actions - "
 
+# Parsed brain configs by path, with the modification time they were parsed at
+_brain_configs: dict[str, tuple[float, BrainConfig]] = {}
+
 
 def load_brain_config(config_file: str) -> BrainConfig:
     if not os.path.exists(config_file):
         raise FileNotFoundError("Cannot find the brain configuration file")
+
+    # Only parse the config again when the file has changed
+    modified = os.path.getmtime(config_file)
+    cached = _brain_configs.get(config_file)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+
     with open(config_file, "r", encoding="utf8") as f:
         data = json.load(f)
-    return BrainConfig(**data)
+    brain_config = BrainConfig(**data)
+    _brain_configs[config_file] = (modified, brain_config)
+    return brain_config
 
 
 def build_sensory_input_prompt_template(sensory: Sensory) -> str:
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from functools import cache
+
+from redis import Redis, RedisError
+
+from aiden import logger
+from aiden.app.metrics import CACHE_REQUESTS, REDIS_LATENCY
+
+VISION_CACHE_ENABLE = os.environ.get("VISION_CACHE_ENABLE", "true").lower() == "true"
+VISION_CACHE_MAX_DISTANCE = int(os.environ.get("VISION_CACHE_MAX_DISTANCE", "4"))
+VISION_CACHE_MAX_ENTRIES = int(os.environ.get("VISION_CACHE_MAX_ENTRIES", "1024"))
+VISION_CACHE_REDIS_ENABLE = (
+    os.environ.get("VISION_CACHE_REDIS_ENABLE", "false").lower() == "true"
+)
+VISION_CACHE_TTL = float(os.environ.get("VISION_CACHE_TTL", "300"))
+
+HASH_BITS = 64
+
+
+class DescriptionCache:
+    """
+    Caches the vision model's descriptions of images by their perceptual hash.
+
+    An image matches a cached description when its hash is within `max_distance` bits of the
+    cached image's, so near-identical frames, e.g. of an agent standing still, share one
+    description. Entries expire after `ttl` seconds and the least recently used are evicted
+    beyond `max_entries`.
+
+    With a Redis client, descriptions are also shared between replicas. To find near matches
+    in Redis, the hash is split into `max_distance + 1` bands, at least one of which must be
+    identical between two hashes within the distance, and each band indexes the hash of the
+    image last cached with it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = VISION_CACHE_MAX_ENTRIES,
+        ttl: float = VISION_CACHE_TTL,
+        max_distance: int = VISION_CACHE_MAX_DISTANCE,
+        redis_client: Redis | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.redis_client = redis_client
+        # Descriptions and their expiry times by instruction and image hash
+        self._entries: OrderedDict[tuple[str, int], tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def _namespace(instruction: str) -> str:
+        return hashlib.sha256(instruction.encode()).hexdigest()[:16]
+
+    def _bands(self, image_hash: int) -> list[tuple[int, int]]:
+        bands = min(self.max_distance + 1, HASH_BITS)
+        width = HASH_BITS // bands
+        return [
+            (band, (image_hash >> (band * width)) & ((1 << width) - 1))
+            for band in range(bands)
+        ]
+
+    def _get_local(self, namespace: str, image_hash: int) -> str | None:
+        now = time.monotonic()
+        match = None
+        for key, (expires, description) in list(self._entries.items()):
+            if expires <= now:
+                del self._entries[key]
+            elif (
+                match is None
+                and key[0] == namespace
+                and (key[1] ^ image_hash).bit_count() <= self.max_distance
+            ):
+                match = key
+        if match is None:
+            return None
+        self._entries.move_to_end(match)
+        return self._entries[match][1]
+
+    def _set_local(self, namespace: str, image_hash: int, description: str) -> None:
+        self._entries[(namespace, image_hash)] = (
+            time.monotonic() + self.ttl,
+            description,
+        )
+        self._entries.move_to_end((namespace, image_hash))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_redis(self, namespace: str, image_hash: int) -> str | None:
+        with REDIS_LATENCY.time(operation="mget"):
+            candidates = self.redis_client.mget(
+                [
+                    f"vision:cache:{namespace}:band:{band}:{value}"
+                    for band, value in self._bands(image_hash)
+                ]
+            )
+        matches = {
+            candidate
+            for candidate in candidates
+            if candidate is not None
+            and (int(candidate, 16) ^ image_hash).bit_count() <= self.max_distance
+        }
+        if not matches:
+            return None
+
+        with REDIS_LATENCY.time(operation="mget"):
+            descriptions = self.redis_client.mget(
+                [f"vision:cache:{namespace}:{match}" for match in matches]
+            )
+        return next(
+            (description for description in descriptions if description is not None),
+            None,
+        )
+
+    def _set_redis(self, namespace: str, image_hash: int, description: str) -> None:
+        pipeline = self.redis_client.pipeline(transaction=False)
+        expiry = max(1, round(self.ttl))
+        pipeline.set(
+            f"vision:cache:{namespace}:{image_hash:016x}", description, ex=expiry
+        )
+        for band, value in self._bands(image_hash):
+            pipeline.set(
+                f"vision:cache:{namespace}:band:{band}:{value}",
+                f"{image_hash:016x}",
+                ex=expiry,
+            )
+        with REDIS_LATENCY.time(operation="pipeline"):
+            pipeline.execute()
+
+    async def get(self, instruction: str, image_hash: int) -> str | None:
+        """
+        Looks up the description of an image, or of a near-identical one.
+
+        Args:
+            instruction (str): The instruction the image was described with.
+            image_hash (int): Perceptual hash of the image.
+
+        Returns:
+            str | None: The cached description, or None on a miss.
+        """
+        namespace = self._namespace(instruction)
+        description = self._get_local(namespace, image_hash)
+        if description is None and self.redis_client is not None:
+            try:
+                description = await asyncio.to_thread(
+                    self._get_redis, namespace, image_hash
+                )
+            except RedisError as exc:
+                logger.warning(f"Failed reading the vision cache from Redis: {exc}")
+            if description is not None:
+                self._set_local(namespace, image_hash, description)
+
+        CACHE_REQUESTS.inc(
+            cache="vision", result="miss" if description is None else "hit"
+        )
+        return description
+
+    async def set(self, instruction: str, image_hash: int, description: str) -> None:
+        """
+        Caches the description of an image.
+
+        Args:
+            instruction (str): The instruction the image was described with.
+            image_hash (int): Perceptual hash of the image.
+            description (str): The full description.
+        """
+        namespace = self._namespace(instruction)
+        self._set_local(namespace, image_hash, description)
+        if self.redis_client is not None:
+            try:
+                await asyncio.to_thread(
+                    self._set_redis, namespace, image_hash, description
+                )
+            except RedisError as exc:
+                logger.warning(f"Failed writing the vision cache to Redis: {exc}")
+
+
+@cache
+def get_description_cache() -> DescriptionCache | None:
+    """
+    Builds the process wide vision description cache from the environment.
+
+    Returns:
+        DescriptionCache | None: The cache, or None if `VISION_CACHE_ENABLE` is false.
+    """
+    if not VISION_CACHE_ENABLE:
+        return None
+    redis_client = None
+    if VISION_CACHE_REDIS_ENABLE:
+        from aiden.app.clients.redis_client import redis_client
+    return DescriptionCache(redis_client=redis_client)
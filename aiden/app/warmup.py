@@ -0,0 +1,204 @@
+import asyncio
+import importlib
+import os
+import time
+from functools import partial
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from aiden import logger
+from aiden.app.brain.cognition import (
+    COGNITIVE_API_HEDGE_URL_BASES,
+    COGNITIVE_API_URL_BASE,
+    VISION_API_URL_BASE,
+)
+from aiden.app.utils import load_brain_config
+from aiden.models.brain import (
+    Action,
+    AuditoryInput,
+    AuditoryType,
+    CorticalRequest,
+    Sensory,
+    TactileInput,
+    TactileType,
+    VisionInput,
+)
+
+# Comma separated brain configs to parse before accepting traffic
+WARMUP_CONFIGS = [
+    config.strip()
+    for config in os.environ.get(
+        "BRAIN_WARMUP_CONFIGS", "./config/brain/default.json"
+    ).split(",")
+    if config.strip()
+]
+WARMUP_KEEP_ALIVE = os.environ.get("BRAIN_WARMUP_KEEP_ALIVE", "30m")
+WARMUP_STEP_TIMEOUT = float(os.environ.get("BRAIN_WARMUP_STEP_TIMEOUT", "300"))
+WARMUP_TICK_ENABLE = (
+    os.environ.get("BRAIN_WARMUP_TICK_ENABLE", "true").lower() == "true"
+)
+WARMUP_AGENT_ID = "warmup"
+WARMUP_MODULES = (
+    "aiden.app.brain.auditory",
+    "aiden.app.brain.cortical",
+    "aiden.app.brain.memory.hippocampus",
+    "aiden.app.brain.occipital",
+    "aiden.app.brain.perception",
+    "aiden.app.clients.redis_client",
+)
+
+
+class WarmupStep(BaseModel):
+    name: str
+    duration_ms: float
+    error: str | None = None
+
+
+class Readiness(BaseModel):
+    ready: bool
+    steps: list[WarmupStep] = []
+
+
+def _configured_models() -> list[tuple[str, str]]:
+    # Every backend a region may call, including hedges, should have its model loaded
+    cognitive_model = os.environ.get("COGNITIVE_MODEL", "mistral")
+    models = [
+        (base_url, cognitive_model)
+        for base_url in [COGNITIVE_API_URL_BASE, *COGNITIVE_API_HEDGE_URL_BASES]
+    ]
+    if os.environ.get("VISION_ENABLE", "true").lower() == "true":
+        models.append((VISION_API_URL_BASE, os.environ.get("VISION_MODEL", "bakllava")))
+    return models
+
+
+class Warmup:
+    """
+    Pays the cold start costs of the brain API before it reports as ready.
+
+    Brain regions are imported and the cortical graph compiled, brain configs parsed, the
+    Redis connection opened and every configured Ollama model loaded with a keep alive.
+    Finally a synthetic cortical tick runs through the whole graph, without saving its
+    memory.
+
+    A failed step is logged and reported but does not hold back readiness, as the brain
+    regions fall back gracefully when a backend is unavailable.
+    """
+
+    def __init__(
+        self,
+        configs: list[str] = WARMUP_CONFIGS,
+        tick: bool = WARMUP_TICK_ENABLE,
+        timeout: float = WARMUP_STEP_TIMEOUT,
+    ):
+        self.configs = configs
+        self.tick = tick
+        self.timeout = timeout
+        self.ready = False
+        self.steps: list[WarmupStep] = []
+
+    def readiness(self) -> Readiness:
+        return Readiness(ready=self.ready, steps=self.steps)
+
+    async def run(self) -> None:
+        """
+        Runs every warmup step, then marks the brain API as ready.
+        """
+        started = time.monotonic()
+
+        await self._step("imports", self._import_modules)
+        await self._step("configs", self._load_configs)
+        await asyncio.gather(
+            self._step("redis", self._connect_redis),
+            *(
+                self._step(
+                    f"model:{model}@{base_url}",
+                    partial(self._load_model, base_url, model),
+                )
+                for base_url, model in _configured_models()
+            ),
+        )
+        if self.tick:
+            await self._step("tick", self._run_tick)
+
+        self.ready = True
+        logger.info(f"Warmup finished in {time.monotonic() - started:.2f}s")
+
+    async def _step(self, name: str, func: Callable[[], Awaitable[None]]) -> None:
+        started = time.monotonic()
+        error = None
+        try:
+            await asyncio.wait_for(func(), timeout=self.timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.warning(f"Warmup step {name} failed: {error}")
+
+        self.steps.append(
+            WarmupStep(
+                name=name,
+                duration_ms=round((time.monotonic() - started) * 1000, 3),
+                error=error,
+            )
+        )
+
+    async def _import_modules(self) -> None:
+        # Brain regions are imported lazily to keep startup fast, so import them off the loop
+        for name in WARMUP_MODULES:
+            await asyncio.to_thread(importlib.import_module, name)
+
+        from aiden.app.brain.cortical import get_cortical_graph
+
+        await asyncio.to_thread(get_cortical_graph)
+
+    async def _load_configs(self) -> None:
+        for config in self.configs:
+            await asyncio.to_thread(load_brain_config, config)
+
+    async def _connect_redis(self) -> None:
+        from aiden.app.clients.redis_client import redis_client
+
+        await asyncio.to_thread(redis_client.ping)
+
+    async def _load_model(self, base_url: str, model: str) -> None:
+        import aiohttp
+
+        from aiden.app.clients.http_client import get_http_session
+
+        # A generate request without a prompt only loads the model into memory, which can
+        # take longer than the shared session's timeout
+        async with get_http_session().post(
+            f"{base_url}/api/generate",
+            json={"model": model, "keep_alive": WARMUP_KEEP_ALIVE},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as response:
+            response.raise_for_status()
+
+    async def _run_tick(self) -> None:
+        from aiden.app.brain.cortical import process_cortical
+        from aiden.app.brain.memory.hippocampus import BatchMemoryManager
+        from aiden.app.clients.redis_client import redis_client
+
+        # Exercise every region of the graph, i.e. actions for the prefrontal and speech for broca
+        request = CorticalRequest(
+            agent_id=WARMUP_AGENT_ID,
+            sensory=Sensory(
+                vision=[VisionInput(content="I see an empty room.")],
+                auditory=[AuditoryInput(type=AuditoryType.LANGUAGE, content="Hello.")],
+                tactile=[
+                    TactileInput(
+                        type=TactileType.ACTION, command=Action(name="move forward")
+                    )
+                ],
+            ),
+        )
+        if self.configs:
+            request.config = self.configs[0]
+
+        # The tick's memory is buffered and never flushed, so an agent which happens to
+        # share the warmup ID keeps its memory
+        memory_manager = BatchMemoryManager(
+            redis_client=redis_client, agent_ids=[WARMUP_AGENT_ID]
+        )
+        stream = await process_cortical(request, memory_manager)
+        async for _ in stream:
+            pass
@@ -1,7 +1,7 @@
 from enum import Enum
 
 from langchain_core.messages import BaseMessage
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, computed_field, model_validator
 
 ACTION_NONE = "none"
 
@@ -140,6 +140,8 @@ class BrainConfig(BaseModel):
 class AuditoryRequest(BaseModel):
     config: str = Field(default="./config/brain/default.json")
     audio: str  # Base64-encoded string representing the audio file data (e.g., .wav or .mp3 file)
+    sample_rate: int | None = Field(default=None, gt=0)  # Set for raw 16-bit PCM audio
+    channels: int = Field(default=1, ge=1)  # Interleaved channels of raw PCM audio
 
 
 class AuditoryResult(BaseModel):
@@ -151,22 +153,310 @@ class AuditoryResponse(BaseModel):
     results: list[AuditoryResult]
 
 
+class AuditoryBatchClip(BaseModel):
+    agent_id: str
+    microphone: str | None = None  # e.g. `left` or `right` for agents with several
+    audio: str  # Base64-encoded string representing the audio file data (e.g., .wav or .mp3 file)
+    sample_rate: int | None = Field(default=None, gt=0)  # Set for raw 16-bit PCM audio
+    channels: int = Field(default=1, ge=1)  # Interleaved channels of raw PCM audio
+
+
+class AuditoryBatchRequest(BaseModel):
+    config: str = Field(default="./config/brain/default.json")
+    clips: list[AuditoryBatchClip] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def check_unique_microphones(self):
+        microphones = [(clip.agent_id, clip.microphone) for clip in self.clips]
+        if len(microphones) != len(set(microphones)):
+            raise ValueError(
+                "Each clip in a batch must have a unique `agent_id` and `microphone`"
+            )
+        return self
+
+
+class AuditoryBatchResult(BaseModel):
+    agent_id: str
+    microphone: str | None = None
+    results: list[AuditoryResult] | None = None
+    error: str | None = None
+
+
+class AuditoryStreamStart(BaseModel):
+    agent_id: str
+    sample_rate: int = Field(default=16000, gt=0)  # Of the raw 16-bit PCM stream
+    channels: int = Field(default=1, ge=1)  # Interleaved channels of the stream
+    # Length of the classified windows and the audio between their starts, in seconds
+    window_seconds: float | None = Field(default=None, gt=0, le=30)
+    hop_seconds: float | None = Field(default=None, gt=0, le=30)
+
+
+class AuditoryEventType(Enum):
+    RESULT = "result"
+    ERROR = "error"
+
+
+class AuditoryEvent(BaseModel):
+    type: AuditoryEventType
+    time: float | None = None  # Seconds into the stream at which the window ends
+    result: AuditoryResult | None = None  # Set when the top class changes
+    content: str | None = None
+
+
 class CorticalRequest(BaseModel):
     agent_id: str
     config: str = Field(default="./config/brain/default.json")
     sensory: Sensory
     history: list[BaseMessage] | None = None
+    latency_budget_ms: int | None = Field(default=None, gt=0)
+    include_timings: bool = False
+
+
+class Timing(BaseModel):
+    name: str
+    duration_ms: float
+    prompt_tokens: int | None = None
+    eval_tokens: int | None = None
 
 
 class CorticalResponse(BaseModel):
     action: str | None = None
     thoughts: str | None = None
     speech: str | None = None
+    skipped: list[str] = []  # Stages skipped to meet the request's latency budget
+    timings: list[Timing] | None = None
+
+
+class CorticalBatchRequest(BaseModel):
+    requests: list[CorticalRequest] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def check_unique_agent_ids(self):
+        agent_ids = [request.agent_id for request in self.requests]
+        if len(agent_ids) != len(set(agent_ids)):
+            raise ValueError("Each request in a batch must have a unique `agent_id`")
+        return self
+
+
+class CorticalBatchResult(BaseModel):
+    agent_id: str
+    response: CorticalResponse | None = None
+    error: str | None = None
+
+
+class CorticalSessionStart(BaseModel):
+    agent_id: str
+    config: str = Field(default="./config/brain/default.json")
+    latency_budget_ms: int | None = Field(default=None, gt=0)
+    include_timings: bool = False
+
+
+class SensoryDelta(BaseModel):
+    # Modalities left unset keep their inputs from the previous tick of the session
+    vision: list[VisionInput] | None = None
+    auditory: list[AuditoryInput] | None = None
+    tactile: list[TactileInput] | None = None
+    olfactory: list[OlfactoryInput] | None = None
+    gustatory: list[GustatoryInput] | None = None
+
+    @classmethod
+    def between(cls, previous: Sensory | None, current: Sensory) -> "SensoryDelta":
+        """
+        Builds the delta holding only the modalities which changed between two snapshots.
+
+        Args:
+            previous (Sensory | None): The snapshot sent last, or None if none was sent.
+            current (Sensory): The new snapshot.
+
+        Returns:
+            SensoryDelta: The changed modalities.
+        """
+        return cls(
+            **{
+                modality: getattr(current, modality)
+                for modality in Sensory.model_fields
+                if previous is None
+                or getattr(previous, modality) != getattr(current, modality)
+            }
+        )
+
+    def apply(self, sensory: Sensory) -> Sensory:
+        """
+        Applies the delta to a snapshot.
+
+        Args:
+            sensory (Sensory): The previous snapshot.
+
+        Returns:
+            Sensory: A new snapshot with the changed modalities replaced.
+        """
+        return sensory.model_copy(
+            update={modality: inputs for modality, inputs in self if inputs is not None}
+        )
+
+
+class CorticalEventType(Enum):
+    ACTION = "action"
+    SPEECH = "speech"
+    SPEECH_DELTA = "speech_delta"  # A token of the speech, if streamed
+    THOUGHTS = "thoughts"
+    DONE = "done"
+    ERROR = "error"
+
+
+class CorticalEvent(BaseModel):
+    type: CorticalEventType
+    tick: int | None = None
+    content: str | None = None
+    response: CorticalResponse | None = None  # Set on the `done` event of each tick
+
+
+class AuditoryLanguageRequest(BaseModel):
+    audio: str  # Base64-encoded string representing the audio file data (e.g., .wav or .mp3 file)
+    sample_rate: int | None = Field(default=None, gt=0)  # Set for raw 16-bit PCM audio
+    channels: int = Field(default=1, ge=1)  # Interleaved channels of raw PCM audio
+    language: str | None = None  # e.g. `en`, detected from the speech if unset
+    # Runs a cortical tick with the transcript added to its auditory inputs
+    cortical: CorticalRequest | None = None
+
+
+class AuditoryLanguageEventType(Enum):
+    PARTIAL = "partial"
+    TRANSCRIPT = "transcript"
+    CORTICAL = "cortical"
+    ERROR = "error"
+
+
+class AuditoryLanguageEvent(BaseModel):
+    type: AuditoryLanguageEventType
+    content: str | None = None  # The transcript so far, or in full
+    cortical: CorticalEvent | None = None  # Set for events of the cortical tick
+
+
+class VocalRequest(BaseModel):
+    text: str | None = None  # The speech to synthesise
+    # Synthesises the speech of a cortical tick as it is generated instead of `text`
+    cortical: CorticalRequest | None = None
+    speaker_id: str | None = None  # For voice models with several speakers
+
+    @model_validator(mode="after")
+    def check_speech_source(self):
+        if (self.text is None) == (self.cortical is None):
+            raise ValueError("Exactly one of `text` or `cortical` is required")
+        return self
+
+
+class VocalEventType(Enum):
+    AUDIO = "audio"
+    CORTICAL = "cortical"
+    ERROR = "error"
+
+
+class VocalEvent(BaseModel):
+    type: VocalEventType
+    index: int | None = None  # Position of the sentence in the speech
+    content: str | None = None  # The sentence spoken, or the error
+    audio: str | None = None  # Base64-encoded WAV file of the sentence
+    cortical: CorticalEvent | None = None  # Set for events of the cortical tick
+
+
+class PerceptionRequest(BaseModel):
+    # The agent's other sensory inputs, to which the frame and audio perceived are added
+    cortical: CorticalRequest
+    image: str | None = (
+        None  # Base64-encoded string representing the image file data (e.g., .jpg or .png file)
+    )
+    frame_gate_threshold: float | None = Field(default=None, ge=0, le=1)
+    audio: str | None = (
+        None  # Base64-encoded string representing the audio file data (e.g., .wav or .mp3 file)
+    )
+    sample_rate: int | None = Field(default=None, gt=0)  # Set for raw 16-bit PCM audio
+    channels: int = Field(default=1, ge=1)  # Interleaved channels of raw PCM audio
+
+
+class PerceptionEventType(Enum):
+    VISION = "vision"
+    AUDITORY = "auditory"
+    CORTICAL = "cortical"
+    ERROR = "error"
+
+
+class PerceptionEvent(BaseModel):
+    type: PerceptionEventType
+    content: str | None = None  # The frame's description, or the sounds' class names
+    results: list[AuditoryResult] | None = None  # Set for the `auditory` event
+    cortical: CorticalEvent | None = None  # Set for events of the cortical tick
+    error: str | None = None  # Set if the frame or audio could not be perceived
 
 
 class OccipitalRequest(BaseModel):
     config: str = Field(default="./config/brain/default.json")
     image: str  # Base64-encoded string representing the image file data (e.g., .jpg or .png file)
+    latency_budget_ms: int | None = Field(default=None, gt=0)
+    agent_id: str | None = None  # Enables frame gating against the agent's last frame
+    frame_gate_threshold: float | None = Field(default=None, ge=0, le=1)
+
+
+class OccipitalBatchImage(BaseModel):
+    agent_id: str
+    camera: str | None = (
+        None  # e.g. `front` or `mirror` for agents with several cameras
+    )
+    image: str  # Base64-encoded string representing the image file data (e.g., .jpg or .png file)
+    frame_gate_threshold: float | None = Field(default=None, ge=0, le=1)
+
+
+class OccipitalBatchRequest(BaseModel):
+    config: str = Field(default="./config/brain/default.json")
+    images: list[OccipitalBatchImage] = Field(min_length=1)
+    latency_budget_ms: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_unique_cameras(self):
+        cameras = [(image.agent_id, image.camera) for image in self.images]
+        if len(cameras) != len(set(cameras)):
+            raise ValueError(
+                "Each image in a batch must have a unique `agent_id` and `camera`"
+            )
+        return self
+
+
+class OccipitalBatchResult(BaseModel):
+    agent_id: str
+    camera: str | None = None
+    description: str | None = None
+    error: str | None = None
+
+
+class FrameGateStats(BaseModel):
+    agent_id: str
+    frames: int = 0
+    skipped: int = 0
+
+    @computed_field
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
+
+
+class OccipitalStats(BaseModel):
+    frame_gate_enabled: bool
+    agents: list[FrameGateStats]
+
+
+class ActivityGateStats(BaseModel):
+    clips: int = 0
+    skipped: int = 0
+
+    @computed_field
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.clips if self.clips else 0.0
+
+
+class AuditoryStats(BaseModel):
+    activity_gate_enabled: bool
+    activity_gate: ActivityGateStats
 
 
 class NeuralyzerRequest(BaseModel):
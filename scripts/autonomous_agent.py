@@ -20,6 +20,7 @@ Usage:
     --neuralyzer: Wipe short-term memory of AI agent at the start.
     --pretty: Print scene output using emojis.
     --scene: Specify the path to the scene configuration file.
+    --session: Keep a WebSocket session with the brain API, sending only sensory changes.
     --speech: Enable human speech input (via text).
     --log: Enable logging to file.
     --terminal-level: Set the logging level for terminal output (default: DEBUG).
@@ -34,16 +35,20 @@ import asyncio
 import datetime
 import logging
 import os
+from contextlib import AsyncExitStack
 
 import httpx
 from aiden.app.brain.memory.hippocampus import MemoryManager
+from aiden.app.clients.cortical_session_client import CorticalSessionClient
 from aiden.app.clients.redis_client import redis_client
 from aiden.app.scene import Scene, load_scene
 from aiden.models.brain import (
     AuditoryInput,
     AuditoryType,
+    CorticalEventType,
     CorticalRequest,
     CorticalResponse,
+    CorticalSessionStart,
 )
 
 
@@ -83,8 +88,10 @@ async def autonomous_agent_simulation(
     enable_speech: bool = False,
     neuralyzer: bool = False,
     pretty: bool = False,
+    use_session: bool = False,
 ):
     api_url = f'{os.environ.get("BRAIN_PROTOCOL", "http")}://{os.environ.get("BRAIN_API_HOST", "localhost")}:{os.environ.get("BRAIN_API_PORT", "8000")}/cortical/'
+    session_url = f'{os.environ.get("BRAIN_WS_PROTOCOL", "ws")}://{os.environ.get("BRAIN_API_HOST", "localhost")}:{os.environ.get("BRAIN_API_PORT", "8000")}/cortical/session'
 
     agent_id = "0"
 
@@ -94,11 +101,19 @@ async def autonomous_agent_simulation(
         memory_manager = MemoryManager(redis_client=redis_client)
         memory_manager.wipe_memory(agent_id)
 
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient() as client, AsyncExitStack() as stack:
+        session = None
+        if use_session:
+            session = await stack.enter_async_context(
+                CorticalSessionClient(
+                    session_url,
+                    CorticalSessionStart(agent_id=agent_id, config=brain_config_file),
+                )
+            )
+
         while True:  # Loop indefinitely to keep processing sensory data and actions
             # User speech input
-            if enable_speech:
-                speech_input = input("Your input: ")
+            speech_input = input("Your input: ") if enable_speech else None
 
             logger.debug("Refreshing scene display...")
             print("\033c", end="")
@@ -114,22 +129,32 @@ async def autonomous_agent_simulation(
                 logger.info(f"Auditory [Language]: {speech_input}\n")
                 await asyncio.sleep(1)
 
-            payload = CorticalRequest(
-                config=brain_config_file, sensory=sensory_data, agent_id=agent_id
-            ).model_dump(mode="json")
-            response = await client.post(
-                api_url, json=payload, timeout=90.0
-            )  # Send sensory data to brain API
-            content = ""
-            if response.status_code == 200:
-                async for line in response.aiter_lines():
-                    if line:
-                        content = CorticalResponse().model_validate_json(line)
+            content = None
+            if session:
+                # Send only the changed senses over the open session
+                async for event in session.tick(sensory_data):
+                    if event.type == CorticalEventType.DONE:
+                        content = event.response
+                    elif event.type == CorticalEventType.ERROR:
+                        logger.error(f"Error: {event.content}")
+            else:
+                payload = CorticalRequest(
+                    config=brain_config_file, sensory=sensory_data, agent_id=agent_id
+                ).model_dump(mode="json")
+                response = await client.post(
+                    api_url, json=payload, timeout=90.0
+                )  # Send sensory data to brain API
+                if response.status_code == 200:
+                    async for line in response.aiter_lines():
+                        if line:
+                            content = CorticalResponse().model_validate_json(line)
+                else:
+                    logger.error(f"Error: {response.status_code}")
+
+            if content:
                 output_response(content, logger)
                 if content.action:
                     scene.process_action(content.action)
-            else:
-                logger.error(f"Error: {response.status_code}")
 
             await asyncio.sleep(1)  # Sleep to simulate time passing between actions
 
@@ -178,6 +203,12 @@ async def main():
         default="./config/scenes/default.json",
         help="Path to the scene configuration file.",
     )
+    parser.add_argument(
+        "--session",
+        dest="use_session",
+        action="store_true",
+        help="Keep a WebSocket session with the brain API instead of a request per tick.",
+    )
     parser.add_argument(
         "--speech",
         dest="enable_speech",
@@ -206,6 +237,7 @@ async def main():
         args.enable_speech,
         args.neuralyzer,
         args.pretty,
+        args.use_session,
     )
 
 
@@ -0,0 +1,80 @@
+"""
+CLI to compare the throughput, in clips per second, of classifying clips through the Brain
+API one request at a time versus in a single /auditory/batch request.
+"""
+
+import argparse
+import base64
+import io
+import os
+import time
+import wave
+
+import httpx
+
+
+def make_clips(
+    count: int, seconds: float = 1.0, sample_rate: int = 44100
+) -> list[bytes]:
+    """
+    Renders clips of stereo noise at a typical capture sample rate, so each is normalised.
+
+    Args:
+        count (int): Number of clips.
+        seconds (float): Length of each clip in seconds.
+        sample_rate (int): Sample rate of each clip.
+
+    Returns:
+        list[bytes]: The WAV files.
+    """
+    clips = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(os.urandom(int(sample_rate * seconds) * 4))
+        clips.append(buffer.getvalue())
+    return clips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        default=f'{os.environ.get("BRAIN_PROTOCOL", "http")}://{os.environ.get("BRAIN_API_HOST", "localhost")}:{os.environ.get("BRAIN_API_PORT", "8000")}',
+        help="Base URL of the Brain API.",
+    )
+    parser.add_argument(
+        "--clips", type=int, default=16, help="Clips to classify in each mode."
+    )
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url, timeout=600.0) as client:
+        try:
+            started = time.perf_counter()
+            for clip in make_clips(args.clips):
+                client.post("/auditory/upload", content=clip).read()
+            sequential = args.clips / (time.perf_counter() - started)
+
+            clips = [
+                {
+                    "agent_id": str(index),
+                    "audio": base64.b64encode(clip).decode("ascii"),
+                }
+                for index, clip in enumerate(make_clips(args.clips))
+            ]
+            started = time.perf_counter()
+            client.post("/auditory/batch", json={"clips": clips}).read()
+            batched = args.clips / (time.perf_counter() - started)
+        except httpx.TransportError:
+            print(f"Brain API unreachable at {args.url}")
+            return
+
+    print(f"sequential: {sequential:.2f} clips/s")
+    print(f"   batched: {batched:.2f} clips/s ({batched / sequential:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+CLI to measure the cold import time of a module, such as the Brain API, and list the
+slowest modules it imports, to catch startup regressions.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import_time(module: str) -> list[tuple[str, int, int]]:
+    """
+    Imports a module in a fresh interpreter with `-X importtime`.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        list[tuple[str, int, int]]: Each imported module with its cumulative time in
+        microseconds and its nesting depth.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            timings.append((name, int(cumulative), len(indent) // 2))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", nargs="?", default="aiden.api.brain")
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of slowest modules to list."
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=2,
+        help="Only list modules imported at most this many levels deep.",
+    )
+    args = parser.parse_args()
+
+    timings = measure_import_time(args.module)
+    total = next(
+        cumulative for name, cumulative, _ in reversed(timings) if name == args.module
+    )
+    print(f"Importing {args.module} took {total / 1000:.1f}ms")
+
+    slowest = sorted(
+        (timing for timing in timings if timing[2] <= args.depth),
+        key=lambda timing: timing[1],
+        reverse=True,
+    )
+    for name, cumulative, depth in slowest[: args.top]:
+        print(f"{cumulative / 1000:>10.1f}ms  {'  ' * depth}{name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+CLI to compare the throughput, in frames per second, of describing frames through the Brain
+API one request at a time versus in a single /occipital/batch request.
+"""
+
+import argparse
+import base64
+import io
+import os
+import time
+
+import httpx
+from PIL import Image
+
+
+def make_frames(count: int, width: int = 640, height: int = 480) -> list[bytes]:
+    """
+    Renders distinct JPEG frames of noise, so none are answered from the description cache.
+
+    Args:
+        count (int): Number of frames.
+        width (int): Width of each frame in pixels.
+        height (int): Height of each frame in pixels.
+
+    Returns:
+        list[bytes]: The JPEG files.
+    """
+    frames = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        Image.effect_noise((width, height), 64).convert("RGB").save(
+            buffer, format="JPEG", quality=85
+        )
+        frames.append(buffer.getvalue())
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        default=f'{os.environ.get("BRAIN_PROTOCOL", "http")}://{os.environ.get("BRAIN_API_HOST", "localhost")}:{os.environ.get("BRAIN_API_PORT", "8000")}',
+        help="Base URL of the Brain API.",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=16, help="Frames to describe in each mode."
+    )
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url, timeout=600.0) as client:
+        try:
+            started = time.perf_counter()
+            for frame in make_frames(args.frames):
+                client.post("/occipital/upload", content=frame).read()
+            sequential = args.frames / (time.perf_counter() - started)
+
+            images = [
+                {
+                    "agent_id": str(index),
+                    "image": base64.b64encode(frame).decode("ascii"),
+                }
+                for index, frame in enumerate(make_frames(args.frames))
+            ]
+            started = time.perf_counter()
+            client.post("/occipital/batch", json={"images": images}).read()
+            batched = args.frames / (time.perf_counter() - started)
+        except httpx.TransportError:
+            print(f"Brain API unreachable at {args.url}")
+            return
+
+    print(f"sequential: {sequential:.2f} frames/s")
+    print(f"   batched: {batched:.2f} frames/s ({batched / sequential:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
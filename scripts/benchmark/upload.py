@@ -0,0 +1,152 @@
+"""
+CLI to compare the payload size and latency of sending images and audio to the Brain API
+as base64 inside JSON versus as raw uploads, for typical 640x480 frames and 1-5s clips.
+"""
+
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import statistics
+import struct
+import time
+import wave
+
+import httpx
+from PIL import Image
+
+
+def make_frame(width: int = 640, height: int = 480) -> bytes:
+    """
+    Renders a JPEG frame with gradients and a pattern, which compresses like a rendered scene.
+
+    Args:
+        width (int): Width of the frame in pixels.
+        height (int): Height of the frame in pixels.
+
+    Returns:
+        bytes: The JPEG file.
+    """
+    image = Image.new("RGB", (width, height))
+    image.putdata(
+        [
+            ((x * 255) // width, (y * 255) // height, ((x ^ y) * 7) % 256)
+            for y in range(height)
+            for x in range(width)
+        ]
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def make_clip(seconds: float, sample_rate: int) -> bytes:
+    """
+    Synthesises a mono 16-bit WAV clip of a tone.
+
+    Args:
+        seconds (float): Duration of the clip.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        bytes: The WAV file.
+    """
+    samples = int(seconds * sample_rate)
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)))
+        for i in range(samples)
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def time_requests(
+    client: httpx.Client, requests: int, **kwargs
+) -> tuple[float, float] | None:
+    """
+    Sends the same request several times, reading each response fully.
+
+    Args:
+        client (httpx.Client): Client for the Brain API.
+        requests (int): Number of requests to send.
+        **kwargs: Arguments of the request, e.g. the URL and body.
+
+    Returns:
+        tuple[float, float] | None: The median and maximum latency in milliseconds, or
+        None if the Brain API is unreachable.
+    """
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            client.post(**kwargs).read()
+        except httpx.TransportError:
+            return None
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies), max(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        default=f'{os.environ.get("BRAIN_PROTOCOL", "http")}://{os.environ.get("BRAIN_API_HOST", "localhost")}:{os.environ.get("BRAIN_API_PORT", "8000")}',
+        help="Base URL of the Brain API.",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=10, help="Requests to time per payload."
+    )
+    parser.add_argument(
+        "--sample-rate", type=int, default=44100, help="Sample rate of the clips."
+    )
+    parser.add_argument(
+        "--sizes-only",
+        action="store_true",
+        help="Only compare payload sizes, without calling the Brain API.",
+    )
+    args = parser.parse_args()
+
+    payloads = [("frame 640x480", "occipital", "image", make_frame())]
+    payloads += [
+        (f"clip {seconds}s", "auditory", "audio", make_clip(seconds, args.sample_rate))
+        for seconds in (1, 3, 5)
+    ]
+
+    with httpx.Client(base_url=args.url, timeout=120.0) as client:
+        for name, region, field, raw in payloads:
+            body = json.dumps({field: base64.b64encode(raw).decode("ascii")}).encode()
+            print(
+                f"{name}: raw {len(raw) / 1024:.1f}KiB, JSON {len(body) / 1024:.1f}KiB "
+                f"(+{(len(body) / len(raw) - 1) * 100:.0f}%)"
+            )
+            if args.sizes_only:
+                continue
+
+            for variant, kwargs in (
+                (
+                    "JSON",
+                    {
+                        "url": f"/{region}/",
+                        "content": body,
+                        "headers": {"Content-Type": "application/json"},
+                    },
+                ),
+                ("raw", {"url": f"/{region}/upload", "content": raw}),
+            ):
+                result = time_requests(client, args.requests, **kwargs)
+                if result is None:
+                    print(f"  Brain API unreachable at {args.url}")
+                    break
+                median, maximum = result
+                print(f"  {variant:>4}: median {median:.1f}ms, max {maximum:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+CLI to measure how much preprocessing camera frames saves on the end-to-end latency of the
+vision model, for frames at typical render texture resolutions.
+"""
+
+import argparse
+import base64
+import io
+import os
+import statistics
+import time
+
+import httpx
+from PIL import Image
+
+from aiden.app.image import VISION_IMAGE_QUALITY, VISION_IMAGE_SIZE, preprocess_image
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def make_frame(width: int, height: int) -> bytes:
+    """
+    Renders a JPEG frame with gradients, which compresses like a rendered scene.
+
+    Args:
+        width (int): Width of the frame in pixels.
+        height (int): Height of the frame in pixels.
+
+    Returns:
+        bytes: The JPEG file.
+    """
+    horizontal = Image.linear_gradient("L").rotate(90).resize((width, height))
+    vertical = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge(
+        "RGB", (horizontal, vertical, Image.effect_noise((width, height), 64))
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def time_description(
+    client: httpx.Client, model: str, image: bytes, requests: int
+) -> float | None:
+    """
+    Asks the vision model to describe an image several times.
+
+    Args:
+        client (httpx.Client): Client for the vision API.
+        model (str): Name of the vision model.
+        image (bytes): The image file.
+        requests (int): Number of requests to send.
+
+    Returns:
+        float | None: The median latency in milliseconds, or None if the vision API is
+        unreachable.
+    """
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            client.post(
+                "/api/generate",
+                json={
+                    "model": model,
+                    "prompt": "Describe the image.",
+                    "images": [base64.b64encode(image).decode("ascii")],
+                    "stream": False,
+                    "options": {"num_predict": 32},
+                },
+            ).raise_for_status()
+        except httpx.TransportError:
+            return None
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        default=f'{os.environ.get("VISION_API_PROTOCOL", "http")}://{os.environ.get("VISION_API_HOST", "localhost")}:{os.environ.get("VISION_API_PORT", "11435")}',
+        help="Base URL of the vision API.",
+    )
+    parser.add_argument(
+        "--model",
+        default=os.environ.get("VISION_MODEL", "bakllava"),
+        help="Name of the vision model.",
+    )
+    parser.add_argument(
+        "--size", type=int, default=VISION_IMAGE_SIZE, help="Longest side to resize to."
+    )
+    parser.add_argument(
+        "--quality", type=int, default=VISION_IMAGE_QUALITY, help="JPEG quality."
+    )
+    parser.add_argument(
+        "--requests", type=int, default=5, help="Requests to time per image."
+    )
+    parser.add_argument(
+        "--preprocess-only",
+        action="store_true",
+        help="Only time preprocessing, without calling the vision API.",
+    )
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url, timeout=300.0) as client:
+        for width, height in RESOLUTIONS:
+            frame = make_frame(width, height)
+
+            durations = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                preprocessed = preprocess_image(frame, args.size, args.quality)
+                durations.append((time.perf_counter() - started) * 1000)
+            print(
+                f"frame {width}x{height}: {len(frame) / 1024:.1f}KiB -> "
+                f"{len(preprocessed) / 1024:.1f}KiB, preprocessing median "
+                f"{statistics.median(durations):.1f}ms"
+            )
+            if args.preprocess_only:
+                continue
+
+            original = time_description(client, args.model, frame, args.requests)
+            resized = time_description(client, args.model, preprocessed, args.requests)
+            if original is None or resized is None:
+                print(f"  Vision API unreachable at {args.url}")
+                break
+            print(
+                f"  vision median: original {original:.1f}ms, preprocessed "
+                f"{resized + statistics.median(durations):.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,59 @@
+import asyncio
+import gc
+import inspect
 import os
 from testcontainers.core.docker_client import DockerClient
 from testcontainers.ollama import OllamaContainer
 from testcontainers.redis import RedisContainer
+from aiden.app.brain.cognition import resilience
+from aiden.app.monitor import EventLoopWatchdog
 from aiden.models.brain import BrainConfig
 
 
 import pytest
+import pytest_asyncio
+
+
+@pytest.fixture(autouse=True)
+def reset_resilience_registries(monkeypatch):
+    """
+    Gives each test its own circuit breakers and latency trackers, so failures and
+    latencies recorded against a backend by one test do not leak into the next.
+    """
+    monkeypatch.setattr(resilience, "_circuit_breakers", {})
+    monkeypatch.setattr(resilience, "_latency_trackers", {})
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fail_on_event_loop_blocking(request):
+    """
+    Opt-in test mode, enabled by setting `EVENT_LOOP_BLOCK_FAIL_MS`, failing any test
+    which blocks the event loop for longer than the given milliseconds.
+
+    Only async tests are watched, as the loop does not run during sync tests.
+    """
+    threshold_ms = os.environ.get("EVENT_LOOP_BLOCK_FAIL_MS")
+    if (
+        not threshold_ms
+        or not inspect.iscoroutinefunction(request.function)
+        or request.node.get_closest_marker("allow_event_loop_blocking")
+    ):
+        yield
+        return
+
+    # Collect the garbage left by earlier tests first, so a full collection of it is not
+    # charged to this test
+    gc.collect()
+    watchdog = EventLoopWatchdog(threshold=float(threshold_ms) / 1000)
+    watchdog.start(asyncio.get_running_loop())
+    yield
+    watchdog.stop()
+
+    if watchdog.incidents:
+        incident = watchdog.incidents[0]
+        pytest.fail(
+            f"Event loop blocked for {incident.duration_ms}ms:\n{incident.stack}"
+        )
 
 
 @pytest.fixture(scope="function")
@@ -23,10 +71,15 @@ def cognitive_api():
     """
     Connect to Ollama container for Cognitive API.
     """
-    base_image = os.environ.get("TESTCONTAINERS_OLLAMA_IMAGE", "ollama/ollama:0.4.7")
+    base_image = os.environ.get("TESTCONTAINERS_OLLAMA_IMAGE", "ollama/ollama:0.5.7")
     target_model = os.environ.get("COGNITIVE_MODEL", "llama3.2:1b")
     target_model_formatted = target_model.replace(":", "_")
-    target_image = f"testcontainers_ollama/{target_model_formatted}"
+    # Tag the cached image with the base image's version, so a new version is not
+    # shadowed by a cache of an older one
+    base_repository, _, base_tag = base_image.rpartition(":")
+    if not base_repository or "/" in base_tag:
+        base_tag = "latest"
+    target_image = f"testcontainers_ollama/{target_model_formatted}:{base_tag}"
 
     def pull_model(ollama: OllamaContainer, target_model: str) -> None:
         if target_model not in [e["name"] for e in ollama.list_models()]:
@@ -5,7 +5,7 @@ from fastapi.encoders import jsonable_encoder
 from langchain_core.load import dumps
 from langchain_core.messages import AIMessage, HumanMessage
 
-from aiden.app.brain.memory.hippocampus import MemoryManager
+from aiden.app.brain.memory.hippocampus import BatchMemoryManager, MemoryManager
 
 
 def test_update_memory(redis_client):
@@ -121,3 +121,29 @@ def test_dont_consolidate_memory(monkeypatch, redis_client):
     memory = memory_manager.read_memory("0")
     assert memory == messages
     # TODO: Check consolidated memory not in long-term memory
+
+
+def test_batch_memory_manager(redis_client):
+    # Given
+    messages = [
+        HumanMessage(content="User message 1"),
+        AIMessage(content="Assistant message 1"),
+    ]
+    MemoryManager(redis_client=redis_client).update_memory("0", messages)
+    memory_manager = BatchMemoryManager(redis_client=redis_client, agent_ids=["0", "1"])
+
+    # When
+    memory_manager.load()
+    memory_manager.update_memory("1", messages)
+
+    # Then
+    assert memory_manager.read_memory("0") == messages
+    assert memory_manager.read_memory("1") == messages
+    assert redis_client.get("agent:1:memory") is None
+
+    # When
+    memory_manager.flush()
+
+    # Then
+    assert redis_client.get("agent:1:memory") == dumps(messages)
+    assert redis_client.ttl("agent:1:memory") > 0
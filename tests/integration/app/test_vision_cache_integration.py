@@ -0,0 +1,20 @@
+import pytest
+
+from aiden.app.vision_cache import DescriptionCache
+
+
+@pytest.mark.asyncio
+async def test_description_cache_shared_through_redis(redis_client):
+    # Given
+    writer = DescriptionCache(max_distance=4, redis_client=redis_client)
+    reader = DescriptionCache(max_distance=4, redis_client=redis_client)
+    image_hash = 0x0123456789ABCDEF
+
+    # When
+    await writer.set("Describe the image.", image_hash, "A park.")
+
+    # Then
+    assert await reader.get("Describe the image.", image_hash) == "A park."
+    assert await reader.get("Describe the image.", image_hash ^ 0b1011) == "A park."
+    assert await reader.get("Describe the image.", image_hash ^ 0xFFFF) is None
+    assert await reader.get("Describe the people.", image_hash) is None
@@ -1,8 +1,27 @@
 import json
+import subprocess
+import sys
+
 import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
 from httpx import AsyncClient, Response
+from PIL import Image
+from starlette.websockets import WebSocketDisconnect
 
-from aiden.api.brain import app
+from aiden.api.brain import _parse_form_data, app
+from aiden.app.activity_gate import ActivityGate
+from aiden.app.frame_gate import FrameGate
+from aiden.app.warmup import Warmup
+from aiden.models.brain import (
+    AuditoryEvent,
+    AuditoryEventType,
+    AuditoryResult,
+    AuditoryStreamStart,
+    CorticalEvent,
+    CorticalEventType,
+    CorticalSessionStart,
+)
 
 # Sample sensory data for testing
 sensory_data = {
@@ -10,6 +29,8 @@ sensory_data = {
     "auditory": "I hear a bird chirping.",
 }
 
+sensory_data_batch = {"vision": [{"content": "I see a tree and a car."}]}
+
 # Simulated base64 image string for testing
 base64_image = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD..."
 
@@ -131,3 +152,507 @@ async def test_integration_with_mock_ollama(mocker):
             mock_response_content["message"]["content"]
             in response_json["message"]["content"]
         )
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        # Make a request so that the endpoint metrics have a sample
+        await client.get("/metrics")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE aiden_http_requests_total counter" in response.text
+    assert (
+        'aiden_http_requests_total{method="GET",path="/metrics",status="200"}'
+        in response.text
+    )
+    assert "# TYPE aiden_stage_latency_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_disabled_without_admin_token(monkeypatch):
+    monkeypatch.delenv("BRAIN_ADMIN_TOKEN", raising=False)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/admin/profile", params={"seconds": 0.01})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint(monkeypatch):
+    monkeypatch.setenv("BRAIN_ADMIN_TOKEN", "secret")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        unauthorized = await client.post(
+            "/admin/profile",
+            params={"seconds": 0.01},
+            headers={"Authorization": "Bearer wrong"},
+        )
+        response = await client.post(
+            "/admin/profile",
+            params={"seconds": 0.05},
+            headers={"Authorization": "Bearer secret"},
+        )
+
+    assert unauthorized.status_code == 401
+    assert response.status_code == 200
+    assert "MainThread;" in response.text
+
+
+@pytest.mark.allow_event_loop_blocking
+def test_brain_api_import_defers_heavy_dependencies():
+    # Import in a fresh interpreter, as other tests have already loaded the brain regions
+    code = (
+        "import sys, aiden.api.brain; "
+        "print(','.join(m for m in ('langgraph', 'langchain_ollama', 'aiohttp', "
+        "'chromadb') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint():
+    warmup = Warmup(configs=[])
+    app.state.warmup = warmup
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            warming_up = await client.get("/ready")
+            warmup.ready = True
+            ready = await client.get("/ready")
+    finally:
+        del app.state.warmup
+
+    assert warming_up.status_code == 503
+    assert warming_up.json()["ready"] is False
+    assert ready.status_code == 200
+    assert ready.json()["ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_cortical_batch_endpoint(mocker):
+    async def process_cortical_batch(request):
+        for cortical_request in request.requests:
+            yield json.dumps({"agent_id": cortical_request.agent_id}) + "\n"
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_cortical_batch",
+        side_effect=process_cortical_batch,
+    )
+    requests = [
+        {"agent_id": agent_id, "sensory": sensory_data_batch} for agent_id in ["1", "2"]
+    ]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/cortical/batch", json={"requests": requests})
+        duplicate = await client.post(
+            "/cortical/batch", json={"requests": requests + requests[:1]}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["agent_id"] for line in response.text.splitlines()] == [
+        "1",
+        "2",
+    ]
+    assert duplicate.status_code == 422
+
+
+def test_cortical_session_endpoint(mocker):
+    async def process_cortical_session(start, receive_delta, send_event):
+        while True:
+            delta = await receive_delta()
+            await send_event(
+                CorticalEvent(
+                    type=CorticalEventType.DONE,
+                    content=f"{start.agent_id}: {delta.vision[0].content}",
+                )
+            )
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_cortical_session",
+        side_effect=process_cortical_session,
+    )
+
+    with TestClient(app).websocket_connect("/cortical/session") as websocket:
+        websocket.send_text(CorticalSessionStart(agent_id="1").model_dump_json())
+        websocket.send_json({"vision": [{"content": "I see a tree."}]})
+        event = CorticalEvent.model_validate_json(websocket.receive_text())
+
+    assert event.type == CorticalEventType.DONE
+    assert event.content == "1: I see a tree."
+
+
+def test_auditory_stream_endpoint(mocker):
+    async def process_auditory_stream(start, receive_chunk, send_event):
+        for _ in range(2):
+            try:
+                chunk = await receive_chunk()
+            except ValueError as e:
+                await send_event(
+                    AuditoryEvent(type=AuditoryEventType.ERROR, content=str(e))
+                )
+                continue
+            await send_event(
+                AuditoryEvent(
+                    type=AuditoryEventType.RESULT,
+                    result=AuditoryResult(class_name=start.agent_id, score=len(chunk)),
+                )
+            )
+
+    mocker.patch(
+        "aiden.app.brain.auditory.process_auditory_stream",
+        side_effect=process_auditory_stream,
+    )
+
+    with TestClient(app).websocket_connect("/auditory/stream") as websocket:
+        websocket.send_text(AuditoryStreamStart(agent_id="1").model_dump_json())
+        websocket.send_bytes(b"\x00" * 4)
+        result = AuditoryEvent.model_validate_json(websocket.receive_text())
+        websocket.send_text("not audio")
+        error = AuditoryEvent.model_validate_json(websocket.receive_text())
+
+    assert result.result == AuditoryResult(class_name="1", score=4)
+    assert error.type == AuditoryEventType.ERROR
+
+
+def test_auditory_stream_endpoint_closes_when_stream_fails(mocker):
+    async def process_auditory_stream(start, receive_chunk, send_event):
+        await receive_chunk()
+        raise ConnectionError("Cannot send the result")
+
+    mocker.patch(
+        "aiden.app.brain.auditory.process_auditory_stream",
+        side_effect=process_auditory_stream,
+    )
+
+    with TestClient(app).websocket_connect("/auditory/stream") as websocket:
+        websocket.send_text(AuditoryStreamStart(agent_id="1").model_dump_json())
+        websocket.send_bytes(b"\x00" * 4)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_text()
+
+    assert exc_info.value.code == 1011
+
+
+def test_cortical_session_endpoint_rejects_invalid_start():
+    with TestClient(app).websocket_connect("/cortical/session") as websocket:
+        websocket.send_json({"config": "./config/brain/default.json"})
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_text()
+
+    assert exc_info.value.code == 1008
+
+
+def test_cortical_session_endpoint_closes_when_session_fails(mocker):
+    async def process_cortical_session(start, receive_delta, send_event):
+        await receive_delta()
+        raise ConnectionError("Redis is down")
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_cortical_session",
+        side_effect=process_cortical_session,
+    )
+
+    with TestClient(app).websocket_connect("/cortical/session") as websocket:
+        websocket.send_text(CorticalSessionStart(agent_id="1").model_dump_json())
+        websocket.send_json({"vision": [{"content": "I see a tree."}]})
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_text()
+
+    assert exc_info.value.code == 1011
+    assert exc_info.value.reason == "Redis is down"
+
+
+@pytest.mark.asyncio
+async def test_occipital_upload_endpoint(mocker):
+    async def process_occipital_upload(
+        image, config, latency_budget_ms, agent_id, frame_gate_threshold
+    ):
+        yield f"{len(image)} bytes with {config} in {latency_budget_ms}ms"
+
+    mocker.patch(
+        "aiden.app.brain.occipital.process_occipital_upload",
+        side_effect=process_occipital_upload,
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/occipital/upload",
+            params={"config": "config.json", "latency_budget_ms": 500},
+            content=b"\xff\xd8\xff\xe0",
+            headers={"Content-Type": "image/jpeg"},
+        )
+        empty = await client.post("/occipital/upload", content=b"")
+
+    assert response.status_code == 200
+    assert response.text == "4 bytes with config.json in 500ms"
+    assert empty.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_occipital_batch_endpoint(mocker):
+    async def process_occipital_batch(request):
+        for image in request.images:
+            yield (
+                json.dumps({"agent_id": image.agent_id, "camera": image.camera}) + "\n"
+            )
+
+    mocker.patch(
+        "aiden.app.brain.occipital.process_occipital_batch",
+        side_effect=process_occipital_batch,
+    )
+    images = [
+        {"agent_id": "1", "camera": camera, "image": base64_image}
+        for camera in ["front", "mirror"]
+    ]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/occipital/batch", json={"images": images})
+        duplicate = await client.post(
+            "/occipital/batch", json={"images": images + images[:1]}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["camera"] for line in response.text.splitlines()] == [
+        "front",
+        "mirror",
+    ]
+    assert duplicate.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_occipital_stats_endpoint(mocker):
+    frame_gate = FrameGate()
+    frame_gate.check("0", Image.new("L", (64, 48)))
+    mocker.patch("aiden.app.frame_gate.get_frame_gate", return_value=frame_gate)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/occipital/stats")
+
+    assert response.status_code == 200
+    assert response.json()["agents"] == [
+        {"agent_id": "0", "frames": 1, "skipped": 0, "skip_ratio": 0.0}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_auditory_batch_endpoint(mocker):
+    async def process_auditory_batch(request):
+        for clip in request.clips:
+            yield (
+                json.dumps({"agent_id": clip.agent_id, "microphone": clip.microphone})
+                + "\n"
+            )
+
+    mocker.patch(
+        "aiden.app.brain.auditory.process_auditory_batch",
+        side_effect=process_auditory_batch,
+    )
+    clips = [
+        {"agent_id": "1", "microphone": microphone, "audio": "UklGRg=="}
+        for microphone in ["left", "right"]
+    ]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/auditory/batch", json={"clips": clips})
+        duplicate = await client.post(
+            "/auditory/batch", json={"clips": clips + clips[:1]}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["microphone"] for line in response.text.splitlines()] == [
+        "left",
+        "right",
+    ]
+    assert duplicate.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_auditory_language_endpoint(mocker):
+    async def process_auditory_language(request):
+        yield (
+            json.dumps({"type": "transcript", "content": request.cortical.agent_id})
+            + "\n"
+        )
+
+    mocker.patch(
+        "aiden.app.brain.auditory.process_auditory_language",
+        side_effect=process_auditory_language,
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/auditory/language",
+            json={
+                "audio": "UklGRg==",
+                "cortical": {"agent_id": "1", "sensory": sensory_data_batch},
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert json.loads(response.text) == {"type": "transcript", "content": "1"}
+
+
+@pytest.mark.asyncio
+async def test_auditory_stats_endpoint(mocker):
+    activity_gate = ActivityGate()
+    activity_gate.check([])
+    mocker.patch(
+        "aiden.app.activity_gate.get_activity_gate", return_value=activity_gate
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/auditory/stats")
+
+    assert response.status_code == 200
+    assert response.json()["activity_gate"] == {
+        "clips": 1,
+        "skipped": 1,
+        "skip_ratio": 1.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoints_reject_large_uploads(monkeypatch):
+    monkeypatch.setattr("aiden.api.brain.MAX_UPLOAD_BYTES", 4)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        occipital = await client.post("/occipital/upload", content=b"\x00" * 5)
+        auditory = await client.post("/auditory/upload", content=b"\x00" * 5)
+
+    assert occipital.status_code == 413
+    assert auditory.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoints_reject_invalid_content_length():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        responses = [
+            await client.post(
+                path, content=b"\x00", headers={"Content-Length": "one byte"}
+            )
+            for path in ("/occipital/upload", "/auditory/upload", "/perceive/upload")
+        ]
+
+    assert [response.status_code for response in responses] == [400, 400, 400]
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoints_reject_large_chunked_uploads(monkeypatch):
+    monkeypatch.setattr("aiden.api.brain.MAX_UPLOAD_BYTES", 16)
+
+    async def upload():
+        # A chunked MP3 upload, without a declared size
+        yield b"\xff\xfb\x90\x00" + b"\x00" * 8
+        yield b"\x00" * 8
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        occipital = await client.post("/occipital/upload", content=upload())
+        auditory = await client.post("/auditory/upload", content=upload())
+
+    assert occipital.status_code == 413
+    assert auditory.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_vocal_endpoint(mocker):
+    async def process_vocal(request):
+        yield json.dumps({"type": "audio", "index": 0, "content": request.text}) + "\n"
+
+    mocker.patch("aiden.app.brain.vocal.process_vocal", side_effect=process_vocal)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/vocal/", json={"text": "Hello."})
+        missing = await client.post("/vocal/", json={})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert json.loads(response.text)["content"] == "Hello."
+    assert missing.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_perceive_endpoint(mocker):
+    async def process_perception(request):
+        yield json.dumps({"type": "vision", "content": request.image}) + "\n"
+
+    mocker.patch(
+        "aiden.app.brain.perception.process_perception",
+        side_effect=process_perception,
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/perceive",
+            json={
+                "cortical": {"agent_id": "1", "sensory": sensory_data_batch},
+                "image": base64_image,
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert json.loads(response.text)["content"] == base64_image
+
+
+def test_parse_form_data_slices_parts():
+    body = bytearray(
+        b"preamble\r\n--b\r\n"
+        b'Content-Disposition: form-data; name="image"\r\n\r\n\r\n--image\r\n'
+        b"\r\n--b\r\n"
+        b'Content-Disposition: form-data; name="audio"\r\n\r\naudio'
+        b"\r\n--b--\r\n"
+    )
+
+    parts = _parse_form_data(body, "multipart/form-data; boundary=b")
+
+    assert parts == {"image": b"\r\n--image\r\n", "audio": b"audio"}
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_form_data(b"--b\r\nno headers end", "multipart/form-data; boundary=b")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_perceive_upload_endpoint(mocker):
+    async def process_perception(request, image, audio):
+        yield json.dumps({"agent_id": request.cortical.agent_id}) + "\n"
+        yield json.dumps({"image": image.decode(), "audio": audio}) + "\n"
+
+    mocker.patch(
+        "aiden.app.brain.perception.process_perception",
+        side_effect=process_perception,
+    )
+    perception_request = json.dumps(
+        {"cortical": {"agent_id": "1", "sensory": sensory_data_batch}}
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/perceive/upload",
+            data={"request": perception_request},
+            files={"image": ("frame.jpg", b"\r\nimage\r\n", "image/jpeg")},
+        )
+        invalid = await client.post(
+            "/perceive/upload", files={"request": ("request.json", b"{}")}
+        )
+        not_multipart = await client.post("/perceive/upload", content=b"image")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"agent_id": "1"},
+        {"image": "\r\nimage\r\n", "audio": None},
+    ]
+    assert invalid.status_code == 422
+    assert not_multipart.status_code == 415
@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_ollama import ChatOllama
 
+from aiden.app.brain.cognition import resilience
 from aiden.app.brain.cognition.broca import process_broca
 
 
@@ -12,10 +16,11 @@ async def test_process_broca(mocker, brain_config):
 
     # Mock ChatOllama class to return a predefined response
     mock_ollama = mocker.patch(
-        "aiden.app.brain.cognition.broca.ChatOllama", autospec=True
+        "aiden.app.brain.cognition.broca.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
     )
     instance = mock_ollama.return_value
-    instance.invoke.return_value = mock_response
+    instance.ainvoke.return_value = mock_response
 
     # Simulate the function call with both sensory input and language input
     sensory_input = "You see a friendly face."
@@ -29,4 +34,73 @@ async def test_process_broca(mocker, brain_config):
     ), f"Expected: 'I am well, thank you.', but got: {response}"
 
     # Check that the invoke method was called with the correct combined input
-    instance.invoke.assert_called_once()
+    instance.ainvoke.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_broca_streams_tokens(mocker, brain_config):
+    async def astream(messages):
+        for token in ["I am", " well."]:
+            yield AIMessageChunk(content=token)
+
+    mock_ollama = mocker.patch("aiden.app.brain.cognition.broca.ChatOllama")
+    mock_ollama.return_value.astream = astream
+
+    tokens = []
+    response = await process_broca(
+        "You see a friendly face.",
+        brain_config,
+        "How are you today?",
+        on_token=tokens.append,
+    )
+
+    # Tokens are passed on as they are generated, and the full response returned
+    assert tokens == ["I am", " well."]
+    assert response == "I am well."
+    mock_ollama.return_value.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_broca_speaks_the_returned_response(
+    mocker, monkeypatch, brain_config
+):
+    monkeypatch.setattr(resilience, "HEDGE_DEFAULT_DELAY", 0.05)
+    mocker.patch(
+        "aiden.app.brain.cognition.broca.COGNITIVE_API_URL_BASE", "http://primary"
+    )
+    mocker.patch(
+        "aiden.app.brain.cognition.broca.COGNITIVE_API_HEDGE_URL_BASES",
+        ["http://hedge"],
+    )
+
+    def chat_ollama(base_url, **kwargs):
+        async def astream(messages):
+            if base_url == "http://hedge":
+                yield AIMessageChunk(content="Goodbye.")
+                return
+            # The primary starts speaking, then stalls past the hedge delay
+            yield AIMessageChunk(content="I am")
+            await asyncio.sleep(0.2)
+            yield AIMessageChunk(content=" well.")
+
+        llm = mocker.MagicMock(spec=ChatOllama)
+        llm.astream = astream
+        return llm
+
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.cognition.broca.ChatOllama", side_effect=chat_ollama
+    )
+
+    tokens = []
+    response = await process_broca(
+        "You see a friendly face.",
+        brain_config,
+        "How are you today?",
+        on_token=tokens.append,
+    )
+
+    # A hedge finishing first would return a response other than the one spoken
+    assert "".join(tokens) == response == "I am well."
+    assert [call.kwargs["base_url"] for call in mock_ollama.call_args_list] == [
+        "http://primary"
+    ]
@@ -1,6 +1,11 @@
 import pytest
 from langchain_core.messages import AIMessage
-from aiden.app.brain.cognition.prefrontal import process_prefrontal
+from langchain_ollama import ChatOllama
+from aiden.app.brain.cognition.prefrontal import (
+    _decision_schema,
+    _parse_decision,
+    process_prefrontal,
+)
 from aiden.models.brain import Action
 
 
@@ -27,25 +32,16 @@ from aiden.models.brain import Action
 async def test_process_prefrontal_decision_with_actions(
     mocker, brain_config, actions, expected_decision, expected_response
 ):
-    # Create a mock response for the ChatOllama
-    mock_response = AIMessage(
-        content="",
-        id="some_id",
-        tool_calls=[
-            {
-                "name": "map_decision_to_action",
-                "args": {"action": expected_decision},
-                "id": "some_id",
-            }
-        ],
-    )
+    # Create a mock response for the ChatOllama, constrained to the decision schema
+    mock_response = AIMessage(content=f'{{"action": "{expected_decision}"}}')
 
     # Mock ChatOllama class to return a predefined response
     mock_ollama = mocker.patch(
-        "aiden.app.brain.cognition.prefrontal.ChatOllama.bind_tools", autospec=True
+        "aiden.app.brain.cognition.prefrontal.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
     )
     instance = mock_ollama.return_value
-    instance.invoke.return_value = mock_response
+    instance.ainvoke = mocker.AsyncMock(return_value=mock_response)
 
     # Simulate the function call
     response = await process_prefrontal(
@@ -56,7 +52,14 @@ async def test_process_prefrontal_decision_with_actions(
     assert response == expected_response
 
     # Check that the invoke method was called correctly
-    instance.invoke.assert_called_once()
+    instance.ainvoke.assert_called_once()
+
+    # Check that the output was constrained to the actions available
+    schema = mock_ollama.call_args.kwargs["format"]
+    expected_names = [action.name for action in actions]
+    if "none" not in expected_names:
+        expected_names.append("none")
+    assert schema["properties"]["action"]["enum"] == expected_names
 
 
 @pytest.mark.asyncio
@@ -71,3 +74,26 @@ async def test_process_prefrontal_decision_without_actions(brain_config):
 
     # Check if the response matches the expected action
     assert response is None
+
+
+def test_decision_schema_is_cached_per_action_set():
+    schema = _decision_schema(("move forward", "none"))
+
+    assert _decision_schema(("move forward", "none")) is schema
+    assert _decision_schema(("turn left", "none")) is not schema
+
+
+@pytest.mark.parametrize(
+    "content, expected_action",
+    [
+        ('{"action": "turn left"}', "turn left"),
+        # Backends without structured outputs may answer in prose
+        ("I will turn left now.", "turn left"),
+        ('{"action": "fly away"}', "none"),
+        ("", "none"),
+    ],
+)
+def test_parse_decision(content, expected_action):
+    actions = ("turn left", "turn right", "none")
+
+    assert _parse_decision(content, actions) == expected_action
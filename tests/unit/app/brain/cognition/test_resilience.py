@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from aiden.app.brain.cognition import resilience
+from aiden.app.brain.cognition.resilience import (
+    BackendUnavailableError,
+    CircuitBreaker,
+    Deadline,
+    LatencyTracker,
+    invoke_with_hedging,
+)
+
+
+@pytest.fixture(autouse=True)
+def hedge_quickly(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_DEFAULT_DELAY", 0.05)
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_primary_responds():
+    calls = []
+
+    async def invoke(backend: str) -> str:
+        calls.append(backend)
+        return f"response from {backend}"
+
+    response = await invoke_with_hedging(
+        "thalamus", invoke, backends=["primary", "secondary"], budget=1.0
+    )
+
+    assert response == "response from primary"
+    assert calls == ["primary"]
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_slow_primary_is_hedged_and_cancelled():
+    primary_cancelled = asyncio.Event()
+
+    async def invoke(backend: str) -> str:
+        if backend == "primary":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return f"response from {backend}"
+
+    response = await invoke_with_hedging(
+        "thalamus", invoke, backends=["primary", "secondary"], budget=1.0
+    )
+    await asyncio.sleep(0)
+
+    assert response == "response from secondary"
+    assert primary_cancelled.is_set()
+    assert not resilience.get_circuit_breaker("primary").is_open
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_fails_over_on_error():
+    async def invoke(backend: str) -> str:
+        if backend == "primary":
+            raise ConnectionError("Connection refused")
+        return f"response from {backend}"
+
+    response = await invoke_with_hedging(
+        "broca", invoke, backends=["primary", "secondary"], budget=1.0
+    )
+
+    assert response == "response from secondary"
+    assert resilience.get_circuit_breaker("primary").failures == 1
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_budget_exceeded():
+    async def invoke(backend: str) -> str:
+        await asyncio.sleep(10)
+
+    with pytest.raises(BackendUnavailableError):
+        await invoke_with_hedging(
+            "prefrontal", invoke, backends=["primary", "secondary"], budget=0.2
+        )
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_skips_open_circuit():
+    resilience._circuit_breakers["primary"] = CircuitBreaker(
+        failure_threshold=1, reset_timeout=60
+    )
+    resilience.get_circuit_breaker("primary").record_failure()
+
+    calls = []
+
+    async def invoke(backend: str) -> str:
+        calls.append(backend)
+        return backend
+
+    response = await invoke_with_hedging(
+        "thalamus", invoke, backends=["primary", "secondary"], budget=1.0
+    )
+
+    assert response == "secondary"
+    assert calls == ["secondary"]
+
+
+def test_circuit_breaker_half_open_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+
+    breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+
+    # A single trial request is let through once the reset timeout passes
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_latency_tracker_percentile(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 10)
+    tracker = LatencyTracker()
+
+    for latency in range(1, 10):
+        tracker.record(float(latency))
+    assert tracker.percentile(95) is None
+
+    for latency in range(10, 101):
+        tracker.record(float(latency))
+    assert tracker.percentile(95) == 95.0
+
+
+def test_deadline_allows_region_within_p95(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 1)
+    deadline = Deadline(1.0)
+
+    # Without latency samples a region may run as long as time remains
+    assert deadline.allows("thalamus")
+
+    resilience.get_latency_tracker("thalamus").record(5.0)
+    assert not deadline.allows("thalamus")
+
+    assert not Deadline(0).allows("broca")
+    assert Deadline.from_milliseconds(None) is None
+
+
+def test_deadline_num_predict(monkeypatch):
+    monkeypatch.setattr(resilience, "DEADLINE_TOKENS_PER_SECOND", 10.0)
+    monkeypatch.setattr(resilience, "DEADLINE_MIN_NUM_PREDICT", 16)
+
+    assert 90 <= Deadline(10.0).num_predict() <= 100
+    assert Deadline(0).num_predict() == 16
+
+
+@pytest.mark.parametrize("started", [True, False])
+@pytest.mark.asyncio
+async def test_invoke_with_hedging_releases_cancelled_half_open_trial(started):
+    # The primary's breaker is open and ready for a half-open trial
+    breaker = resilience.get_circuit_breaker("primary")
+    breaker.failure_threshold = 1
+    breaker.reset_timeout = 0
+    breaker.record_failure()
+
+    async def invoke(backend: str) -> str:
+        if backend == "primary":
+            await asyncio.sleep(10)
+        return f"response from {backend}"
+
+    task = asyncio.create_task(
+        invoke_with_hedging(
+            "thalamus", invoke, backends=["primary", "secondary"], budget=1.0
+        )
+    )
+    if started:
+        # The trial loses the hedge race to the secondary and is cancelled
+        assert await task == "response from secondary"
+    else:
+        # The request is cancelled, e.g. by a client disconnect, before the trial runs
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    await asyncio.sleep(0)
+
+    assert not breaker.trial_in_flight
+    assert breaker.allow()
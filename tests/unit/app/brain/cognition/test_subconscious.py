@@ -1,6 +1,7 @@
 import pytest
 
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_ollama import ChatOllama
 
 from aiden.app.brain.cognition.subconscious import process_subconscious
 
@@ -15,10 +16,11 @@ async def test_process_subconscious_thoughts(mocker):
 
     # Mock ChatOllama class to return a predefined response
     mock_ollama = mocker.patch(
-        "aiden.app.brain.cognition.subconscious.ChatOllama", autospec=True
+        "aiden.app.brain.cognition.subconscious.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
     )
     instance = mock_ollama.return_value
-    instance.invoke.return_value = mock_response
+    instance.ainvoke.return_value = mock_response
 
     # Simulate the thalamus function call
     rewritten_input = await process_subconscious(messages)
@@ -27,4 +29,4 @@ async def test_process_subconscious_thoughts(mocker):
     assert rewritten_input == "I am having a wonderful day."
 
     # Check that the invoke method was called correctly
-    instance.invoke.assert_called_once()
+    instance.ainvoke.assert_called_once()
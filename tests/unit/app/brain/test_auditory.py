@@ -1,8 +1,41 @@
+import asyncio
+import base64
+import struct
+
+import aiohttp
 import pytest
 from aiohttp import ClientSession
+from fastapi import HTTPException
 
-from aiden.app.brain.auditory import process_auditory
-from aiden.models.brain import AuditoryRequest
+from aiden.app.activity_gate import ActivityGate
+from aiden.app.brain.auditory import (
+    process_auditory,
+    process_auditory_batch,
+    process_auditory_language,
+    process_auditory_stream,
+    process_auditory_upload,
+)
+from tests.unit.app.test_audio import make_wav, read_wav
+from aiden.models.brain import (
+    AuditoryBatchClip,
+    AuditoryBatchRequest,
+    AuditoryBatchResult,
+    AuditoryEvent,
+    AuditoryEventType,
+    AuditoryInput,
+    AuditoryLanguageEvent,
+    AuditoryLanguageEventType,
+    AuditoryLanguageRequest,
+    AuditoryRequest,
+    AuditoryResponse,
+    AuditoryResult,
+    AuditoryStreamStart,
+    AuditoryType,
+    CorticalEvent,
+    CorticalEventType,
+    CorticalRequest,
+    Sensory,
+)
 
 
 @pytest.mark.asyncio
@@ -45,3 +78,504 @@ async def test_process_auditory(mocker):
     # Check that the session post method was called correctly
     mock_response.json.assert_called_once()
     mock_post.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_upload_reads_whole_mp3(mocker):
+    classify_audio = mocker.patch(
+        "aiden.app.brain.auditory._classify_audio", return_value=None
+    )
+
+    async def upload():
+        yield b"\xff\xfb\x90\x00"
+        yield b"\x00\x00\x00\x00\x00\x00\x00\x00"
+        yield b"data"
+
+    await process_auditory_upload(upload())
+
+    classify_audio.assert_called_once_with(
+        b"\xff\xfb\x90\x00" + b"\x00" * 8 + b"data", "audio.mp3", "audio/mp3"
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_upload_admits_once_uploaded(mocker):
+    admission = asyncio.Semaphore(1)
+    mocker.patch("aiden.app.brain.auditory._auditory_admission", admission)
+    mock_response = mocker.AsyncMock()
+    mock_response.status = 200
+    mock_response.json = mocker.AsyncMock(
+        return_value=[{"class": "Bird", "score": 0.5}]
+    )
+    mock_response.__aenter__.return_value = mock_response
+
+    def post(*args, **kwargs):
+        admitted.append(admission.locked())
+        return mock_response
+
+    mocker.patch.object(ClientSession, "post", side_effect=post)
+    admitted: list[bool] = []
+    uploading: list[bool] = []
+
+    async def upload():
+        yield b"\xff\xfb\x90\x00" + b"\x00" * 8
+        # The slot stays free while the client is slow to send the rest
+        await asyncio.sleep(0.01)
+        uploading.append(admission.locked())
+        yield b"data"
+
+    stream = await process_auditory_upload(upload())
+    recognized_input = "".join([chunk async for chunk in stream])
+
+    assert '"class_name":"Bird"' in recognized_input
+    assert uploading == [False]
+    assert admitted == [True]
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_upload_rejects_unsupported_format():
+    async def upload():
+        yield b"not an audio file"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await process_auditory_upload(upload())
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_retries_on_connection_error(mocker):
+    mocker.patch("aiden.app.clients.http_client.HTTP_CLIENT_RETRY_BACKOFF", 0)
+    mock_response = mocker.AsyncMock()
+    mock_response.status = 200
+    mock_response.json = mocker.AsyncMock(
+        return_value=[{"class": "Bird", "score": 0.5}]
+    )
+    mock_response.__aenter__.return_value = mock_response
+
+    # The server closed the pooled connection before the first attempt
+    mock_post = mocker.patch.object(
+        ClientSession,
+        "post",
+        side_effect=[aiohttp.ServerDisconnectedError(), mock_response],
+    )
+
+    request = AuditoryRequest(audio=base64.b64encode(b"\xff\xf3\x50\x80").decode())
+    recognized_input = "".join([chunk async for chunk in process_auditory(request)])
+
+    assert '"class_name":"Bird"' in recognized_input
+    assert mock_post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_normalizes_wav(mocker):
+    classify_audio = mocker.patch(
+        "aiden.app.brain.auditory._classify_audio", side_effect=lambda *args: fake()
+    )
+
+    async def fake():
+        yield "classified"
+
+    request = AuditoryRequest(
+        audio=base64.b64encode(make_wav(44100, channels=2)).decode()
+    )
+    assert "".join([chunk async for chunk in process_auditory(request)]) == "classified"
+
+    audio, filename, content_type = classify_audio.call_args.args
+    assert (filename, content_type) == ("audio.wav", "audio/wav")
+    assert read_wav(audio)[:3] == (16000, 1, 2)
+
+
+@pytest.mark.parametrize("sample_rate", [None, 48000])
+@pytest.mark.asyncio
+async def test_process_auditory_upload_normalizes_wav_and_pcm(mocker, sample_rate):
+    classify_audio = mocker.patch(
+        "aiden.app.brain.auditory._classify_audio", side_effect=lambda *args: fake()
+    )
+
+    async def fake():
+        yield "classified"
+
+    wav = make_wav(48000, channels=2)
+    # Raw PCM is the WAV file without its 44 byte header
+    audio = wav if sample_rate is None else wav[44:]
+
+    async def upload():
+        for start in range(0, len(audio), 4096):
+            yield audio[start : start + 4096]
+
+    stream = await process_auditory_upload(upload(), sample_rate, channels=2)
+    assert "".join([chunk async for chunk in stream]) == "classified"
+
+    audio, filename, content_type = classify_audio.call_args.args
+    assert (filename, content_type) == ("audio.wav", "audio/wav")
+    sample_rate, channels, sample_width, frames = read_wav(audio)
+    assert (sample_rate, channels, sample_width) == (16000, 1, 2)
+    assert frames == 16000
+
+
+@pytest.mark.parametrize(
+    "amplitude, silent", [(0.0, True), (0.001, True), (0.5, False)]
+)
+@pytest.mark.asyncio
+async def test_process_auditory_skips_silent_clips(mocker, amplitude, silent):
+    mocker.patch("aiden.app.brain.auditory.AUDITORY_ACTIVITY_GATE_ENABLE", True)
+    mocker.patch(
+        "aiden.app.brain.auditory.get_activity_gate", return_value=ActivityGate()
+    )
+    classify_audio = mocker.patch(
+        "aiden.app.brain.auditory._classify_audio", side_effect=lambda *args: fake()
+    )
+
+    async def fake():
+        yield "classified"
+
+    request = AuditoryRequest(
+        audio=base64.b64encode(make_wav(16000, amplitude=amplitude)).decode()
+    )
+    result = "".join([chunk async for chunk in process_auditory(request)])
+
+    if silent:
+        assert AuditoryResponse.model_validate_json(result).results == [
+            AuditoryResult(class_name="Silence", score=1.0)
+        ]
+        classify_audio.assert_not_called()
+    else:
+        assert result == "classified"
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_upload_skips_silent_clips(mocker):
+    mocker.patch("aiden.app.brain.auditory.AUDITORY_ACTIVITY_GATE_ENABLE", True)
+    activity_gate = ActivityGate()
+    mocker.patch(
+        "aiden.app.brain.auditory.get_activity_gate", return_value=activity_gate
+    )
+    classify_audio = mocker.patch("aiden.app.brain.auditory._classify_audio")
+
+    async def upload():
+        yield make_wav(44100, channels=2, amplitude=0.0)
+
+    stream = await process_auditory_upload(upload())
+    result = "".join([chunk async for chunk in stream])
+
+    assert AuditoryResponse.model_validate_json(result).results[0].class_name == (
+        "Silence"
+    )
+    classify_audio.assert_not_called()
+    assert activity_gate.stats().skipped == 1
+
+
+def pcm(sample: int, count: int) -> bytes:
+    return struct.pack("<h", sample) * count
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_stream(mocker):
+    classified: asyncio.Queue = asyncio.Queue()
+
+    async def classify_clip(window, sample_rate, channels):
+        await classified.put(window)
+        # Classify windows by their last sample
+        class_name = {1: "Dog", 2: "Cat"}[struct.unpack("<h", window[-2:])[0]]
+        return AuditoryResponse(
+            results=[AuditoryResult(class_name=class_name, score=0.9)]
+        )
+
+    mocker.patch("aiden.app.brain.auditory.classify_clip", side_effect=classify_clip)
+
+    chunks: asyncio.Queue = asyncio.Queue()
+    events: list[AuditoryEvent] = []
+
+    async def receive_chunk() -> bytes:
+        chunk = await chunks.get()
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    async def send_event(event: AuditoryEvent) -> None:
+        events.append(event)
+
+    # Windows of 10 samples every 5 samples
+    start = AuditoryStreamStart(
+        agent_id="1", sample_rate=100, window_seconds=0.1, hop_seconds=0.05
+    )
+    stream = asyncio.create_task(
+        process_auditory_stream(start, receive_chunk, send_event)
+    )
+
+    # An invalid chunk is reported without ending the stream
+    await chunks.put(ValueError("Invalid chunk"))
+    # Chunks may split samples, and the first window is classified once it is full
+    await chunks.put(pcm(1, 10)[:15])
+    await chunks.put(pcm(1, 10)[15:])
+    assert await asyncio.wait_for(classified.get(), 1) == pcm(1, 10)
+    await chunks.put(pcm(1, 5))
+    assert await asyncio.wait_for(classified.get(), 1) == pcm(1, 10)
+    await chunks.put(pcm(2, 5))
+    assert await asyncio.wait_for(classified.get(), 1) == pcm(1, 5) + pcm(2, 5)
+
+    # The agent disconnects
+    await chunks.put(ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        await stream
+
+    # Only changes of the top class are sent
+    assert [event.type for event in events] == [
+        AuditoryEventType.ERROR,
+        AuditoryEventType.RESULT,
+        AuditoryEventType.RESULT,
+    ]
+    assert [(event.time, event.result.class_name) for event in events[1:]] == [
+        (0.1, "Dog"),
+        (0.2, "Cat"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_stream_classifies_windows(mocker):
+    mocker.patch("aiden.app.brain.auditory.AUDITORY_ACTIVITY_GATE_ENABLE", True)
+    mocker.patch(
+        "aiden.app.brain.auditory.get_activity_gate", return_value=ActivityGate()
+    )
+    classify = mocker.patch(
+        "aiden.app.brain.auditory._classify",
+        return_value=AuditoryResponse(
+            results=[
+                AuditoryResult(class_name="Speech", score=0.3),
+                AuditoryResult(class_name="Music", score=0.6),
+            ]
+        ),
+    )
+    # One second windows of a tone, then of silence, at 48 kHz stereo
+    chunks = [
+        make_wav(48000, channels=2)[44:],
+        make_wav(48000, channels=2, amplitude=0.0)[44:],
+    ]
+    events: asyncio.Queue = asyncio.Queue()
+    received: list[AuditoryEvent] = []
+
+    async def receive_chunk() -> bytes:
+        # Send each window once the previous one was classified
+        if len(chunks) < 2:
+            received.append(await events.get())
+        if not chunks:
+            raise ConnectionResetError()
+        return chunks.pop(0)
+
+    async def send_event(event: AuditoryEvent) -> None:
+        await events.put(event)
+
+    start = AuditoryStreamStart(
+        agent_id="1", sample_rate=48000, channels=2, window_seconds=1.0, hop_seconds=1.0
+    )
+    with pytest.raises(ConnectionResetError):
+        await asyncio.wait_for(
+            process_auditory_stream(start, receive_chunk, send_event), 5
+        )
+
+    assert [event.result.class_name for event in received] == ["Music", "Silence"]
+    # The window is normalised before it is classified, and silence is not classified
+    audio, filename, content_type = classify.call_args.args
+    assert read_wav(audio)[:3] == (16000, 1, 2)
+    assert classify.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_stream_ends_when_sending_fails(mocker):
+    mocker.patch(
+        "aiden.app.brain.auditory._classify",
+        return_value=AuditoryResponse(
+            results=[AuditoryResult(class_name="Music", score=0.6)]
+        ),
+    )
+    chunk = make_wav(16000, seconds=0.1)[44:]
+    received = 0
+
+    async def receive_chunk() -> bytes:
+        nonlocal received
+        received += 1
+        await asyncio.sleep(0.01)
+        return chunk
+
+    async def send_event(event: AuditoryEvent) -> None:
+        raise ConnectionResetError("Cannot send the result")
+
+    start = AuditoryStreamStart(
+        agent_id="1", sample_rate=16000, window_seconds=0.1, hop_seconds=0.1
+    )
+    with pytest.raises(ConnectionResetError):
+        await asyncio.wait_for(
+            process_auditory_stream(start, receive_chunk, send_event), 5
+        )
+
+    # The stream ends rather than buffering audio no result is sent for
+    assert received < 10
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_batch(mocker):
+    async def classify(audio, filename, content_type):
+        # The second agent's clip finishes first
+        if read_wav(audio)[3] == 16000:
+            await asyncio.sleep(0.05)
+        return AuditoryResponse(results=[AuditoryResult(class_name="Bird", score=0.5)])
+
+    mocker.patch("aiden.app.brain.auditory._classify", side_effect=classify)
+
+    request = AuditoryBatchRequest(
+        clips=[
+            AuditoryBatchClip(
+                agent_id="0",
+                audio=base64.b64encode(make_wav(44100, channels=2)).decode(),
+            ),
+            AuditoryBatchClip(
+                agent_id="1",
+                microphone="left",
+                audio=base64.b64encode(make_wav(48000)[44:24044]).decode(),
+                sample_rate=48000,
+            ),
+            AuditoryBatchClip(agent_id="2", audio=base64.b64encode(b"text").decode()),
+        ]
+    )
+    lines = [line async for line in process_auditory_batch(request)]
+
+    results = [AuditoryBatchResult.model_validate_json(line) for line in lines]
+    assert all(line.endswith("\n") for line in lines)
+    assert [(result.agent_id, result.microphone) for result in results] == [
+        ("2", None),
+        ("1", "left"),
+        ("0", None),
+    ]
+    assert "Unsupported audio format" in results[0].error
+    assert results[1].results == [AuditoryResult(class_name="Bird", score=0.5)]
+    assert results[2].error is None
+
+
+@pytest.mark.asyncio
+async def test_classify_limits_concurrency(mocker):
+    mocker.patch("aiden.app.brain.auditory._auditory_admission", asyncio.Semaphore(2))
+    running = 0
+    peak = 0
+
+    async def post(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        raise aiohttp.ClientPayloadError("Closed")
+
+    session = mocker.MagicMock()
+    session.post.side_effect = lambda *args, **kwargs: mocker.MagicMock(
+        __aenter__=mocker.AsyncMock(side_effect=post)
+    )
+    mocker.patch("aiden.app.brain.auditory.get_http_session", return_value=session)
+
+    request = AuditoryBatchRequest(
+        clips=[
+            AuditoryBatchClip(
+                agent_id=str(index), audio=base64.b64encode(b"\xff\xfb\x90").decode()
+            )
+            for index in range(5)
+        ]
+    )
+    results = [
+        AuditoryBatchResult.model_validate_json(line)
+        async for line in process_auditory_batch(request)
+    ]
+
+    assert len(results) == 5
+    assert all(result.error for result in results)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_language(mocker):
+    mocker.patch("aiden.app.brain.auditory.AUDITORY_LANGUAGE_CHUNK_SECONDS", 1.0)
+    transcripts = iter(["Hello there.", "How are you?"])
+
+    async def transcribe(audio, filename, content_type, language):
+        assert (filename, content_type, language) == ("audio.wav", "audio/wav", "en")
+        return next(transcripts)
+
+    transcribe = mocker.patch(
+        "aiden.app.brain.auditory._transcribe", side_effect=transcribe
+    )
+
+    request = AuditoryLanguageRequest(
+        audio=base64.b64encode(make_wav(44100, seconds=1.5)).decode(), language="en"
+    )
+    events = [
+        AuditoryLanguageEvent.model_validate_json(line)
+        async for line in process_auditory_language(request)
+    ]
+
+    # Speech longer than a clip is transcribed in parts
+    assert transcribe.call_count == 2
+    assert [(event.type, event.content) for event in events] == [
+        (AuditoryLanguageEventType.PARTIAL, "Hello there."),
+        (AuditoryLanguageEventType.TRANSCRIPT, "Hello there. How are you?"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_language_runs_cortical_tick(mocker):
+    mocker.patch("aiden.app.brain.auditory._transcribe", return_value="Hello there.")
+    cortical_requests = []
+
+    async def process_cortical_events(request):
+        cortical_requests.append(request)
+        yield CorticalEvent(type=CorticalEventType.SPEECH, content="Hi!")
+        yield CorticalEvent(type=CorticalEventType.DONE)
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_cortical_events",
+        side_effect=process_cortical_events,
+    )
+
+    request = AuditoryLanguageRequest(
+        audio=base64.b64encode(make_wav(16000)).decode(),
+        cortical=CorticalRequest(
+            agent_id="1",
+            sensory=Sensory(auditory=[AuditoryInput(content="Birds chirping")]),
+        ),
+    )
+    events = [
+        AuditoryLanguageEvent.model_validate_json(line)
+        async for line in process_auditory_language(request)
+    ]
+
+    assert [event.type for event in events] == [
+        AuditoryLanguageEventType.TRANSCRIPT,
+        AuditoryLanguageEventType.CORTICAL,
+        AuditoryLanguageEventType.CORTICAL,
+    ]
+    assert events[1].cortical.content == "Hi!"
+    # The transcript is heard alongside the agent's other sounds
+    assert cortical_requests[0].sensory.auditory == [
+        AuditoryInput(content="Birds chirping"),
+        AuditoryInput(type=AuditoryType.LANGUAGE, content="Hello there."),
+    ]
+    assert request.cortical.sensory.auditory == [
+        AuditoryInput(content="Birds chirping")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_auditory_language_error(mocker):
+    mock_response = mocker.AsyncMock()
+    mock_response.status = 500
+    mock_response.text = mocker.AsyncMock(return_value="Model not loaded")
+    mock_post = mocker.patch.object(ClientSession, "post")
+    mock_post.return_value.__aenter__.return_value = mock_response
+
+    request = AuditoryLanguageRequest(audio=base64.b64encode(make_wav(16000)).decode())
+    events = [
+        AuditoryLanguageEvent.model_validate_json(line)
+        async for line in process_auditory_language(request)
+    ]
+
+    assert events[0].type == AuditoryLanguageEventType.ERROR
+    assert "Model not loaded" in events[0].content
+    assert mock_post.call_args.kwargs["params"]["task"] == "transcribe"
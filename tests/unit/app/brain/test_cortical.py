@@ -3,19 +3,36 @@ from aiden.app.brain.cortical import (
     _has_actions_in_tactile_inputs,
     _has_speech_in_auditory_inputs,
     process_cortical,
+    process_cortical_batch,
+    process_cortical_events,
+    process_cortical_session,
 )
 
 
+import asyncio
+from contextlib import aclosing
+
 import pytest
+from langchain_core.load import dumps
+from langchain_core.messages import HumanMessage
+from pydantic import ValidationError
 
+from aiden.app.brain.cognition.resilience import Deadline
 from aiden.models.brain import (
     Action,
     AuditoryInput,
     AuditoryType,
+    CorticalBatchRequest,
+    CorticalBatchResult,
+    CorticalEvent,
+    CorticalEventType,
+    CorticalRequest,
     CorticalResponse,
+    CorticalSessionStart,
     GustatoryInput,
     OlfactoryInput,
     Sensory,
+    SensoryDelta,
     TactileInput,
     TactileType,
     VisionInput,
@@ -28,6 +45,8 @@ async def test_process_cortical_request(mocker, brain_config):
     cortical_request = mocker.Mock()
     cortical_request.config = "path to brain config"
     cortical_request.history = []
+    cortical_request.latency_budget_ms = None
+    cortical_request.include_timings = True
     cortical_request.sensory = Sensory(
         vision=[VisionInput(content="Clear path ahead")],
         auditory=[
@@ -105,6 +124,286 @@ async def test_process_cortical_request(mocker, brain_config):
     assert content.speech == "I am doing well."
     assert content.thoughts == "I wonder where I should go next."
 
+    # Check that each graph node was timed
+    timed_stages = [timing.name for timing in content.timings]
+    for stage in ["thalamus", "prefrontal", "broca", "subconscious"]:
+        assert stage in timed_stages
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_request_skips_stages_past_deadline(
+    mocker, brain_config
+):
+    # Mock the CorticalRequest with an already exhausted latency budget
+    cortical_request = mocker.Mock()
+    cortical_request.config = "path to brain config"
+    cortical_request.latency_budget_ms = 1
+    cortical_request.sensory = Sensory(
+        auditory=[AuditoryInput(type=AuditoryType.LANGUAGE, content="Hello world")],
+        tactile=[
+            TactileInput(type=TactileType.ACTION, command=Action(name="move forward"))
+        ],
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.Deadline.from_milliseconds",
+        return_value=Deadline(0),
+    )
+
+    # Mock loading the brain configuration
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+
+    # None of the brain regions should be called
+    mock_thalamus = mocker.patch("aiden.app.brain.cortical.process_thalamus")
+    mock_prefrontal = mocker.patch("aiden.app.brain.cortical.process_prefrontal")
+    mock_broca = mocker.patch("aiden.app.brain.cortical.process_broca")
+    mock_subconscious = mocker.patch("aiden.app.brain.cortical.process_subconscious")
+    mock_memory_update = mocker.patch(
+        "aiden.app.brain.cortical.MemoryManager.update_memory"
+    )
+
+    # Call the function
+    response_stream = await process_cortical(cortical_request)
+
+    # Collect the response from the stream
+    response_json = ""
+    async for chunk in response_stream:
+        response_json += chunk
+
+    content = CorticalResponse().model_validate_json(response_json)
+
+    assert content.action is None
+    assert content.speech is None
+    assert content.thoughts is None
+    assert sorted(content.skipped) == [
+        "broca",
+        "prefrontal",
+        "subconscious",
+        "thalamus",
+    ]
+
+    mock_thalamus.assert_not_called()
+    mock_prefrontal.assert_not_called()
+    mock_broca.assert_not_called()
+    mock_subconscious.assert_not_called()
+    mock_memory_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_batch(mocker, brain_config):
+    batch_request = CorticalBatchRequest(
+        requests=[
+            CorticalRequest(
+                agent_id=agent_id,
+                sensory=Sensory(vision=[VisionInput(content="Clear path ahead")]),
+            )
+            for agent_id in ["1", "2"]
+        ]
+    )
+    history = [HumanMessage(content="Earlier sensory data")]
+
+    # Mock Redis, where only the first agent has memories
+    mock_redis_client = mocker.patch("aiden.app.brain.cortical.redis_client")
+    mock_redis_client.mget.return_value = [dumps(history), None]
+    mock_pipeline = mock_redis_client.pipeline.return_value
+
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_thalamus",
+        return_value="Processed by thalamus",
+    )
+    mock_subconscious = mocker.patch(
+        "aiden.app.brain.cortical.process_subconscious",
+        return_value="I wonder where I should go next.",
+    )
+
+    # Call the function
+    lines = [line async for line in process_cortical_batch(batch_request)]
+
+    results = [CorticalBatchResult.model_validate_json(line) for line in lines]
+    assert all(line.endswith("\n") for line in lines)
+    assert sorted(result.agent_id for result in results) == ["1", "2"]
+    for result in results:
+        assert result.error is None
+        assert result.response.thoughts == "I wonder where I should go next."
+
+    # The first agent continues from its memories
+    messages_by_call = [call.args[0] for call in mock_subconscious.call_args_list]
+    assert any(messages[0] == history[0] for messages in messages_by_call)
+
+    # Memories were read and written in a single round trip each
+    mock_redis_client.mget.assert_called_once_with(["agent:1:memory", "agent:2:memory"])
+    mock_redis_client.get.assert_not_called()
+    assert mock_pipeline.set.call_count == 2
+    mock_pipeline.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_batch_reports_failed_agent(mocker):
+    batch_request = CorticalBatchRequest(
+        requests=[
+            CorticalRequest(agent_id=agent_id, sensory=Sensory())
+            for agent_id in ["ok", "failed"]
+        ]
+    )
+    mocker.patch("aiden.app.brain.cortical.redis_client")
+
+    async def run_cortical(request, memory_manager):
+        if request.agent_id == "failed":
+            raise FileNotFoundError("Cannot find the brain configuration file")
+        return CorticalResponse(thoughts="Fine")
+
+    mocker.patch("aiden.app.brain.cortical._run_cortical", side_effect=run_cortical)
+
+    lines = [line async for line in process_cortical_batch(batch_request)]
+
+    results = {
+        result.agent_id: result
+        for result in map(CorticalBatchResult.model_validate_json, lines)
+    }
+    assert results["ok"].response.thoughts == "Fine"
+    assert results["failed"].response is None
+    assert results["failed"].error == "Cannot find the brain configuration file"
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_batch_flushes_after_stopping_agents(mocker):
+    batch_request = CorticalBatchRequest(
+        requests=[
+            CorticalRequest(agent_id=agent_id, sensory=Sensory())
+            for agent_id in ["fast", "slow"]
+        ]
+    )
+    mock_redis_client = mocker.patch("aiden.app.brain.cortical.redis_client")
+    mock_redis_client.mget.return_value = [None, None]
+
+    async def run_cortical(request, memory_manager):
+        if request.agent_id == "slow":
+            try:
+                await asyncio.Event().wait()
+            finally:
+                # The tick saves its memory on the way out
+                await asyncio.sleep(0.01)
+                memory_manager.update_memory("slow", [HumanMessage(content="Bye")])
+        return CorticalResponse(thoughts="Fine")
+
+    mocker.patch("aiden.app.brain.cortical._run_cortical", side_effect=run_cortical)
+
+    # The client disconnects after the first agent's result
+    async with aclosing(process_cortical_batch(batch_request)) as lines:
+        await lines.__anext__()
+
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    saved = [call.args[0] for call in mock_pipeline.set.call_args_list]
+    assert saved == ["agent:slow:memory"]
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_session(mocker, brain_config):
+    mock_redis_client = mocker.patch("aiden.app.brain.cortical.redis_client")
+    mock_redis_client.mget.return_value = [None]
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_thalamus",
+        return_value="Processed by thalamus",
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_prefrontal", return_value="move_forward"
+    )
+    mock_subconscious = mocker.patch(
+        "aiden.app.brain.cortical.process_subconscious",
+        return_value="I wonder where I should go next.",
+    )
+
+    deltas: asyncio.Queue = asyncio.Queue()
+    events: list[CorticalEvent] = []
+    done = asyncio.Event()
+
+    async def receive_delta() -> SensoryDelta:
+        delta = await deltas.get()
+        if isinstance(delta, Exception):
+            raise delta
+        return delta
+
+    async def send_event(event: CorticalEvent) -> None:
+        events.append(event)
+        if event.type == CorticalEventType.DONE:
+            done.set()
+
+    session = asyncio.create_task(
+        process_cortical_session(
+            CorticalSessionStart(agent_id="1"), receive_delta, send_event
+        )
+    )
+
+    # An invalid delta is reported without ending the session
+    await deltas.put(ValueError("Invalid delta"))
+    await deltas.put(
+        SensoryDelta(
+            vision=[VisionInput(content="Clear path ahead")],
+            tactile=[
+                TactileInput(
+                    type=TactileType.ACTION, command=Action(name="move forward")
+                )
+            ],
+        )
+    )
+    await asyncio.wait_for(done.wait(), timeout=5)
+
+    # The agent disconnects
+    await deltas.put(ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        await session
+
+    assert [event.type for event in events] == [
+        CorticalEventType.ERROR,
+        CorticalEventType.ACTION,
+        CorticalEventType.THOUGHTS,
+        CorticalEventType.DONE,
+    ]
+    assert events[1].content == "move_forward"
+    assert all(event.tick == 1 for event in events[1:])
+    assert events[-1].response.thoughts == "I wonder where I should go next."
+
+    # The session's memory is read once and written through after the tick
+    mock_subconscious.assert_called_once()
+    mock_redis_client.mget.assert_called_once_with(["agent:1:memory"])
+    mock_redis_client.get.assert_not_called()
+    mock_redis_client.pipeline.return_value.execute.assert_called_once()
+
+
+def test_sensory_delta_between_and_apply():
+    previous = Sensory(
+        vision=[VisionInput(content="A tree.")],
+        auditory=[AuditoryInput(content="A bird chirping.")],
+    )
+    current = Sensory(
+        vision=[VisionInput(content="A tree.")],
+        auditory=[],
+    )
+
+    delta = SensoryDelta.between(previous, current)
+
+    assert delta.vision is None
+    assert delta.auditory == []
+    assert delta.apply(previous) == current
+    assert SensoryDelta.between(None, current).apply(Sensory()) == current
+
+
+def test_cortical_batch_request_rejects_duplicate_agent_ids():
+    with pytest.raises(ValidationError):
+        CorticalBatchRequest(
+            requests=[
+                CorticalRequest(agent_id="1", sensory=Sensory()),
+                CorticalRequest(agent_id="1", sensory=Sensory()),
+            ]
+        )
+
 
 @pytest.mark.parametrize(
     "tactile_inputs, expected_actions",
@@ -195,3 +494,163 @@ async def test_has_actions_in_tactile_inputs(tactile_inputs, expected_result):
 def test_has_speech_in_auditory_inputs(auditory_inputs, expected_result):
     result = _has_speech_in_auditory_inputs(auditory_inputs)
     assert result == expected_result
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_events_streams_speech(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_thalamus",
+        return_value="Processed by thalamus",
+    )
+    mocker.patch("aiden.app.brain.cortical.process_subconscious", return_value=None)
+    mocker.patch(
+        "aiden.app.brain.cortical._add_cortical_output_to_memory", return_value=None
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.MemoryManager.update_memory", return_value=None
+    )
+    mocker.patch("aiden.app.brain.cortical.MemoryManager.read_memory", return_value=[])
+
+    async def process_broca(on_token, **kwargs):
+        for token in ["Hello", " there."]:
+            on_token(token)
+        return "Hello there."
+
+    mocker.patch("aiden.app.brain.cortical.process_broca", side_effect=process_broca)
+
+    request = CorticalRequest(
+        agent_id="1",
+        sensory=Sensory(
+            auditory=[AuditoryInput(type=AuditoryType.LANGUAGE, content="Hi")]
+        ),
+    )
+    events = [
+        event async for event in process_cortical_events(request, stream_speech=True)
+    ]
+
+    # Each token is streamed before the complete speech
+    speech = [
+        (event.type, event.content)
+        for event in events
+        if event.type in (CorticalEventType.SPEECH_DELTA, CorticalEventType.SPEECH)
+    ]
+    assert speech == [
+        (CorticalEventType.SPEECH_DELTA, "Hello"),
+        (CorticalEventType.SPEECH_DELTA, " there."),
+        (CorticalEventType.SPEECH, "Hello there."),
+    ]
+
+
+@pytest.fixture
+def speaking_cortex(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_thalamus",
+        return_value="Processed by thalamus",
+    )
+    mocker.patch("aiden.app.brain.cortical.process_broca", return_value="Hello there.")
+    mocker.patch(
+        "aiden.app.brain.cortical._add_cortical_output_to_memory", return_value=None
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.MemoryManager.update_memory", return_value=None
+    )
+    mocker.patch("aiden.app.brain.cortical.MemoryManager.read_memory", return_value=[])
+    admission = asyncio.Semaphore(1)
+    mocker.patch("aiden.app.brain.cortical._cortical_admission", admission)
+
+    request = CorticalRequest(
+        agent_id="1",
+        sensory=Sensory(
+            auditory=[AuditoryInput(type=AuditoryType.LANGUAGE, content="Hi")]
+        ),
+    )
+    return request, admission
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_events_frees_admission_for_slow_consumer(
+    mocker, speaking_cortex
+):
+    request, admission = speaking_cortex
+    mocker.patch(
+        "aiden.app.brain.cortical.process_subconscious", return_value="Say hello."
+    )
+
+    async with aclosing(process_cortical_events(request)) as events:
+        first = await events.__anext__()
+
+        # The graph finishes and frees its slot while the consumer is still busy
+        await asyncio.wait_for(admission.acquire(), timeout=5)
+        admission.release()
+
+        remaining = [event async for event in events]
+
+    assert [event.type for event in [first, *remaining]] == [
+        CorticalEventType.SPEECH,
+        CorticalEventType.THOUGHTS,
+        CorticalEventType.DONE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_events_stops_graph_when_closed(mocker, speaking_cortex):
+    request, admission = speaking_cortex
+
+    async def process_subconscious(**kwargs):
+        await asyncio.Event().wait()
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_subconscious",
+        side_effect=process_subconscious,
+    )
+
+    events = process_cortical_events(request)
+    await events.__anext__()
+    await events.aclose()
+
+    assert not admission.locked()
+
+
+@pytest.mark.asyncio
+async def test_process_cortical_session_ends_when_a_tick_fails(mocker, brain_config):
+    mock_redis_client = mocker.patch("aiden.app.brain.cortical.redis_client")
+    mock_redis_client.mget.return_value = [None]
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_thalamus",
+        return_value="Processed by thalamus",
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.process_subconscious",
+        return_value="I wonder where I should go next.",
+    )
+
+    deltas: asyncio.Queue = asyncio.Queue()
+    events: list[CorticalEvent] = []
+
+    async def send_event(event: CorticalEvent) -> None:
+        if event.type == CorticalEventType.THOUGHTS:
+            raise ConnectionResetError("Cannot send thoughts")
+        events.append(event)
+
+    await deltas.put(SensoryDelta(vision=[VisionInput(content="Clear path ahead")]))
+    with pytest.raises(ConnectionResetError):
+        await asyncio.wait_for(
+            process_cortical_session(
+                CorticalSessionStart(agent_id="1"), deltas.get, send_event
+            ),
+            timeout=5,
+        )
+
+    # The agent is told why before the session ends, rather than its deltas going
+    # unanswered
+    assert [event.type for event in events] == [CorticalEventType.ERROR]
+    assert events[0].content == "Cannot send thoughts"
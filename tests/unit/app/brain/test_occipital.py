@@ -1,8 +1,55 @@
+import asyncio
+import base64
+import io
+import json
+
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_ollama import ChatOllama
+from PIL import Image
+
+from aiden.app.brain.occipital import (
+    process_occipital,
+    process_occipital_batch,
+    process_occipital_upload,
+)
+from aiden.app.frame_gate import get_frame_gate
+from aiden.app.vision_cache import get_description_cache
+from aiden.models.brain import (
+    OccipitalBatchImage,
+    OccipitalBatchRequest,
+    OccipitalBatchResult,
+    OccipitalRequest,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_description_cache():
+    get_description_cache.cache_clear()
+    get_frame_gate.cache_clear()
+    yield
+    get_description_cache.cache_clear()
+    get_frame_gate.cache_clear()
+
+
+def encode_frame(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
 
-from aiden.app.brain.occipital import process_occipital
-from aiden.models.brain import OccipitalRequest
+def stream_messages(*messages: AIMessage, delay: float = 0):
+    # Simulates ChatOllama.astream, recording whether the stream was closed
+    async def astream(*args, **kwargs):
+        try:
+            for message in messages:
+                await asyncio.sleep(delay)
+                yield message
+        finally:
+            astream.closed = True
+
+    astream.closed = False
+    return astream
 
 
 @pytest.mark.asyncio
@@ -19,9 +66,12 @@ async def test_process_occipital_visual_recognition(mocker, brain_config):
     ]
 
     # Mock ChatOllama class to return a predefined response
-    mock_ollama = mocker.patch("aiden.app.brain.occipital.ChatOllama", autospec=True)
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
     instance = mock_ollama.return_value
-    instance.stream.return_value = mock_responses
+    instance.astream.side_effect = stream_messages(*mock_responses)
 
     # Prepare an OccipitalRequest object
     request = OccipitalRequest(image="base64_encoded_image_data")
@@ -38,7 +88,264 @@ async def test_process_occipital_visual_recognition(mocker, brain_config):
 
     # Check that the invoke method was called correctly
     human_message = HumanMessage(
-        content="\n".join(brain_config.regions.occipital.instruction),
-        image=request.image,
+        content=[
+            {
+                "type": "text",
+                "text": "\n".join(brain_config.regions.occipital.instruction),
+            },
+            {
+                "type": "image_url",
+                "image_url": "data:image/jpeg;base64,base64_encoded_image_data",
+            },
+        ]
+    )
+    instance.astream.assert_called_once_with([human_message])
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_upload(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    instance = mock_ollama.return_value
+    instance.astream.side_effect = stream_messages(AIMessage(content="A park."))
+
+    recognized_input = ""
+    async for chunk in process_occipital_upload(b"\xff\xd8\xff", "config.json"):
+        recognized_input += chunk
+
+    assert recognized_input == "A park."
+
+    # The raw upload is sent to the vision model base64 encoded
+    human_message = instance.astream.call_args.args[0][0]
+    assert human_message.content[1]["image_url"] == "data:image/jpeg;base64,/9j/"
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_cut_off_at_deadline(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    astream = stream_messages(
+        AIMessage(content="A park"),
+        AIMessage(content=" with children playing."),
+        delay=0.2,
+    )
+    mock_ollama.return_value.astream.side_effect = astream
+
+    request = OccipitalRequest(image="base64_encoded_image_data", latency_budget_ms=300)
+    recognized_input = "".join([chunk async for chunk in process_occipital(request)])
+
+    # Only the chunks generated before the deadline are returned
+    assert recognized_input == "A park"
+    assert 0 < mock_ollama.call_args.kwargs["num_predict"] <= 256
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_fails_past_deadline_in_admission(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
     )
-    instance.stream.assert_called_once_with([human_message])
+    admission = asyncio.Semaphore(1)
+    mocker.patch("aiden.app.brain.occipital._vision_admission", admission)
+
+    # Another frame holds the only slot until the deadline passed
+    await admission.acquire()
+    asyncio.get_running_loop().call_later(0.1, admission.release)
+
+    request = OccipitalRequest(image="base64_encoded_image_data", latency_budget_ms=50)
+    chunks = [chunk async for chunk in process_occipital(request)]
+
+    # The frame is reported as failed rather than described as empty, and the backend
+    # is not called
+    assert json.loads(chunks[0])["error"].startswith("The deadline passed")
+    mock_ollama.return_value.astream.assert_not_called()
+    assert not admission.locked()
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_closing_stops_generation(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    astream = stream_messages(AIMessage(content="A park"), AIMessage(content="."))
+    mock_ollama.return_value.astream.side_effect = astream
+
+    # Closing the generator, as on client disconnect, closes the backend stream
+    stream = process_occipital(OccipitalRequest(image="base64_encoded_image_data"))
+    assert await stream.__anext__() == "A park"
+    await stream.aclose()
+
+    assert astream.closed
+
+
+@pytest.fixture(scope="module")
+def uhd_png() -> bytes:
+    # Encoded once and before the event loop is watched, as encoding takes a while
+    buffer = io.BytesIO()
+    Image.new("RGB", (3840, 2160)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("upload", [False, True])
+@pytest.mark.asyncio
+async def test_process_occipital_preprocesses_image(
+    mocker, brain_config, uhd_png, upload
+):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    instance = mock_ollama.return_value
+    instance.astream.side_effect = stream_messages(AIMessage(content="A park."))
+
+    if upload:
+        stream = process_occipital_upload(uhd_png, "config.json")
+    else:
+        image = base64.b64encode(uhd_png).decode("ascii")
+        stream = process_occipital(OccipitalRequest(image=image))
+    assert "".join([chunk async for chunk in stream]) == "A park."
+
+    # The frame is downsized to the vision model's input size before it is sent
+    image_url = instance.astream.call_args.args[0][0].content[1]["image_url"]
+    image = base64.b64decode(image_url.removeprefix("data:image/jpeg;base64,"))
+    with Image.open(io.BytesIO(image)) as sent:
+        assert sent.format == "JPEG"
+        assert sent.size == (378, 213)
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_caches_near_identical_frames(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    instance = mock_ollama.return_value
+    instance.astream.side_effect = stream_messages(
+        AIMessage(content="A park"), AIMessage(content=".")
+    )
+
+    frame = Image.linear_gradient("L").convert("RGB").resize((640, 480))
+    similar = frame.copy()
+    similar.putpixel((0, 0), (255, 0, 0))
+
+    first = [chunk async for chunk in process_occipital_upload(encode_frame(frame), "")]
+    second = [
+        chunk async for chunk in process_occipital_upload(encode_frame(similar), "")
+    ]
+
+    # The near-identical frame is described from the cache in a single chunk
+    assert first == ["A park", "."]
+    assert second == ["A park."]
+    instance.astream.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_gates_unchanged_frames(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mocker.patch("aiden.app.brain.occipital.VISION_FRAME_GATE_ENABLE", True)
+    mocker.patch("aiden.app.brain.occipital.get_description_cache", return_value=None)
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+    instance = mock_ollama.return_value
+    instance.astream.side_effect = stream_messages(AIMessage(content="A park."))
+
+    frame = encode_frame(Image.new("RGB", (640, 480), (100, 100, 100)))
+    changed = encode_frame(Image.new("RGB", (640, 480), (200, 200, 200)))
+
+    async def describe(image: bytes, agent_id: str) -> list[str]:
+        request = OccipitalRequest(
+            image=base64.b64encode(image).decode("ascii"), agent_id=agent_id
+        )
+        return [chunk async for chunk in process_occipital(request)]
+
+    # The agent's unchanged frame reuses its last description, unlike the changed one
+    assert await describe(frame, "0") == ["A park."]
+    assert await describe(frame, "0") == ["A park."]
+    assert instance.astream.call_count == 1
+    await describe(changed, "0")
+    await describe(frame, "1")
+    assert instance.astream.call_count == 3
+
+    stats = {stats.agent_id: stats for stats in get_frame_gate().stats()}
+    assert stats["0"].skipped == 1
+    assert stats["1"].skipped == 0
+
+
+@pytest.mark.asyncio
+async def test_process_occipital_batch(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.occipital.load_brain_config", return_value=brain_config
+    )
+    mocker.patch("aiden.app.brain.occipital.get_description_cache", return_value=None)
+    mocker.patch("aiden.app.brain.occipital._vision_admission", asyncio.Semaphore(2))
+    mock_ollama = mocker.patch(
+        "aiden.app.brain.occipital.ChatOllama",
+        return_value=mocker.MagicMock(spec=ChatOllama),
+    )
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def astream(messages):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        yield AIMessage(content="A park.")
+
+    mock_ollama.return_value.astream.side_effect = astream
+
+    frame = base64.b64encode(encode_frame(Image.new("RGB", (640, 480)))).decode()
+    images = [
+        OccipitalBatchImage(agent_id=agent_id, camera=camera, image=frame)
+        for agent_id in ["1", "2"]
+        for camera in ["front", "mirror"]
+    ]
+    images.append(OccipitalBatchImage(agent_id="3", image="not base64"))
+
+    lines = [
+        line
+        async for line in process_occipital_batch(OccipitalBatchRequest(images=images))
+    ]
+    results = {
+        (result.agent_id, result.camera): result
+        for result in map(OccipitalBatchResult.model_validate_json, lines)
+    }
+
+    # Each image is described once, with at most two descriptions generated at once
+    assert all(line.endswith("\n") for line in lines)
+    assert len(results) == 5
+    assert results[("1", "front")].description == "A park."
+    assert results[("2", "mirror")].description == "A park."
+    assert results[("3", None)].description is None
+    assert results[("3", None)].error
+    assert mock_ollama.return_value.astream.call_count == 4
+    assert max_in_flight == 2
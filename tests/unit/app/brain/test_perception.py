@@ -0,0 +1,180 @@
+import asyncio
+import base64
+
+import pytest
+
+from aiden.app.brain.perception import process_perception
+from aiden.models.brain import (
+    AuditoryResponse,
+    AuditoryResult,
+    CorticalEvent,
+    CorticalEventType,
+    CorticalRequest,
+    PerceptionEvent,
+    PerceptionEventType,
+    PerceptionRequest,
+    Sensory,
+    TactileInput,
+)
+
+
+@pytest.mark.asyncio
+async def test_process_perception(mocker):
+    async def describe_frame(image, config, latency_budget_ms, agent_id, threshold):
+        assert (image, agent_id) == (b"image", "1")
+        # The audio is perceived while the frame is still being described
+        await asyncio.sleep(0.05)
+        return "A red door"
+
+    mocker.patch(
+        "aiden.app.brain.perception.describe_frame", side_effect=describe_frame
+    )
+    classify_clip = mocker.patch(
+        "aiden.app.brain.perception.classify_clip",
+        return_value=AuditoryResponse(
+            results=[
+                AuditoryResult(class_name="Speech", score=0.9),
+                AuditoryResult(class_name="Music", score=0.1),
+            ]
+        ),
+    )
+    cortical_requests = []
+
+    async def process_cortical_events(request):
+        cortical_requests.append(request)
+        yield CorticalEvent(type=CorticalEventType.DONE)
+
+    mocker.patch(
+        "aiden.app.brain.perception.process_cortical_events",
+        side_effect=process_cortical_events,
+    )
+
+    request = PerceptionRequest(
+        cortical=CorticalRequest(
+            agent_id="1",
+            sensory=Sensory(tactile=[TactileInput(content="Cold")]),
+            latency_budget_ms=5000,
+        ),
+        image="aW1hZ2U=",
+        audio=base64.b64encode(b"RIFF").decode(),
+    )
+    events = [
+        PerceptionEvent.model_validate_json(line)
+        async for line in process_perception(request)
+    ]
+
+    assert [event.type for event in events] == [
+        PerceptionEventType.AUDITORY,
+        PerceptionEventType.VISION,
+        PerceptionEventType.CORTICAL,
+    ]
+    assert events[0].content == "Speech, Music"
+    assert classify_clip.call_args.args == (b"RIFF", None, 1)
+
+    # The perceptions are added to the other sensory inputs of the tick
+    (cortical_request,) = cortical_requests
+    assert [input.content for input in cortical_request.sensory.vision] == [
+        "A red door"
+    ]
+    assert [input.content for input in cortical_request.sensory.auditory] == [
+        "Speech, Music"
+    ]
+    assert [input.content for input in cortical_request.sensory.tactile] == ["Cold"]
+    # The tick only has what is left of the latency budget
+    assert cortical_request.latency_budget_ms < 5000
+
+
+@pytest.mark.asyncio
+async def test_process_perception_leaves_out_failed_senses(mocker):
+    mocker.patch(
+        "aiden.app.brain.perception.describe_frame",
+        side_effect=RuntimeError("Vision backend unavailable"),
+    )
+    cortical_requests = []
+
+    async def process_cortical_events(request):
+        cortical_requests.append(request)
+        yield CorticalEvent(type=CorticalEventType.DONE)
+
+    mocker.patch(
+        "aiden.app.brain.perception.process_cortical_events",
+        side_effect=process_cortical_events,
+    )
+
+    request = PerceptionRequest(
+        cortical=CorticalRequest(agent_id="1", sensory=Sensory()), image="aW1hZ2U="
+    )
+    events = [
+        PerceptionEvent.model_validate_json(line)
+        async for line in process_perception(request)
+    ]
+
+    assert events[0].type == PerceptionEventType.VISION
+    assert events[0].error == "Vision backend unavailable"
+    assert events[1].type == PerceptionEventType.CORTICAL
+    assert cortical_requests[0].sensory.vision == []
+
+
+@pytest.mark.asyncio
+async def test_process_perception_of_raw_uploads(mocker):
+    describe_frame = mocker.patch(
+        "aiden.app.brain.perception.describe_frame", return_value="A red door"
+    )
+    classify_clip = mocker.patch(
+        "aiden.app.brain.perception.classify_clip",
+        return_value=AuditoryResponse(
+            results=[AuditoryResult(class_name="Speech", score=0.9)]
+        ),
+    )
+
+    async def process_cortical_events(request):
+        yield CorticalEvent(type=CorticalEventType.DONE)
+
+    mocker.patch(
+        "aiden.app.brain.perception.process_cortical_events",
+        side_effect=process_cortical_events,
+    )
+
+    request = PerceptionRequest(
+        cortical=CorticalRequest(agent_id="1", sensory=Sensory()), sample_rate=16000
+    )
+    events = [
+        PerceptionEvent.model_validate_json(line)
+        async for line in process_perception(request, b"image", b"pcm")
+    ]
+
+    assert len(events) == 3
+    assert describe_frame.call_args.args[0] == b"image"
+    assert classify_clip.call_args.args == (b"pcm", 16000, 1)
+
+
+@pytest.mark.asyncio
+async def test_process_perception_stops_perceiving_when_closed(mocker):
+    stopped = []
+
+    async def describe_frame(*args):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            stopped.append("vision")
+
+    mocker.patch(
+        "aiden.app.brain.perception.describe_frame", side_effect=describe_frame
+    )
+    mocker.patch(
+        "aiden.app.brain.perception.classify_clip",
+        return_value=AuditoryResponse(results=[]),
+    )
+
+    request = PerceptionRequest(
+        cortical=CorticalRequest(agent_id="1", sensory=Sensory()),
+        image="aW1hZ2U=",
+        audio=base64.b64encode(b"RIFF").decode(),
+    )
+    perception = process_perception(request)
+    await perception.__anext__()
+
+    # The client disconnects while the frame is still described
+    await perception.aclose()
+
+    assert stopped == ["vision"]
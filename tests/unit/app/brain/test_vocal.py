@@ -0,0 +1,168 @@
+import asyncio
+import base64
+
+import pytest
+from pydantic import ValidationError
+
+from aiden.app.brain.vocal import SentenceSplitter, _synthesise, process_vocal
+from aiden.app.speech_cache import SpeechCache
+from aiden.models.brain import (
+    CorticalEvent,
+    CorticalEventType,
+    CorticalRequest,
+    Sensory,
+    VocalEvent,
+    VocalEventType,
+    VocalRequest,
+)
+
+
+def test_sentence_splitter_splits_tokens_into_sentences():
+    splitter = SentenceSplitter()
+    tokens = ["Hello", " Dr. Smith", "! How", " are you", "? I'm", " fine"]
+
+    sentences = [sentence for token in tokens for sentence in splitter.feed(token)]
+
+    assert sentences == ["Hello Dr. Smith!", "How are you?"]
+    assert splitter.flush() == ["I'm fine"]
+    assert splitter.flush() == []
+
+
+def test_vocal_request_requires_text_or_cortical():
+    with pytest.raises(ValidationError):
+        VocalRequest()
+    with pytest.raises(ValidationError):
+        VocalRequest(
+            text="Hi.", cortical=CorticalRequest(agent_id="1", sensory=Sensory())
+        )
+
+
+@pytest.mark.asyncio
+async def test_synthesise_reuses_cached_speech(mocker):
+    mocker.patch("aiden.app.brain.vocal.get_speech_cache", return_value=SpeechCache())
+    mock_response = mocker.AsyncMock(status=200)
+    mock_response.read.return_value = b"RIFF"
+    mock_session = mocker.patch("aiden.app.brain.vocal.get_http_session")
+    mock_session.return_value.get.return_value.__aenter__.return_value = mock_response
+
+    assert await _synthesise("Hello.", "p1") == b"RIFF"
+    assert await _synthesise("Hello.", "p1") == b"RIFF"
+
+    mock_session.return_value.get.assert_called_once()
+    assert mock_session.return_value.get.call_args.kwargs["params"] == {
+        "text": "Hello.",
+        "speaker_id": "p1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_vocal_sends_sentences_in_order(mocker):
+    async def synthesise(text, speaker_id):
+        # The first sentence takes longest to synthesise
+        await asyncio.sleep(0.05 if text.startswith("Hello") else 0)
+        if text.startswith("Fail"):
+            raise RuntimeError("Vocal service unavailable")
+        return text.encode()
+
+    mocker.patch("aiden.app.brain.vocal._synthesise", side_effect=synthesise)
+
+    request = VocalRequest(text="Hello there. Fail here. How are you")
+    events = [
+        VocalEvent.model_validate_json(line) async for line in process_vocal(request)
+    ]
+
+    assert [(event.type, event.index, event.content) for event in events] == [
+        (VocalEventType.AUDIO, 0, "Hello there."),
+        (VocalEventType.ERROR, 1, "Vocal service unavailable"),
+        (VocalEventType.AUDIO, 2, "How are you"),
+    ]
+    assert base64.b64decode(events[0].audio) == b"Hello there."
+
+
+@pytest.mark.asyncio
+async def test_process_vocal_speaks_cortical_speech_as_it_is_generated(mocker):
+    synthesised = []
+    first_sentence_synthesised = asyncio.Event()
+
+    async def synthesise(text, speaker_id):
+        synthesised.append(text)
+        first_sentence_synthesised.set()
+        return b"RIFF"
+
+    mocker.patch("aiden.app.brain.vocal._synthesise", side_effect=synthesise)
+
+    async def process_cortical_events(request, stream_speech):
+        assert stream_speech
+        for token in ["Hi there.", " Nice", " day"]:
+            yield CorticalEvent(type=CorticalEventType.SPEECH_DELTA, content=token)
+            await asyncio.sleep(0)
+        # The first sentence is synthesised before the speech is complete
+        await asyncio.wait_for(first_sentence_synthesised.wait(), 1)
+        assert synthesised == ["Hi there."]
+        yield CorticalEvent(type=CorticalEventType.SPEECH, content="Hi there. Nice day")
+        yield CorticalEvent(type=CorticalEventType.DONE)
+
+    mocker.patch(
+        "aiden.app.brain.cortical.process_cortical_events",
+        side_effect=process_cortical_events,
+    )
+
+    request = VocalRequest(cortical=CorticalRequest(agent_id="1", sensory=Sensory()))
+    events = [
+        VocalEvent.model_validate_json(line) async for line in process_vocal(request)
+    ]
+
+    audio = [event.content for event in events if event.type == VocalEventType.AUDIO]
+    cortical = [
+        event.cortical.type for event in events if event.type == VocalEventType.CORTICAL
+    ]
+    assert audio == ["Hi there.", "Nice day"]
+    assert cortical == [CorticalEventType.SPEECH, CorticalEventType.DONE]
+
+
+class FakeCorticalGraph:
+    """Streams broca's speech token by token, as the cortical graph does."""
+
+    async def astream(self, state, stream_mode):
+        for token in ["Hi there.", " Nice", " day"]:
+            yield "custom", {"speech": token}
+            await asyncio.sleep(0)
+        yield "updates", {"broca": {"aggregate": [{"speech": "Hi there. Nice day"}]}}
+        yield (
+            "values",
+            {
+                **state,
+                "speech": "Hi there. Nice day",
+                "action": None,
+                "thoughts": None,
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_process_vocal_runs_cortical_tick(mocker, brain_config):
+    mocker.patch(
+        "aiden.app.brain.cortical.get_cortical_graph", return_value=FakeCorticalGraph()
+    )
+    mocker.patch(
+        "aiden.app.brain.cortical.load_brain_config", return_value=brain_config
+    )
+    mocker.patch("aiden.app.brain.cortical.redis_client")
+    mocker.patch("aiden.app.brain.cortical._add_cortical_output_to_memory")
+    mocker.patch("aiden.app.brain.vocal._synthesise", return_value=b"RIFF")
+
+    request = VocalRequest(
+        cortical=CorticalRequest(agent_id="1", sensory=Sensory(), include_timings=True)
+    )
+    events = [
+        VocalEvent.model_validate_json(line) async for line in process_vocal(request)
+    ]
+
+    # The tick runs to completion, with its timings, rather than failing part way
+    assert VocalEventType.ERROR not in [event.type for event in events]
+    audio = [event.content for event in events if event.type == VocalEventType.AUDIO]
+    assert audio == ["Hi there.", "Nice day"]
+    done = events[-1].cortical
+    assert done.type == CorticalEventType.DONE
+    assert done.response.speech == "Hi there. Nice day"
+    assert "graph_compile" in [timing.name for timing in done.response.timings]
@@ -0,0 +1,54 @@
+import aiohttp
+import pytest
+
+from aiden.app.clients.http_client import (
+    close_http_session,
+    get_http_session,
+    with_retries,
+)
+
+
+@pytest.mark.asyncio
+async def test_http_session_is_shared_until_closed():
+    session = get_http_session()
+
+    assert get_http_session() is session
+    assert session.connector.limit_per_host > 0
+
+    await close_http_session()
+
+    assert session.closed
+    new_session = get_http_session()
+    assert new_session is not session
+    await close_http_session()
+
+
+@pytest.mark.asyncio
+async def test_with_retries_retries_connection_errors(mocker):
+    mocker.patch("aiden.app.clients.http_client.HTTP_CLIENT_RETRY_BACKOFF", 0)
+    send = mocker.AsyncMock(
+        side_effect=[
+            aiohttp.ServerDisconnectedError(),
+            aiohttp.ServerDisconnectedError(),
+            "ok",
+        ]
+    )
+
+    assert await with_retries(send, retries=2) == "ok"
+    assert send.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_with_retries_gives_up(mocker):
+    mocker.patch("aiden.app.clients.http_client.HTTP_CLIENT_RETRY_BACKOFF", 0)
+    send = mocker.AsyncMock(side_effect=aiohttp.ServerDisconnectedError())
+
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        await with_retries(send, retries=1)
+    assert send.await_count == 2
+
+    # Other errors, e.g. from handling the response, are not retried
+    send = mocker.AsyncMock(side_effect=ValueError("invalid response"))
+    with pytest.raises(ValueError):
+        await with_retries(send, retries=1)
+    assert send.await_count == 1
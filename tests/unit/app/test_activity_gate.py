@@ -0,0 +1,26 @@
+from aiden.app.activity_gate import ActivityGate
+
+
+def test_activity_gate_skips_silent_clips():
+    activity_gate = ActivityGate(energy_threshold=0.01, min_ratio=0.5)
+
+    assert activity_gate.check([(0.2, 0.05), (0.001, 0.0)]) is True
+    assert activity_gate.check([(0.2, 0.05), (0.001, 0.0), (0.0, 0.0)]) is False
+    assert activity_gate.check([]) is False
+
+    stats = activity_gate.stats()
+    assert stats.clips == 3
+    assert stats.skipped == 2
+    assert stats.skip_ratio == 2 / 3
+
+
+def test_activity_gate_keeps_quiet_broadband_frames():
+    activity_gate = ActivityGate(
+        energy_threshold=0.01, zcr_threshold=0.3, min_ratio=1.0
+    )
+
+    # Quiet frames only count as active when they cross zero often, e.g. rustling
+    assert activity_gate.check([(0.005, 0.4)]) is True
+    assert activity_gate.check([(0.005, 0.1)]) is False
+    # Below a quarter of the energy threshold, frames are silent whatever their rate
+    assert activity_gate.check([(0.001, 0.5)]) is False
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from aiden.app.admission import Admission
+
+
+@pytest.mark.asyncio
+async def test_admission_bounds_concurrency():
+    admission = Admission(1)
+
+    await admission.acquire()
+    waiting = asyncio.create_task(admission.acquire())
+    await asyncio.sleep(0)
+    assert admission.locked()
+    assert not waiting.done()
+
+    admission.release()
+    await asyncio.wait_for(waiting, timeout=1)
+    admission.release()
+    assert not admission.locked()
+
+
+def test_admission_is_created_for_each_event_loop():
+    admission = Admission(1)
+
+    async def contend() -> None:
+        await admission.acquire()
+        waiting = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        admission.release()
+        await asyncio.wait_for(waiting, timeout=1)
+
+    # The slot left held in the first loop neither blocks nor breaks the next loop
+    asyncio.run(contend())
+    asyncio.run(contend())
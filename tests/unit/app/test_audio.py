@@ -0,0 +1,132 @@
+import io
+import math
+import struct
+import wave
+
+import pytest
+
+from aiden.app.audio import frame_activity, normalize_audio, split_speech
+
+
+def make_wav(
+    sample_rate: int,
+    channels: int = 1,
+    sample_width: int = 2,
+    seconds: float = 1.0,
+    amplitude: float = 0.5,
+) -> bytes:
+    # A 440 Hz tone at the amplitude relative to full scale on every channel
+    full_scale = {1: 127, 2: 32767, 4: 2147483647}[sample_width]
+    frames = bytearray()
+    for index in range(int(sample_rate * seconds)):
+        sample = round(
+            amplitude * full_scale * math.sin(2 * math.pi * 440 * index / sample_rate)
+        )
+        if sample_width == 1:
+            frames += bytes([sample + 128]) * channels
+        else:
+            frames += struct.pack({2: "<h", 4: "<i"}[sample_width], sample) * channels
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def read_wav(audio: bytes) -> tuple[int, int, int, int]:
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        return (
+            wav.getframerate(),
+            wav.getnchannels(),
+            wav.getsampwidth(),
+            wav.getnframes(),
+        )
+
+
+def peak(audio: bytes) -> int:
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        frames = wav.readframes(wav.getnframes())
+    return max(abs(sample) for sample in struct.unpack(f"<{len(frames) // 2}h", frames))
+
+
+@pytest.mark.parametrize(
+    "sample_rate, channels, sample_width",
+    [(44100, 2, 2), (48000, 1, 1), (22050, 2, 4), (8000, 1, 2)],
+)
+def test_normalize_audio(sample_rate, channels, sample_width):
+    audio = make_wav(sample_rate, channels, sample_width)
+
+    normalized = normalize_audio(audio)
+
+    assert read_wav(normalized) == (16000, 1, 2, 16000)
+    # The tone keeps its level through mixing down and resampling
+    assert abs(peak(normalized) - 16384) < 500
+
+
+def test_normalize_audio_keeps_normalized_wav():
+    audio = make_wav(16000)
+
+    assert normalize_audio(audio) is audio
+
+
+def test_normalize_audio_raw_pcm():
+    pcm = make_wav(48000, channels=2)[44:]
+
+    normalized = normalize_audio(pcm, sample_rate=48000, channels=2)
+
+    assert read_wav(normalized) == (16000, 1, 2, 16000)
+
+
+def test_normalize_audio_invalid():
+    with pytest.raises(ValueError):
+        normalize_audio(b"RIFF\x00\x00\x00\x00WAVEfmt data")
+
+
+def test_frame_activity():
+    activity = frame_activity(make_wav(16000, seconds=0.5))
+
+    # 25 ms frames of a 440 Hz sine, which crosses zero 880 times a second
+    assert len(activity) == 20
+    for energy, zero_crossing_rate in activity:
+        assert energy == pytest.approx(0.5 / 2**0.5, abs=0.01)
+        assert zero_crossing_rate == pytest.approx(880 / 16000, abs=0.01)
+
+
+def test_frame_activity_silence():
+    activity = frame_activity(make_wav(16000, seconds=0.5, amplitude=0.0))
+
+    assert activity == [(0.0, 0.0)] * 20
+
+
+def test_frame_activity_requires_16_bit_mono():
+    with pytest.raises(ValueError):
+        frame_activity(make_wav(16000, channels=2))
+
+
+def test_split_speech_between_words():
+    # Three seconds of speech with short pauses between
+    word = make_wav(16000, seconds=3.0)[44:]
+    pause = make_wav(16000, seconds=0.1, amplitude=0.0)[44:]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(word + pause + word + pause + word)
+
+    clips = split_speech(buffer.getvalue(), max_seconds=5.0)
+
+    assert [read_wav(clip) for clip in clips] == [
+        (16000, 1, 2, 48000),
+        (16000, 1, 2, 49600),
+        (16000, 1, 2, 49600),
+    ]
+
+
+def test_split_speech_keeps_short_speech():
+    audio = make_wav(16000, seconds=2.0)
+
+    assert split_speech(audio, max_seconds=5.0) == [audio]
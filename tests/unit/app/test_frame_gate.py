@@ -0,0 +1,50 @@
+from PIL import Image
+
+from aiden.app.frame_gate import FrameGate
+
+
+def frame(brightness: int) -> Image.Image:
+    return Image.new("L", (64, 48), brightness)
+
+
+def test_frame_gate_skips_unchanged_frames():
+    frame_gate = FrameGate(threshold=0.05)
+
+    assert frame_gate.check("0", frame(100)) is None
+    frame_gate.update("0", frame(100), "A park.")
+
+    assert frame_gate.check("0", frame(105)) == "A park."
+    assert frame_gate.check("0", frame(120)) is None
+    assert frame_gate.check("1", frame(100)) is None
+
+    stats = {stats.agent_id: stats for stats in frame_gate.stats()}
+    assert stats["0"].frames == 3
+    assert stats["0"].skipped == 1
+    assert stats["0"].skip_ratio == 1 / 3
+    assert stats["1"].skip_ratio == 0.0
+
+
+def test_frame_gate_compares_with_last_described_frame():
+    frame_gate = FrameGate(threshold=0.05)
+    frame_gate.update("0", frame(100), "A park.")
+
+    # Small changes add up until the scene is described again
+    assert frame_gate.check("0", frame(108)) == "A park."
+    assert frame_gate.check("0", frame(116)) is None
+
+
+def test_frame_gate_threshold_per_agent():
+    frame_gate = FrameGate(threshold=0.05)
+    frame_gate.update("0", frame(100), "A park.")
+
+    assert frame_gate.check("0", frame(105), threshold=0.0) is None
+    assert frame_gate.check("0", frame(120), threshold=0.5) == "A park."
+
+
+def test_frame_gate_evicts_least_recently_seen_agents():
+    frame_gate = FrameGate(max_agents=1)
+    frame_gate.update("0", frame(100), "A park.")
+    frame_gate.update("1", frame(100), "A kitchen.")
+
+    assert frame_gate.check("0", frame(100)) is None
+    assert frame_gate.check("1", frame(100)) == "A kitchen."
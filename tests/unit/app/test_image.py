@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from PIL import Image
+
+from aiden.app.image import preprocess_image
+
+
+def encode(image: Image.Image, format: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "mode, format", [("RGB", "JPEG"), ("RGBA", "PNG"), ("L", "PNG")]
+)
+def test_preprocess_image_downsizes(mode, format):
+    image = encode(Image.new(mode, (1920, 1080)), format)
+
+    preprocessed = preprocess_image(image, max_size=378)
+
+    with Image.open(io.BytesIO(preprocessed)) as result:
+        assert result.format == "JPEG"
+        assert result.mode == "RGB"
+        assert result.size == (378, 213)
+
+
+def test_preprocess_image_keeps_small_jpeg():
+    image = encode(Image.new("RGB", (320, 240)), "JPEG")
+
+    assert preprocess_image(image, max_size=378) is image
+
+
+def test_preprocess_image_reencodes_small_png():
+    image = encode(Image.new("RGB", (320, 240)), "PNG")
+
+    with Image.open(io.BytesIO(preprocess_image(image, max_size=378))) as result:
+        assert result.format == "JPEG"
+        assert result.size == (320, 240)
+
+
+def test_preprocess_image_invalid():
+    with pytest.raises(ValueError):
+        preprocess_image(b"not an image")
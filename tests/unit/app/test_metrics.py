@@ -0,0 +1,49 @@
+from aiden.app.metrics import Counter, Gauge, Histogram, render_prometheus
+
+
+def test_histogram_snapshot_is_cumulative():
+    histogram = Histogram("test_seconds", "Test histogram.", ("stage",), (0.1, 1.0))
+
+    histogram.observe(0.05, stage="thalamus")
+    histogram.observe(0.5, stage="thalamus")
+    histogram.observe(5.0, stage="thalamus")
+    histogram.observe(0.5, stage="broca")
+
+    snapshot = histogram.snapshot()
+
+    buckets, total, count = snapshot[("thalamus",)]
+    assert buckets == [1, 2]
+    assert total == 5.55
+    assert count == 3
+
+    assert snapshot[("broca",)][2] == 1
+
+
+def test_render_prometheus():
+    counter = Counter("test_requests_total", "Test counter.", ("path",))
+    gauge = Gauge("test_in_flight", "Test gauge.")
+    histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+
+    counter.inc(path="/cortical/")
+    counter.inc(2, path='/"quoted"/')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    histogram.observe(0.5)
+
+    assert render_prometheus([counter, gauge, histogram]) == (
+        "# HELP test_requests_total Test counter.\n"
+        "# TYPE test_requests_total counter\n"
+        'test_requests_total{path="/cortical/"} 1\n'
+        'test_requests_total{path="/\\"quoted\\"/"} 2\n'
+        "# HELP test_in_flight Test gauge.\n"
+        "# TYPE test_in_flight gauge\n"
+        "test_in_flight 1\n"
+        "# HELP test_seconds Test histogram.\n"
+        "# TYPE test_seconds histogram\n"
+        'test_seconds_bucket{le="0.1"} 0\n'
+        'test_seconds_bucket{le="1.0"} 1\n'
+        'test_seconds_bucket{le="+Inf"} 1\n'
+        "test_seconds_sum 0.5\n"
+        "test_seconds_count 1\n"
+    )
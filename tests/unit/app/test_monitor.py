@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from aiden.app.monitor import EventLoopWatchdog, request_id_var
+
+
+def block_event_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.allow_event_loop_blocking
+@pytest.mark.asyncio
+async def test_event_loop_watchdog_captures_blocking_call():
+    watchdog = EventLoopWatchdog(threshold=0.05)
+    watchdog.start(asyncio.get_running_loop())
+
+    async def handler() -> None:
+        block_event_loop(0.3)
+
+    token = request_id_var.set("request-123")
+    try:
+        await asyncio.create_task(handler())
+    finally:
+        request_id_var.reset(token)
+
+    # Let the heartbeat run so the incident's full duration is recorded
+    await asyncio.sleep(0.05)
+    watchdog.stop()
+
+    assert len(watchdog.incidents) == 1
+    incident = watchdog.incidents[0]
+    assert incident.request_id == "request-123"
+    assert "block_event_loop" in incident.stack
+    assert incident.duration_ms >= 250
+
+
+@pytest.mark.asyncio
+async def test_event_loop_watchdog_ignores_non_blocking_code():
+    watchdog = EventLoopWatchdog(threshold=0.05)
+    watchdog.start(asyncio.get_running_loop())
+
+    await asyncio.sleep(0.3)
+    watchdog.stop()
+
+    assert len(watchdog.incidents) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_loop_watchdog_restores_task_factory():
+    loop = asyncio.get_running_loop()
+
+    def task_factory(loop, coro, **kwargs):
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(task_factory)
+    try:
+        watchdog = EventLoopWatchdog(threshold=0.05)
+        watchdog.start(loop)
+        watchdog.stop()
+
+        assert loop.get_task_factory() is task_factory
+    finally:
+        loop.set_task_factory(None)
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import pytest
+
+from aiden.app import profiler
+from aiden.app.profiler import ProfilerBusyError, profile
+
+
+def busy_region(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_profile_collapses_stacks_of_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_region, args=(stop,), name="worker thread")
+    worker.start()
+    try:
+        collapsed_stacks = profile(0.1, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    worker_lines = [
+        line
+        for line in collapsed_stacks.splitlines()
+        if line.startswith("worker_thread;")
+    ]
+    assert worker_lines
+    stack, count = worker_lines[0].rsplit(" ", 1)
+    assert f"{__name__}:busy_region" in stack.split(";")
+    assert int(count) > 0
+
+
+def test_profile_rejects_concurrent_profiles():
+    profiler._profiling.acquire()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profile(0.01)
+    finally:
+        profiler._profiling.release()
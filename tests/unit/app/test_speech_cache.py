@@ -0,0 +1,24 @@
+from aiden.app.speech_cache import SpeechCache
+
+
+def test_speech_cache_matches_text_and_voice():
+    speech_cache = SpeechCache()
+    speech_cache.set("Hello  there.", "voice", b"audio")
+
+    assert speech_cache.get("Hello there.", "voice") == b"audio"
+    assert speech_cache.get("Hello there.", "other voice") is None
+    assert speech_cache.get("Goodbye.", "voice") is None
+
+
+def test_speech_cache_evicts_least_recently_used_beyond_max_bytes():
+    speech_cache = SpeechCache(max_bytes=10)
+    speech_cache.set("One.", "voice", b"1111")
+    speech_cache.set("Two.", "voice", b"2222")
+    speech_cache.get("One.", "voice")
+    speech_cache.set("Three.", "voice", b"3333")
+    speech_cache.set("Too long.", "voice", b"x" * 11)
+
+    assert speech_cache.get("One.", "voice") == b"1111"
+    assert speech_cache.get("Two.", "voice") is None
+    assert speech_cache.get("Three.", "voice") == b"3333"
+    assert speech_cache.get("Too long.", "voice") is None
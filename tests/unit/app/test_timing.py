@@ -0,0 +1,63 @@
+import pytest
+
+from aiden.app.metrics import STAGE_LATENCY
+from aiden.app.timing import (
+    collect_timings,
+    record_timing,
+    timed,
+    timed_node,
+)
+
+
+def test_collect_timings_records_stages():
+    with collect_timings() as timings:
+        with timed("memory_read"):
+            pass
+        record_timing("thalamus_llm", 0.5, prompt_tokens=120, eval_tokens=48)
+
+    assert [entry.name for entry in timings.entries] == [
+        "memory_read",
+        "thalamus_llm",
+    ]
+    assert timings.entries[1].duration_ms == 500.0
+    assert timings.entries[1].prompt_tokens == 120
+    assert timings.entries[1].eval_tokens == 48
+
+
+def test_collect_timings_joins_enclosing_collection():
+    with collect_timings() as outer:
+        with collect_timings() as inner:
+            record_timing("broca", 0.1)
+
+    assert inner is outer
+    assert len(outer.entries) == 1
+
+
+def test_record_timing_without_collection_observes_histogram():
+    before = STAGE_LATENCY.snapshot().get(("test_stage",), ([], 0.0, 0))[2]
+
+    record_timing("test_stage", 0.2)
+
+    assert STAGE_LATENCY.snapshot()[("test_stage",)][2] == before + 1
+
+
+def test_server_timing_header():
+    with collect_timings() as timings:
+        record_timing("thalamus", 0.8125)
+        record_timing("thalamus_llm", 0.75, prompt_tokens=120, eval_tokens=48)
+
+    assert timings.server_timing_header() == (
+        'thalamus;dur=812.5, thalamus_llm;dur=750.0;desc="prompt=120 eval=48"'
+    )
+
+
+@pytest.mark.asyncio
+async def test_timed_node():
+    async def node(state: dict) -> dict:
+        return {"visited": True}
+
+    with collect_timings() as timings:
+        result = await timed_node("prefrontal", node)({})
+
+    assert result == {"visited": True}
+    assert [entry.name for entry in timings.entries] == ["prefrontal"]
@@ -1,6 +1,9 @@
+import os
+import shutil
+
 import pytest
 
-from aiden.app.utils import build_sensory_input_prompt_template
+from aiden.app.utils import build_sensory_input_prompt_template, load_brain_config
 from aiden.models.brain import (
     Action,
     AuditoryInput,
@@ -93,3 +96,15 @@ Your current gustatory input: Sweet candy.""",
 def test_build_sensory_input_prompt_template(sensory, expected_output):
     result = build_sensory_input_prompt_template(sensory)
     assert result == expected_output
+
+
+def test_load_brain_config_is_cached_until_modified(tmp_path):
+    config_file = tmp_path / "brain.json"
+    shutil.copy("./config/brain/default.json", config_file)
+
+    brain_config = load_brain_config(str(config_file))
+    assert load_brain_config(str(config_file)) is brain_config
+
+    modified = os.path.getmtime(config_file) + 1
+    os.utime(config_file, (modified, modified))
+    assert load_brain_config(str(config_file)) is not brain_config
@@ -0,0 +1,50 @@
+import pytest
+
+from aiden.app.metrics import CACHE_REQUESTS
+from aiden.app.vision_cache import DescriptionCache
+
+
+@pytest.mark.asyncio
+async def test_description_cache_matches_near_identical_images():
+    cache = DescriptionCache(max_distance=2)
+    await cache.set("Describe the image.", 0b1111, "A park.")
+
+    assert await cache.get("Describe the image.", 0b1111) == "A park."
+    assert await cache.get("Describe the image.", 0b1100) == "A park."
+    assert await cache.get("Describe the image.", 0b1000) is None
+    assert await cache.get("Describe the people.", 0b1111) is None
+
+
+@pytest.mark.asyncio
+async def test_description_cache_counts_hits_and_misses():
+    hits = CACHE_REQUESTS.value(cache="vision", result="hit")
+    misses = CACHE_REQUESTS.value(cache="vision", result="miss")
+    cache = DescriptionCache()
+
+    await cache.get("Describe the image.", 0)
+    await cache.set("Describe the image.", 0, "A park.")
+    await cache.get("Describe the image.", 0)
+
+    assert CACHE_REQUESTS.value(cache="vision", result="hit") == hits + 1
+    assert CACHE_REQUESTS.value(cache="vision", result="miss") == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_description_cache_expires_entries():
+    cache = DescriptionCache(ttl=0)
+    await cache.set("Describe the image.", 0, "A park.")
+
+    assert await cache.get("Describe the image.", 0) is None
+
+
+@pytest.mark.asyncio
+async def test_description_cache_evicts_least_recently_used():
+    cache = DescriptionCache(max_entries=2, max_distance=0)
+    await cache.set("Describe the image.", 1, "A park.")
+    await cache.set("Describe the image.", 2, "A kitchen.")
+    await cache.get("Describe the image.", 1)
+    await cache.set("Describe the image.", 3, "A garden.")
+
+    assert await cache.get("Describe the image.", 1) == "A park."
+    assert await cache.get("Describe the image.", 2) is None
+    assert await cache.get("Describe the image.", 3) == "A garden."
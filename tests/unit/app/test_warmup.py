@@ -0,0 +1,74 @@
+import pytest
+
+from aiden.app.warmup import WARMUP_AGENT_ID, Warmup
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_every_step(mocker):
+    mocker.patch(
+        "aiden.app.warmup._configured_models",
+        return_value=[("http://cognitive:11434", "llama3.2:1b")],
+    )
+    mock_load_model = mocker.patch.object(Warmup, "_load_model")
+    mock_connect_redis = mocker.patch.object(Warmup, "_connect_redis")
+    mock_run_tick = mocker.patch.object(Warmup, "_run_tick")
+
+    warmup = Warmup(configs=["./config/brain/default.json"])
+    assert not warmup.readiness().ready
+
+    await warmup.run()
+
+    readiness = warmup.readiness()
+    assert readiness.ready
+    assert [step.name for step in readiness.steps] == [
+        "imports",
+        "configs",
+        "redis",
+        "model:llama3.2:1b@http://cognitive:11434",
+        "tick",
+    ]
+    assert all(step.error is None for step in readiness.steps)
+    mock_load_model.assert_awaited_once_with("http://cognitive:11434", "llama3.2:1b")
+    mock_connect_redis.assert_awaited_once()
+    mock_run_tick.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_warmup_is_ready_despite_failed_step(mocker):
+    mocker.patch("aiden.app.warmup._configured_models", return_value=[])
+    mocker.patch.object(
+        Warmup, "_connect_redis", side_effect=ConnectionError("Connection refused")
+    )
+
+    warmup = Warmup(configs=["./config/brain/missing.json"], tick=False)
+    await warmup.run()
+
+    readiness = warmup.readiness()
+    errors = {step.name: step.error for step in readiness.steps}
+    assert readiness.ready
+    assert errors["configs"] == "Cannot find the brain configuration file"
+    assert errors["redis"] == "Connection refused"
+    assert "tick" not in errors
+
+
+@pytest.mark.asyncio
+async def test_warmup_tick_does_not_save_memory(mocker):
+    async def stream_response():
+        yield "{}"
+
+    mock_process_cortical = mocker.patch(
+        "aiden.app.brain.cortical.process_cortical", return_value=stream_response()
+    )
+    mock_redis_client = mocker.patch("aiden.app.clients.redis_client.redis_client")
+
+    await Warmup(configs=["./config/brain/default.json"])._run_tick()
+
+    request, memory_manager = mock_process_cortical.call_args.args
+    assert request.agent_id == WARMUP_AGENT_ID
+    assert request.sensory.tactile and request.sensory.auditory
+    # The tick's memory is only buffered, so a real agent with the same ID keeps its own
+    memory_manager.update_memory(WARMUP_AGENT_ID, [])
+    assert memory_manager.read_memory(WARMUP_AGENT_ID) == []
+    mock_redis_client.delete.assert_not_called()
+    mock_redis_client.set.assert_not_called()
+    mock_redis_client.pipeline.assert_not_called()